@@ -0,0 +1,130 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Compares the memory used by Addon records with the previous dataclass,
+which held the translations of every add-on version read.
+Records are created as readAddons creates them, from parsed add-on data.
+Usage: python -m src.benchmarks.addonMemory [--records N] [--languages N]
+"""
+
+import argparse
+from dataclasses import dataclass
+import gc
+import json
+import tracemalloc
+from typing import (
+	Callable,
+	Dict,
+	List,
+)
+
+from src.transform.datastructures import (
+	Addon,
+	AddonChannels,
+	MajorMinorPatch,
+)
+from .syntheticData import LANGUAGES
+
+RECORDS_PER_REPORT = 100_000
+
+
+@dataclass
+class _LegacyAddon:
+	"""The Addon dataclass this benchmark compares against."""
+	addonId: str
+	addonVersion: MajorMinorPatch
+	pathToData: str
+	channel: AddonChannels
+	minNvdaAPIVersion: MajorMinorPatch
+	lastTestedVersion: MajorMinorPatch
+	translations: List[Dict[str, str]]
+
+
+def _addonDocuments(recordCount: int, languageCount: int) -> List[bytes]:
+	"""
+	Serialized add-on documents, as read from the datastore.
+	Records are parsed from these, so they don't share strings or versions with each other.
+	"""
+	documents = []
+	for index in range(recordCount):
+		addonId = f"addon{index // 50}"
+		documents.append(json.dumps({
+			"addonId": addonId,
+			"channel": "stable" if index % 4 else "beta",
+			"addonVersionNumber": {"major": index % 50, "minor": 0, "patch": 0},
+			"minNVDAVersion": {"major": 2019 + index % 5, "minor": 3, "patch": 0},
+			"lastTestedVersion": {"major": 2024, "minor": 1, "patch": 0},
+			"translations": [
+				{
+					"language": language,
+					"displayName": f"{addonId} ({language})",
+					"description": f"A synthetic add-on, {addonId}, translated to {language}.",
+				}
+				for language in LANGUAGES[:languageCount]
+			],
+		}).encode("utf-8"))
+	return documents
+
+
+def _legacyRecord(addonData: Dict, path: str) -> _LegacyAddon:
+	return _LegacyAddon(
+		addonId=addonData["addonId"],
+		addonVersion=MajorMinorPatch(**addonData["addonVersionNumber"]),
+		pathToData=path,
+		channel=addonData["channel"],
+		minNvdaAPIVersion=MajorMinorPatch(**addonData["minNVDAVersion"]),
+		lastTestedVersion=MajorMinorPatch(**addonData["lastTestedVersion"]),
+		translations=addonData.get("translations", []),
+	)
+
+
+def _compactRecord(addonData: Dict, path: str) -> Addon:
+	return Addon(
+		addonId=addonData["addonId"],
+		addonVersion=MajorMinorPatch(**addonData["addonVersionNumber"]),
+		pathToData=path,
+		channel=addonData["channel"],
+		minNvdaAPIVersion=MajorMinorPatch(**addonData["minNVDAVersion"]),
+		lastTestedVersion=MajorMinorPatch(**addonData["lastTestedVersion"]),
+		translations=None,
+	)
+
+
+def measureRecords(documents: List[bytes], createRecord: Callable[[Dict, str], object]) -> int:
+	"""
+	Returns the bytes allocated for records created from documents, which are kept alive while measuring.
+	"""
+	gc.collect()
+	tracemalloc.start()
+	records = [
+		createRecord(json.loads(document), f"addons/{index}.json")
+		for index, document in enumerate(documents)
+	]
+	allocatedBytes, _peakBytes = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del records
+	return allocatedBytes
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--records", type=int, default=RECORDS_PER_REPORT, help="The number of add-on records.")
+	parser.add_argument("--languages", type=int, default=10, help="The number of translations of each add-on.")
+	args = parser.parse_args()
+
+	documents = _addonDocuments(args.records, args.languages)
+	print(f"{args.records} records, {args.languages} translations each")
+	results = (
+		("Legacy dataclass", measureRecords(documents, _legacyRecord)),
+		("Compact Addon", measureRecords(documents, _compactRecord)),
+	)
+	for name, allocatedBytes in results:
+		perReport = allocatedBytes * RECORDS_PER_REPORT / args.records
+		print(f"{name}: {perReport / (1024 * 1024):.1f} MB per {RECORDS_PER_REPORT} records")
+	print(f"Reduction: {results[0][1] / results[1][1]:.1f}x")
+
+
+if __name__ == "__main__":
+	main()
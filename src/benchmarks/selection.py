@@ -0,0 +1,93 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Compares getLatestAddons with the previous implementation,
+which checked every add-on version against every NVDA API version.
+Usage: python -m src.benchmarks.selection [--addons N] [--releases N] [--years N] [--repeat N]
+"""
+
+import argparse
+import logging
+import time
+from typing import (
+	Callable,
+	Dict,
+	Iterable,
+	Tuple,
+)
+
+from src.transform.datastructures import (
+	Addon,
+	generateAddonChannelDict,
+	VersionCompatibility,
+	WriteableAddons,
+)
+from src.transform.transform import (
+	_isAddonCompatible,
+	getLatestAddons,
+)
+from .syntheticData import (
+	syntheticAddons,
+	syntheticAPIVersions,
+)
+
+
+def _legacyGetLatestAddons(
+		addons: Iterable[Addon],
+		nvdaAPIVersions: Tuple[VersionCompatibility]
+) -> WriteableAddons:
+	"""The O(addons × API versions) implementation this benchmark compares against."""
+	latestAddons: WriteableAddons = dict(
+		(nvdaAPIVersion.apiVer, generateAddonChannelDict())
+		for nvdaAPIVersion in nvdaAPIVersions
+	)
+	for addon in addons:
+		for nvdaAPIVersion in nvdaAPIVersions:
+			addonsForVersionChannel: Dict[str, Addon] = latestAddons[nvdaAPIVersion.apiVer][addon.channel]
+			if (
+				_isAddonCompatible(addon, nvdaAPIVersion)
+				and (
+					addon.addonId not in addonsForVersionChannel
+					or addon.addonVersion > addonsForVersionChannel[addon.addonId].addonVersion
+				)
+			):
+				addonsForVersionChannel[addon.addonId] = addon
+	return latestAddons
+
+
+def _bestTime(func: Callable[[], WriteableAddons], repeat: int) -> Tuple[float, WriteableAddons]:
+	bestTime = float("inf")
+	for _ in range(repeat):
+		start = time.perf_counter()
+		result = func()
+		bestTime = min(bestTime, time.perf_counter() - start)
+	return bestTime, result
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--addons", type=int, default=500, help="The number of add-ons in the store.")
+	parser.add_argument("--releases", type=int, default=60, help="The number of releases of each add-on.")
+	parser.add_argument("--years", type=int, default=10, help="The number of years of NVDA releases.")
+	parser.add_argument("--repeat", type=int, default=3, help="The number of timed runs, the best is reported.")
+	args = parser.parse_args()
+
+	# Only the selection is measured, not logging.
+	logging.getLogger().setLevel(logging.CRITICAL)
+	nvdaAPIVersions = syntheticAPIVersions(args.years)
+	addons = syntheticAddons(nvdaAPIVersions, args.addons, args.releases)
+	print(f"{len(addons)} add-on versions, {len(nvdaAPIVersions)} NVDA API versions")
+
+	legacyTime, legacyResult = _bestTime(lambda: _legacyGetLatestAddons(addons, nvdaAPIVersions), args.repeat)
+	print(f"Legacy selection: {legacyTime:.3f}s")
+	currentTime, currentResult = _bestTime(lambda: getLatestAddons(addons, nvdaAPIVersions), args.repeat)
+	print(f"Sorted selection: {currentTime:.3f}s")
+	if currentResult != legacyResult:
+		raise AssertionError("getLatestAddons does not match the legacy selection")
+	print(f"Speedup: {legacyTime / currentTime:.1f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,148 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Deterministic synthetic add-on datastores for benchmarking.
+"""
+
+import json
+import os
+import random
+from typing import (
+	Dict,
+	List,
+	Tuple,
+)
+
+from src.transform.datastructures import (
+	Addon,
+	MajorMinorPatch,
+	VersionCompatibility,
+)
+
+# Languages with NVDA translations, the first languageCount are used for add-on translations.
+LANGUAGES = (
+	"de", "fr", "es", "it", "pt_BR", "pt_PT", "zh_CN", "zh_TW", "ja", "ko", "ru", "uk", "pl", "cs", "nl",
+	"sv", "fi", "da", "nb_NO", "tr", "ar", "fa", "he", "hi", "hu", "ro", "sk", "sl", "sr", "hr", "bg", "vi",
+)
+NVDA_API_VERSIONS_FILENAME = "nvdaAPIVersions.json"
+ADDONS_DIRNAME = "addons"
+
+
+def syntheticAPIVersions(years: int = 10, firstYear: int = 2016) -> Tuple[VersionCompatibility]:
+	"""
+	Four NVDA releases a year, with a patch release for every second release.
+	The first release of each year breaks compatibility with the previous year.
+	"""
+	legacyVersion = MajorMinorPatch(0, 0, 0)
+	nvdaAPIVersions = [VersionCompatibility(legacyVersion, legacyVersion)]
+	for year in range(firstYear, firstYear + years):
+		backCompatTo = MajorMinorPatch(year, 1)
+		for minor in range(1, 5):
+			nvdaAPIVersions.append(VersionCompatibility(MajorMinorPatch(year, minor), backCompatTo))
+			if minor % 2:
+				nvdaAPIVersions.append(VersionCompatibility(MajorMinorPatch(year, minor, 1), backCompatTo))
+	return tuple(nvdaAPIVersions)
+
+
+def syntheticAddons(
+		nvdaAPIVersions: Tuple[VersionCompatibility],
+		addonCount: int = 500,
+		releasesPerAddon: int = 60,
+		seed: int = 0,
+) -> List[Addon]:
+	"""
+	Creates the release history of addonCount add-ons.
+	Each add-on releases periodically over the lifetime of nvdaAPIVersions.
+	A release is tested against the NVDA version current at the time,
+	and requires an NVDA version up to two years older.
+	A quarter of releases are on the beta channel.
+	"""
+	rng = random.Random(seed)
+	apiVersions = sorted(set(nvdaAPIVersion.apiVer for nvdaAPIVersion in nvdaAPIVersions))
+	addons: List[Addon] = []
+	for addonIndex in range(addonCount):
+		addonId = f"addon{addonIndex}"
+		firstRelease = rng.randrange(len(apiVersions))
+		for release in range(releasesPerAddon):
+			apiVersionIndex = min(
+				len(apiVersions) - 1,
+				firstRelease + release * (len(apiVersions) - firstRelease) // releasesPerAddon,
+			)
+			addonVersion = MajorMinorPatch(1 + release // 10, release % 10)
+			addons.append(Addon(
+				addonId=addonId,
+				addonVersion=addonVersion,
+				pathToData=f"{addonId}/{addonVersion}.json",
+				channel="beta" if rng.random() < 0.25 else "stable",
+				minNvdaAPIVersion=apiVersions[max(0, apiVersionIndex - rng.randint(0, 8))],
+				lastTestedVersion=apiVersions[apiVersionIndex],
+				translations=[],
+			))
+	return addons
+
+
+def _versionJson(version: MajorMinorPatch) -> Dict[str, int]:
+	return {"major": version.major, "minor": version.minor, "patch": version.patch}
+
+
+def writeSyntheticDatastore(
+		directory: str,
+		years: int = 10,
+		addonCount: int = 500,
+		releasesPerAddon: int = 60,
+		languageCount: int = 10,
+		seed: int = 0,
+) -> Tuple[str, str]:
+	"""
+	Writes a synthetic add-on datastore to directory, with the add-ons of syntheticAddons.
+	Each add-on is translated into a random subset of the first languageCount LANGUAGES.
+	Returns the paths of the NVDA API versions file, and of the add-ons input directory.
+	"""
+	if not 0 <= languageCount <= len(LANGUAGES):
+		raise ValueError(f"languageCount must be between 0 and {len(LANGUAGES)}, got {languageCount}")
+	rng = random.Random(seed)
+	nvdaAPIVersions = syntheticAPIVersions(years)
+	nvdaAPIVersionsPath = os.path.join(directory, NVDA_API_VERSIONS_FILENAME)
+	os.makedirs(directory, exist_ok=True)
+	with open(nvdaAPIVersionsPath, "w", encoding="utf-8") as nvdaAPIVersionsFile:
+		json.dump([
+			{
+				"description": f"NVDA {nvdaAPIVersion.apiVer}",
+				"apiVer": _versionJson(nvdaAPIVersion.apiVer),
+				"backCompatTo": _versionJson(nvdaAPIVersion.backCompatTo),
+			}
+			for nvdaAPIVersion in nvdaAPIVersions
+		], nvdaAPIVersionsFile, indent="\t")
+
+	addonsDir = os.path.join(directory, ADDONS_DIRNAME)
+	addonLanguages: Dict[str, List[str]] = {}
+	for addon in syntheticAddons(nvdaAPIVersions, addonCount, releasesPerAddon, seed):
+		if addon.addonId not in addonLanguages:
+			addonLanguages[addon.addonId] = rng.sample(LANGUAGES[:languageCount], rng.randint(0, languageCount))
+		addonData = {
+			"addonId": addon.addonId,
+			"displayName": f"{addon.addonId} display name",
+			"description": f"A synthetic add-on, {addon.addonId}, for benchmarking the transformation.",
+			"publisher": "NV Access",
+			"channel": addon.channel,
+			"addonVersionNumber": _versionJson(addon.addonVersion),
+			"minNVDAVersion": _versionJson(addon.minNvdaAPIVersion),
+			"lastTestedVersion": _versionJson(addon.lastTestedVersion),
+			"URL": f"https://example.com/{addon.addonId}-{addon.addonVersion}.nvda-addon",
+			"sha256": f"{rng.getrandbits(256):064x}",
+			"translations": [
+				{
+					"language": language,
+					"displayName": f"{addon.addonId} ({language})",
+					"description": f"A synthetic add-on, {addon.addonId}, translated to {language}.",
+				}
+				for language in addonLanguages[addon.addonId]
+			],
+		}
+		addonPath = os.path.join(addonsDir, *addon.pathToData.split("/"))
+		os.makedirs(os.path.dirname(addonPath), exist_ok=True)
+		with open(addonPath, "w", encoding="utf-8") as addonFile:
+			json.dump(addonData, addonFile)
+	return nvdaAPIVersionsPath, addonsDir
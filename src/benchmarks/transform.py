@@ -0,0 +1,196 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Times each phase of the transformation against a synthetic add-on datastore,
+and saves the results as JSON so runs from different commits can be compared.
+Usage: python -m src.benchmarks.transform [--addons N] [--releases N] [--languages N] [--years N]
+	[--jobs N] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import (
+	Any,
+	Callable,
+	Dict,
+	Optional,
+	Tuple,
+)
+
+from src.transform.addonDataCache import AddonDataCache
+from src.transform.transform import (
+	getLatestAddons,
+	getSupportedLanguages,
+	readAddons,
+	readnvdaAPIVersionInfo,
+	writeAddons,
+)
+from src.transform.writer import ViewWriter
+from .syntheticData import writeSyntheticDatastore
+
+try:
+	import resource
+except ImportError:
+	# Not available on Windows
+	resource = None
+
+PHASES = ("readAddons", "getLatestAddons", "getSupportedLanguages", "writeAddons")
+
+
+def peakRSSBytes() -> Optional[int]:
+	"""
+	The peak resident set size of this process, or None if it can't be measured on this platform.
+	Child processes, such as the one writing the synthetic datastore, are not included.
+	"""
+	if resource is None:
+		return None
+	# ru_maxrss is measured in bytes on macOS, and kilobytes elsewhere.
+	unit = 1 if sys.platform == "darwin" else 1024
+	return unit * resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _gitCommit() -> Optional[str]:
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "HEAD"],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.DEVNULL,
+			check=True,
+			cwd=os.path.dirname(__file__),
+		).stdout.decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def _timePhase(func: Callable[[], Any]) -> Tuple[Dict[str, Any], Any]:
+	"""
+	Times func, and measures how much it raised the peak RSS of this process.
+	The peak never falls, so a phase which uses less memory than an earlier phase has no growth.
+	"""
+	startRSS = peakRSSBytes()
+	startWall = time.perf_counter()
+	startCPU = time.process_time()
+	result = func()
+	phase = {
+		"wallSeconds": time.perf_counter() - startWall,
+		"cpuSeconds": time.process_time() - startCPU,
+		"peakRSSGrowthBytes": None if startRSS is None else peakRSSBytes() - startRSS,
+	}
+	return phase, result
+
+
+def runBenchmark(
+		workDir: str,
+		years: int,
+		addonCount: int,
+		releasesPerAddon: int,
+		languageCount: int,
+		jobs: int,
+) -> Dict[str, Any]:
+	"""
+	Writes a synthetic datastore to workDir, and times each phase of transforming it.
+	The datastore is written by another process, so its memory isn't included in the peak RSS.
+	The cpuSeconds and peak RSS of readAddons don't include worker processes.
+	"""
+	with ProcessPoolExecutor(max_workers=1) as executor:
+		nvdaAPIVersionsPath, addonsDir = executor.submit(
+			writeSyntheticDatastore,
+			os.path.join(workDir, "input"), years, addonCount, releasesPerAddon, languageCount
+		).result()
+	nvdaAPIVersionInfo = readnvdaAPIVersionInfo(nvdaAPIVersionsPath)
+	outputDir = os.path.join(workDir, "output")
+	phases: Dict[str, Dict[str, Any]] = {}
+	phases["readAddons"], addons = _timePhase(lambda: list(readAddons(addonsDir, jobs)))
+	phases["getLatestAddons"], latestAddons = _timePhase(lambda: getLatestAddons(addons, nvdaAPIVersionInfo))
+	addonDataCache = AddonDataCache()
+	phases["getSupportedLanguages"], supportedLanguages = _timePhase(
+		lambda: getSupportedLanguages(latestAddons, addonDataCache)
+	)
+	writer = ViewWriter(outputDir)
+
+	def _writeAddons():
+		with writer:
+			writeAddons(outputDir, latestAddons, supportedLanguages, addonDataCache, writer)
+
+	phases["writeAddons"], _result = _timePhase(_writeAddons)
+	return {
+		"parameters": {
+			"years": years,
+			"addons": addonCount,
+			"releasesPerAddon": releasesPerAddon,
+			"languages": languageCount,
+			"jobs": jobs,
+		},
+		"environment": {
+			"commit": _gitCommit(),
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+		},
+		"addonVersions": len(addons),
+		"nvdaAPIVersions": len(nvdaAPIVersionInfo),
+		"supportedLanguages": len(supportedLanguages),
+		"filesWritten": writer.filesWritten,
+		"bytesWritten": writer.bytesWritten,
+		"peakRSSBytes": peakRSSBytes(),
+		"phases": phases,
+	}
+
+
+def printResults(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+	print(
+		f"{results['addonVersions']} add-on versions, {results['nvdaAPIVersions']} NVDA API versions, "
+		f"{results['supportedLanguages']} languages, {results['filesWritten']} files written"
+	)
+	for phaseName in PHASES:
+		phase = results["phases"][phaseName]
+		line = f"{phaseName:<22} {phase['wallSeconds']:8.3f}s wall {phase['cpuSeconds']:8.3f}s CPU"
+		if phase.get("peakRSSGrowthBytes") is not None:
+			line += f" {phase['peakRSSGrowthBytes'] / (1024 * 1024):8.1f} MB peak RSS growth"
+		if baseline is not None and phaseName in baseline["phases"]:
+			ratio = phase["wallSeconds"] / max(baseline["phases"][phaseName]["wallSeconds"], 1e-9)
+			line += f"  {ratio:.2f}x baseline"
+		print(line)
+	if results["peakRSSBytes"] is not None:
+		print(f"Peak RSS: {results['peakRSSBytes'] / (1024 * 1024):.1f} MB")
+	if baseline is not None and baseline["parameters"] != results["parameters"]:
+		print(f"Warning: the baseline was run with different parameters: {baseline['parameters']}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--addons", type=int, default=500, help="The number of add-ons in the store.")
+	parser.add_argument("--releases", type=int, default=20, help="The number of releases of each add-on.")
+	parser.add_argument("--languages", type=int, default=10, help="The number of translation languages.")
+	parser.add_argument("--years", type=int, default=10, help="The number of years of NVDA releases.")
+	parser.add_argument("--jobs", type=int, default=1, help="The number of processes reading the input.")
+	parser.add_argument("--output", help="The path to save the results to as JSON.")
+	parser.add_argument("--compare", help="The path of results saved by a previous run, to compare against.")
+	args = parser.parse_args()
+
+	# Only the transformation is measured, not logging.
+	logging.getLogger().setLevel(logging.CRITICAL)
+	with tempfile.TemporaryDirectory() as workDir:
+		results = runBenchmark(workDir, args.years, args.addons, args.releases, args.languages, args.jobs)
+	baseline = None
+	if args.compare:
+		with open(args.compare, "r", encoding="utf-8") as baselineFile:
+			baseline = json.load(baselineFile)
+	printResults(results, baseline)
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as outputFile:
+			json.dump(results, outputFile, indent="\t")
+
+
+# Worker processes started with the "spawn" method re-import this module.
+if __name__ == "__main__":
+	main()
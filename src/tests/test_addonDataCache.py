@@ -0,0 +1,84 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.transform.addonDataCache import AddonDataCache
+from src.transform.datastructures import (
+	Addon,
+	MajorMinorPatch,
+)
+
+
+class Test_AddonDataCache(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+
+	def _writeAddonData(self, name: str, addonData: dict) -> str:
+		path = os.path.join(self._tempDir.name, name)
+		with open(path, "w", encoding="utf-8") as addonFile:
+			json.dump(addonData, addonFile, ensure_ascii=False)
+		return path
+
+	def test_translations_removed(self):
+		"""Confirm cached documents do not include translations"""
+		path = self._writeAddonData("foo.json", {"addonId": "foo", "translations": []})
+		self.assertEqual(AddonDataCache().get(path), {"addonId": "foo"})
+
+	def test_read_once(self):
+		"""Confirm a document is only parsed on the first request"""
+		path = self._writeAddonData("foo.json", {"addonId": "foo"})
+		cache = AddonDataCache()
+		self.assertIs(cache.get(path), cache.get(path))
+		self.assertEqual(cache.cacheInfo().hits, 1)
+		self.assertEqual(cache.cacheInfo().misses, 1)
+
+	def test_translations_loaded_once(self):
+		"""Confirm loading translations parses the document once, and caches it for views"""
+		translations = [{"language": "de", "displayName": "Foo", "description": "Foo de"}]
+		path = self._writeAddonData("foo.json", {"addonId": "foo", "translations": translations})
+		addon = Addon(
+			"foo", MajorMinorPatch(1, 0), path, "stable", MajorMinorPatch(2023, 1), MajorMinorPatch(2024, 1)
+		)
+		cache = AddonDataCache()
+		self.assertEqual(cache.loadTranslations(addon), translations)
+		self.assertEqual(cache.loadTranslations(addon), translations)
+		self.assertEqual(cache.get(path), {"addonId": "foo"})
+		self.assertEqual(cache.cacheInfo().hits, 1)
+		self.assertEqual(cache.cacheInfo().misses, 1)
+
+	def test_least_recently_used_evicted(self):
+		"""Confirm the least recently used document is evicted when the limit is exceeded"""
+		fooPath = self._writeAddonData("foo.json", {"addonId": "foo"})
+		barPath = self._writeAddonData("bar.json", {"addonId": "bar"})
+		bazPath = self._writeAddonData("baz.json", {"addonId": "baz"})
+		cache = AddonDataCache(limitBytes=2 * os.path.getsize(fooPath))
+		cache.get(fooPath)
+		cache.get(barPath)
+		cache.get(fooPath)
+		cache.get(bazPath)  # evicts bar
+		self.assertEqual(cache.cacheInfo().size, 2)
+		cache.get(fooPath)
+		self.assertEqual(cache.cacheInfo().hits, 2)
+		cache.get(barPath)
+		self.assertEqual(cache.cacheInfo().misses, 4)
+
+	def test_size_in_bytes(self):
+		"""Confirm documents are sized by the bytes of their source file, not the characters"""
+		path = self._writeAddonData("foo.json", {"addonId": "foo", "description": "\u00e9\u00e8"})
+		cache = AddonDataCache()
+		cache.get(path)
+		self.assertEqual(cache.cacheInfo().sizeBytes, os.path.getsize(path))
+
+	def test_zero_limit_disables_caching(self):
+		"""Confirm a limit of zero never caches documents"""
+		path = self._writeAddonData("foo.json", {"addonId": "foo"})
+		cache = AddonDataCache(limitBytes=0)
+		cache.get(path)
+		cache.get(path)
+		self.assertEqual(cache.cacheInfo(), (0, 2, 0, 0))
@@ -0,0 +1,59 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import unittest
+
+from src.transform.aggregates import (
+	AggregateCollector,
+	aggregatePath,
+	buildAggregate,
+)
+from src.transform.datastructures import AddonView
+from src.transform.writer import serializeJson
+
+
+def _view(language: str, apiVersion: str, addonId: str, channel: str = "stable") -> AddonView:
+	data = serializeJson({"addonId": addonId, "displayName": f"{addonId} {language}"})
+	return AddonView(language, apiVersion, addonId, channel, data, None)
+
+
+class Test_buildAggregate(unittest.TestCase):
+	def test_matches_serializeJson(self):
+		"""Confirm an aggregate is the serialized list of views, sorted case insensitively by add-on ID"""
+		documents = [{"addonId": "foo", "n": 1}, {"addonId": "Bar", "n": [1, 2]}, {"addonId": "baz"}]
+		aggregate = buildAggregate((document["addonId"], serializeJson(document)) for document in documents)
+		expected = sorted(documents, key=lambda document: document["addonId"].casefold())
+		self.assertEqual(aggregate, serializeJson(expected))
+
+	def test_empty(self):
+		self.assertEqual(buildAggregate([]), b"[]")
+
+
+class Test_AggregateCollector(unittest.TestCase):
+	def test_aggregates_per_language_apiVersion_and_channel(self):
+		collector = AggregateCollector()
+		views = [
+			_view("en", "2023.1.0", "foo"),
+			_view("en", "2023.1.0", "bar"),
+			_view("en", "2023.1.0", "foo", "beta"),
+			_view("de", "2023.1.0", "foo"),
+			_view("en", "2024.1.0", "bar"),
+		]
+		for view in views:
+			collector.add(view)
+		aggregates = dict(collector.iterAggregates())
+		self.assertEqual(
+			list(aggregates),
+			sorted([
+				aggregatePath("de", "2023.1.0", "stable"),
+				aggregatePath("en", "2023.1.0", "beta"),
+				aggregatePath("en", "2023.1.0", "stable"),
+				aggregatePath("en", "2024.1.0", "stable"),
+			]),
+		)
+		self.assertEqual(
+			json.loads(aggregates["en/2023.1.0/stable.json"]),
+			[json.loads(views[1].data), json.loads(views[0].data)],
+		)
@@ -0,0 +1,92 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import hashlib
+import os
+import tempfile
+import unittest
+
+from src.transform.compare import (
+	compareHashes,
+	Difference,
+	differenceGroup,
+	DifferenceKind,
+	formatDifferences,
+	hashTrees,
+	readTreeManifest,
+)
+
+
+class Test_compare(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.first = os.path.join(self._tempDir.name, "first")
+		self.second = os.path.join(self._tempDir.name, "second")
+		for outputDir in (self.first, self.second):
+			self._writeFile(outputDir, "en/2023.1.0/foo/stable.json", b"foo")
+			self._writeFile(outputDir, "en/2023.1.0/stable.json", b"[foo]")
+			self._writeFile(outputDir, ".transform-manifest.json", outputDir.encode())
+
+	def _writeFile(self, outputDir: str, path: str, data: bytes):
+		fullPath = os.path.join(outputDir, *path.split("/"))
+		os.makedirs(os.path.dirname(fullPath), exist_ok=True)
+		with open(fullPath, "wb") as outputFile:
+			outputFile.write(data)
+
+	def test_identical_trees(self):
+		first, second = hashTrees([self.first, self.second], jobs=2)
+		self.assertEqual(first, {
+			"en/2023.1.0/foo/stable.json": hashlib.sha256(b"foo").hexdigest(),
+			"en/2023.1.0/stable.json": hashlib.sha256(b"[foo]").hexdigest(),
+		})
+		self.assertEqual(compareHashes(first, second), [])
+
+	def test_differences(self):
+		self._writeFile(self.second, "en/2023.1.0/foo/stable.json", b"changed")
+		self._writeFile(self.second, "de/latest/foo/stable.json.gz", b"gz")
+		os.remove(os.path.join(self.second, "en", "2023.1.0", "stable.json"))
+		self.assertEqual(compareHashes(*hashTrees([self.first, self.second])), [
+			Difference(DifferenceKind.EXTRA, "de/latest/foo/stable.json.gz"),
+			Difference(DifferenceKind.CHANGED, "en/2023.1.0/foo/stable.json"),
+			Difference(DifferenceKind.MISSING, "en/2023.1.0/stable.json"),
+		])
+
+	def test_manifest(self):
+		"""Confirm a saved manifest compares as the tree it was saved from"""
+		manifestPath = os.path.join(self._tempDir.name, "golden.sha256")
+		first, = hashTrees([self.first], manifestPaths=[manifestPath])
+		self.assertEqual(readTreeManifest(manifestPath), first)
+		with open(manifestPath, "r") as manifestFile:
+			self.assertEqual(
+				manifestFile.readline(),
+				f"{hashlib.sha256(b'foo').hexdigest()}  en/2023.1.0/foo/stable.json\n",
+			)
+		self.assertEqual(compareHashes(*hashTrees([manifestPath, self.second])), [])
+
+	def test_invalid_manifest(self):
+		manifestPath = os.path.join(self._tempDir.name, "invalid.sha256")
+		with open(manifestPath, "w") as manifestFile:
+			manifestFile.write("not a manifest\n")
+		with self.assertRaises(ValueError):
+			readTreeManifest(manifestPath)
+
+	def test_differenceGroup(self):
+		self.assertEqual(differenceGroup("en/2023.1.0/foo/stable.json"), "en/2023.1.0/stable")
+		self.assertEqual(differenceGroup("en/2023.1.0/beta.json.gz"), "en/2023.1.0/beta")
+		self.assertEqual(differenceGroup("overlays/de/latest/foo/dev.json"), "de/latest/dev")
+		self.assertEqual(differenceGroup("base/latest/foo/dev.json"), "base/latest/dev")
+		self.assertEqual(differenceGroup("README.md"), "README.md")
+
+	def test_formatDifferences_limit(self):
+		differences = [
+			Difference(DifferenceKind.CHANGED, f"en/latest/addon{i}/stable.json") for i in range(3)
+		] + [Difference(DifferenceKind.MISSING, "de/latest/addon0/beta.json")]
+		self.assertEqual(formatDifferences(differences, limit=2), [
+			"de/latest/beta: 1 difference(s)",
+			"\tmissing de/latest/addon0/beta.json",
+			"en/latest/stable: 3 difference(s)",
+			"\tchanged en/latest/addon0/stable.json",
+			"2 more difference(s) not listed",
+		])
@@ -1,8 +1,17 @@
-# Copyright (C) 2021 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
-from src.transform.datastructures import MajorMinorPatch
+import json
+import os
+import pickle
+import tempfile
+from src.transform.datastructures import (
+	Addon,
+	MajorMinorPatch,
+	packVersion,
+	unpackVersion,
+)
 import unittest
 
 
@@ -60,3 +69,77 @@ def test_fromDict_throws(self):
 				"major": 2,
 				"patch": 2,
 			})
+
+
+class Test_packVersion(unittest.TestCase):
+	def test_round_trip(self):
+		for version in (MajorMinorPatch(0, 0, 0), MajorMinorPatch(2024, 4, 2), MajorMinorPatch(1, 1048575, 3)):
+			self.assertEqual(unpackVersion(packVersion(version)), version)
+
+	def test_order_preserved(self):
+		"""Confirm packed versions order the same as the versions"""
+		versions = [MajorMinorPatch(2024, 1, 0), MajorMinorPatch(2023, 3, 5), MajorMinorPatch(2023, 10, 0)]
+		self.assertEqual(
+			sorted(versions),
+			[unpackVersion(packedVersion) for packedVersion in sorted(map(packVersion, versions))],
+		)
+
+	def test_too_large_throws(self):
+		with self.assertRaises(ValueError):
+			packVersion(MajorMinorPatch(1, 1 << 20))
+
+
+class Test_Addon(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.pathToData = os.path.join(self._tempDir.name, "foo.json")
+		with open(self.pathToData, "w") as addonFile:
+			json.dump({
+				"addonId": "foo",
+				"translations": [{"language": "de", "displayName": "Foo", "description": "Foo de"}],
+			}, addonFile)
+		self.addon = Addon(
+			addonId="foo",
+			addonVersion=MajorMinorPatch(1, 2, 3),
+			pathToData=self.pathToData,
+			channel="stable",
+			minNvdaAPIVersion=MajorMinorPatch(2023, 1),
+			lastTestedVersion=MajorMinorPatch(2024, 1),
+		)
+
+	def test_attributes(self):
+		self.assertEqual(self.addon.addonVersion, MajorMinorPatch(1, 2, 3))
+		self.assertEqual(self.addon.minNvdaAPIVersion, MajorMinorPatch(2023, 1))
+		self.addon.lastTestedVersion = MajorMinorPatch(2024, 2)
+		self.assertEqual(self.addon.lastTestedVersion, MajorMinorPatch(2024, 2))
+
+	def test_translations_loaded_lazily(self):
+		"""Confirm translations are loaded from pathToData when first accessed"""
+		self.assertEqual(
+			self.addon.translations,
+			[{"language": "de", "displayName": "Foo", "description": "Foo de"}],
+		)
+		os.remove(self.pathToData)
+		self.assertEqual(len(self.addon.translations), 1)
+
+	def test_version_too_large_to_pack(self):
+		"""Confirm valid versions which can't be packed, e.g. a date as the patch number, are kept"""
+		self.addon.addonVersion = MajorMinorPatch(1, 0, 20240115)
+		self.assertEqual(self.addon.addonVersion, MajorMinorPatch(1, 0, 20240115))
+		self.assertGreater(self.addon.addonVersion, MajorMinorPatch(1, 0, 3))
+		self.assertEqual(pickle.loads(pickle.dumps(self.addon)), self.addon)
+
+	def test_equal_without_reading_translations(self):
+		"""Confirm comparing add-ons doesn't load translations, which are compared once both are loaded"""
+		otherAddon = pickle.loads(pickle.dumps(self.addon))
+		self.assertEqual(len(self.addon.translations), 1)
+		os.remove(self.pathToData)
+		self.assertEqual(self.addon, otherAddon)
+		self.assertFalse(otherAddon.translationsLoaded)
+		otherAddon.translations = []
+		self.assertNotEqual(self.addon, otherAddon)
+
+	def test_pickle(self):
+		"""Confirm add-ons can be sent between processes"""
+		self.assertEqual(pickle.loads(pickle.dumps(self.addon)), self.addon)
@@ -0,0 +1,87 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from src.transform.etags import (
+	ETAG_MANIFEST_SUFFIX,
+	ETagCollector,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+class Test_ETagCollector(unittest.TestCase):
+	def test_manifests(self):
+		collector = ETagCollector()
+		collector.add("en/2023.1.0/foo/stable.json", b"foo")
+		collector.add("en/2023.1.0/bar/stable.json", b"bar!")
+		collector.add("en/2023.1.0/foo/beta.json", b"foo beta")
+		collector.add("en/2023.1.0/stable.json", b"[bar!,foo]")
+		manifests = dict(collector.iterManifests())
+		self.assertEqual(list(manifests), ["en/2023.1.0/beta.etags.json", "en/2023.1.0/stable.etags.json"])
+		self.assertEqual(json.loads(manifests["en/2023.1.0/stable.etags.json"]), {
+			"language": "en",
+			"apiVersion": "2023.1.0",
+			"channel": "stable",
+			"files": [
+				{"path": "en/2023.1.0/bar/stable.json", "size": 4, "sha256": hashlib.sha256(b"bar!").hexdigest()},
+				{"path": "en/2023.1.0/foo/stable.json", "size": 3, "sha256": hashlib.sha256(b"foo").hexdigest()},
+				{"path": "en/2023.1.0/stable.json", "size": 10, "sha256": hashlib.sha256(b"[bar!,foo]").hexdigest()},
+			],
+		})
+
+
+class Test_etagManifests(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		for addonId in ("foo", "bar"):
+			os.makedirs(os.path.join(self.inputDir, addonId))
+			with open(os.path.join(self.inputDir, addonId, "1.0.0.json"), "w") as addonFile:
+				json.dump({
+					"addonId": addonId,
+					"displayName": addonId,
+					"description": addonId,
+					"channel": "stable",
+					"addonVersionNumber": {"major": 1, "minor": 0, "patch": 0},
+					"minNVDAVersion": {"major": 2023, "minor": 1, "patch": 0},
+					"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+					"translations": [{"language": "de", "displayName": addonId, "description": "de"}],
+				}, addonFile)
+
+	def test_manifests_list_every_file(self):
+		"""Confirm the manifests list the size and hash of every file written, and nothing else"""
+		outputDir = os.path.join(self._tempDir.name, "output")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, outputDir, aggregate=True, etags=True)
+		listedFiles = {}
+		for manifestPath in glob.glob(f"{outputDir}/**/*{ETAG_MANIFEST_SUFFIX}", recursive=True):
+			with open(manifestPath, "r") as manifestFile:
+				manifest = json.load(manifestFile)
+			for file in manifest["files"]:
+				self.assertEqual(
+					file["path"].split("/")[:2],
+					[manifest["language"], manifest["apiVersion"]],
+				)
+				listedFiles[file["path"]] = (file["size"], file["sha256"])
+		writtenFiles = {}
+		for path in glob.glob(f"{outputDir}/**/*.json", recursive=True):
+			if path.endswith(ETAG_MANIFEST_SUFFIX):
+				continue
+			with open(path, "rb") as outputFile:
+				data = outputFile.read()
+			relativePath = os.path.relpath(path, outputDir).replace(os.sep, "/")
+			writtenFiles[relativePath] = (len(data), hashlib.sha256(data).hexdigest())
+		self.assertIn("de/latest/stable.json", writtenFiles)
+		self.assertEqual(listedFiles, writtenFiles)
@@ -0,0 +1,106 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.transform.datastructures import (
+	Addon,
+	MajorMinorPatch,
+	VersionCompatibility,
+)
+from src.transform.explain import (
+	DecisionTrace,
+	rejectionReason,
+)
+from src.transform.transform import getLatestAddons
+from src.transform.views import iterAddonViews
+
+V_2020_1 = MajorMinorPatch(2020, 1)
+V_2021_1 = MajorMinorPatch(2021, 1)
+V_2022_1 = MajorMinorPatch(2022, 1)
+
+
+def _addon(major: int, minNvdaAPIVersion: MajorMinorPatch, lastTestedVersion: MajorMinorPatch) -> Addon:
+	return Addon(
+		addonId="foo",
+		addonVersion=MajorMinorPatch(major, 0),
+		pathToData=f"foo/{major}.0.0.json",
+		channel="stable",
+		minNvdaAPIVersion=minNvdaAPIVersion,
+		lastTestedVersion=lastTestedVersion,
+		translations=[],
+	)
+
+
+class Test_rejectionReason(unittest.TestCase):
+	def test_compatible(self):
+		self.assertEqual(rejectionReason(_addon(1, V_2020_1, V_2021_1), V_2021_1, V_2021_1), "")
+
+	def test_minNVDAVersion_too_new(self):
+		self.assertIn("minNVDAVersion", rejectionReason(_addon(1, V_2021_1, V_2021_1), V_2020_1, V_2020_1))
+
+	def test_lastTestedVersion_too_old(self):
+		self.assertIn("lastTestedVersion", rejectionReason(_addon(1, V_2020_1, V_2020_1), V_2021_1, V_2021_1))
+
+
+class Test_DecisionTrace(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.tracePath = os.path.join(self._tempDir.name, "explain.jsonl")
+
+	def _readDecisions(self):
+		with open(self.tracePath, "r", encoding="utf-8") as traceFile:
+			return [json.loads(line) for line in traceFile]
+
+	def test_selection_explained(self):
+		"""Confirm each version of an add-on is explained for each API version"""
+		oldAddon = _addon(1, V_2020_1, V_2021_1)
+		newAddon = _addon(2, V_2022_1, V_2022_1)
+		nvdaAPIVersions = (
+			VersionCompatibility(V_2020_1, V_2020_1),
+			VersionCompatibility(V_2021_1, V_2021_1),
+			VersionCompatibility(V_2022_1, V_2022_1),
+		)
+		with DecisionTrace(self.tracePath) as trace:
+			latestAddons = getLatestAddons([oldAddon, newAddon], nvdaAPIVersions, trace)
+		self.assertEqual(latestAddons, getLatestAddons([oldAddon, newAddon], nvdaAPIVersions))
+		decisions = self._readDecisions()
+		self.assertEqual(
+			[(decision["apiVersion"], decision["selectedVersion"]) for decision in decisions],
+			[("2020.1.0", "1.0.0"), ("2021.1.0", "1.0.0"), ("2022.1.0", "2.0.0")],
+		)
+		self.assertEqual(
+			[(candidate["addonVersion"], candidate["selected"]) for candidate in decisions[2]["candidates"]],
+			[("2.0.0", True), ("1.0.0", False)],
+		)
+		self.assertEqual(
+			decisions[2]["candidates"][1]["reason"],
+			"lastTestedVersion 2021.1.0 is older than backCompatTo 2022.1.0",
+		)
+
+	def test_latest_explained(self):
+		"""Confirm the version written to the latest view is explained"""
+		addon = _addon(1, V_2020_1, V_2021_1)
+		addon.pathToData = os.path.join(self._tempDir.name, "foo.json")
+		with open(addon.pathToData, "w") as addonFile:
+			json.dump({
+				"addonId": "foo",
+				"channel": "stable",
+				"addonVersionNumber": {"major": 1, "minor": 0, "patch": 0},
+				"minNVDAVersion": {"major": 2020, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2021, "minor": 1, "patch": 0},
+			}, addonFile)
+		latestAddons = getLatestAddons([addon], (VersionCompatibility(V_2021_1, V_2020_1),))
+		with DecisionTrace(self.tracePath) as trace:
+			for _view in iterAddonViews(latestAddons, set(), trace=trace):
+				pass
+		decisions = self._readDecisions()
+		self.assertEqual(len(decisions), 1)
+		self.assertEqual(decisions[0]["decision"], "latest")
+		self.assertEqual(decisions[0]["addonVersion"], "1.0.0")
+		self.assertEqual(decisions[0]["apiVersion"], "2021.1.0")
@@ -0,0 +1,140 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import logging
+import os
+import tempfile
+from typing import (
+	Dict,
+	List,
+	Optional,
+)
+import unittest
+
+from src.transform.incremental import (
+	MANIFEST_FILENAME,
+	runIncrementalTransformation,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+def _readTree(root: str) -> Dict[str, bytes]:
+	tree = {}
+	for directory, _subdirectories, fileNames in os.walk(root):
+		for fileName in fileNames:
+			if fileName == MANIFEST_FILENAME:
+				continue
+			path = os.path.join(directory, fileName)
+			with open(path, "rb") as f:
+				tree[os.path.relpath(path, root)] = f.read()
+	return tree
+
+
+class Test_runIncrementalTransformation(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		self.outputDir = os.path.join(self._tempDir.name, "output")
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+
+	def _writeAddon(self, addonId: str, major: int, translations: List[Dict] = ()):
+		os.makedirs(os.path.join(self.inputDir, addonId), exist_ok=True)
+		with open(os.path.join(self.inputDir, addonId, f"{major}.0.0.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": f"{addonId} {major}",
+				"channel": "stable",
+				"addonVersionNumber": {"major": major, "minor": 0, "patch": 0},
+				"minNVDAVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023 + major, "minor": 1, "patch": 0},
+				"translations": list(translations),
+			}, addonFile)
+
+	def _assertMatchesFullTransformation(self, aggregate: bool = False, compressLevel: Optional[int] = None):
+		fullOutputDir = tempfile.mkdtemp(dir=self._tempDir.name)
+		os.rmdir(fullOutputDir)
+		runTransformation(
+			NVDA_API_VERSIONS_PATH, self.inputDir, fullOutputDir, aggregate=aggregate, compressLevel=compressLevel
+		)
+		self.assertEqual(_readTree(self.outputDir), _readTree(fullOutputDir))
+		self.assertTrue(os.path.exists(os.path.join(self.outputDir, MANIFEST_FILENAME)))
+
+	def test_initial_run(self):
+		"""Confirm an incremental run without a previous manifest writes every view"""
+		self._writeAddon("foo", 1)
+		self._writeAddon("bar", 1, [{"language": "de", "displayName": "Bar", "description": "Bar de"}])
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._assertMatchesFullTransformation()
+
+	def test_changed_and_removed_inputs(self):
+		"""Confirm changed views are rewritten, and views of removed add-ons are deleted"""
+		self._writeAddon("foo", 1)
+		self._writeAddon("bar", 1)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._writeAddon("foo", 2)
+		os.remove(os.path.join(self.inputDir, "bar", "1.0.0.json"))
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._assertMatchesFullTransformation()
+		self.assertFalse(os.path.exists(os.path.join(self.outputDir, "en", "latest", "bar")))
+
+	def test_new_language(self):
+		"""Confirm every add-on is updated when a new language is supported"""
+		self._writeAddon("foo", 1)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._writeAddon("bar", 1, [{"language": "fr", "displayName": "Bar", "description": "Bar fr"}])
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._assertMatchesFullTransformation()
+
+	def test_unchanged_views_not_rewritten(self):
+		"""Confirm views of unchanged add-ons are not written again"""
+		self._writeAddon("foo", 1)
+		self._writeAddon("bar", 1)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		fooView = os.path.join(self.outputDir, "en", "latest", "foo", "stable.json")
+		os.utime(fooView, (0, 0))
+		self._writeAddon("bar", 2)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self.assertEqual(os.path.getmtime(fooView), 0)
+
+	def test_aggregates_updated(self):
+		"""Confirm aggregate views are added, updated and removed to match a full transformation"""
+		self._writeAddon("foo", 1)
+		self._writeAddon("bar", 1)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self._assertMatchesFullTransformation(aggregate=True)
+		self._writeAddon("foo", 2)
+		os.remove(os.path.join(self.inputDir, "bar", "1.0.0.json"))
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self._assertMatchesFullTransformation(aggregate=True)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._assertMatchesFullTransformation()
+
+	def test_compression_changed(self):
+		"""Confirm compressed views are added and removed when the compression level changes"""
+		self._writeAddon("foo", 1)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		runIncrementalTransformation(
+			NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True, compressLevel=1
+		)
+		self._assertMatchesFullTransformation(aggregate=True, compressLevel=1)
+		self._writeAddon("bar", 1)
+		runIncrementalTransformation(
+			NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True, compressLevel=1
+		)
+		self._assertMatchesFullTransformation(aggregate=True, compressLevel=1)
+		runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self._assertMatchesFullTransformation(aggregate=True)
+
+	def test_unmanaged_output_throws(self):
+		"""Confirm an existing output directory without a manifest is not overwritten"""
+		os.makedirs(os.path.join(self.outputDir, "en"))
+		with self.assertRaises(FileExistsError):
+			runIncrementalTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
@@ -0,0 +1,95 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from src.transform.datastructures import AddonView
+from src.transform.instrumentation import (
+	RunReport,
+	timedPhase,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+class Test_RunReport(unittest.TestCase):
+	def test_phase_accumulates(self):
+		"""Confirm time spent in a phase is accumulated over each time it is entered"""
+		report = RunReport()
+		for _ in range(3):
+			with report.phase("selectAddons"):
+				pass
+		self.assertEqual(report.phases["selectAddons"].calls, 3)
+		self.assertGreaterEqual(report.phases["selectAddons"].wallSeconds, 0)
+
+	def test_timedPhase_without_report(self):
+		"""Confirm phases are not timed without a report"""
+		with timedPhase(None, "readAddons"):
+			pass
+
+	def test_instrumentViews_counts_outputs(self):
+		report = RunReport()
+		views = [
+			AddonView("en", "2020.1.0", "foo", "stable", b"{}", None),
+			AddonView("en", "latest", "foo", "stable", b"{}", None),
+			AddonView("en", "2020.1.0", "bar", "stable", b"{}", None),
+		]
+		self.assertEqual(list(report.instrumentViews(iter(views))), views)
+		self.assertEqual(report.outputs, {"en": {"2020.1.0": 2, "latest": 1}})
+		self.assertEqual(report.phases["generateViews"].calls, 4)
+
+
+class Test_runTransformation_report(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		os.makedirs(os.path.join(self.inputDir, "foo"))
+		with open(os.path.join(self.inputDir, "foo", "1.0.0.json"), "w") as addonFile:
+			json.dump({
+				"addonId": "foo",
+				"channel": "stable",
+				"addonVersionNumber": {"major": 1, "minor": 0, "patch": 0},
+				"minNVDAVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"translations": [{"language": "de", "displayName": "Foo", "description": "Foo de"}],
+			}, addonFile)
+
+	def test_report_saved(self):
+		"""Confirm a report of the phases, counts and outputs of a run is saved"""
+		report = RunReport()
+		outputDir = os.path.join(self._tempDir.name, "output")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, outputDir, report=report)
+		reportPath = os.path.join(self._tempDir.name, "report.json")
+		report.save(reportPath)
+		with open(reportPath, "r", encoding="utf-8") as reportFile:
+			reportData = json.load(reportFile)
+		self.assertEqual(
+			set(reportData["phases"]),
+			{"readAddons", "selectAddons", "loadTranslations", "generateViews", "queueWrites", "flushWrites"},
+		)
+		self.assertEqual(reportData["counts"]["filesRead"], 1)
+		# The English and German documents are validated once for each class of API versions
+		# the add-on is selected for.
+		self.assertEqual(
+			reportData["counts"]["outputDocumentsValidated"],
+			2 * reportData["counts"]["classAddonsSelected"],
+		)
+		self.assertEqual(
+			sum(len(apiVersions) for apiVersions in reportData["apiVersionClasses"]),
+			reportData["counts"]["apiVersions"],
+		)
+		self.assertLess(reportData["counts"]["apiVersionClasses"], reportData["counts"]["apiVersions"])
+		self.assertEqual(set(reportData["outputs"]), {"en", "de"})
+		self.assertEqual(
+			reportData["counts"]["filesWritten"],
+			sum(count for apiVersions in reportData["outputs"].values() for count in apiVersions.values()),
+		)
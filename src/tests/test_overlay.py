@@ -0,0 +1,103 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import glob
+import json
+import logging
+import os
+import tempfile
+import unittest
+from typing import (
+	Dict,
+	List,
+)
+
+from src.transform.overlay import (
+	OutputLayout,
+	resolveOverlayView,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+def _translation(language: str, addonId: str) -> Dict[str, str]:
+	return {
+		"language": language,
+		"displayName": f"{addonId} {language}",
+		"description": f"{addonId} in {language}",
+	}
+
+
+class Test_overlayLayout(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		self._writeAddon("foo", 2023, [_translation("de", "foo"), _translation("pt", "foo")])
+		self._writeAddon("bar", 2022, [_translation("pt_BR", "bar")])
+		self._writeAddon("baz", 2023, [])
+
+	def _writeAddon(self, addonId: str, minMajor: int, translations: List[Dict[str, str]]):
+		os.makedirs(os.path.join(self.inputDir, addonId))
+		with open(os.path.join(self.inputDir, addonId, "1.0.0.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": f"{addonId} in English",
+				"channel": "stable",
+				"addonVersionNumber": {"major": 1, "minor": 0, "patch": 0},
+				"minNVDAVersion": {"major": minMajor, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"translations": translations,
+			}, addonFile)
+
+	def _transform(self, layout: OutputLayout) -> str:
+		outputDir = os.path.join(self._tempDir.name, layout.value)
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, outputDir, layout=layout)
+		return outputDir
+
+	def test_resolved_views_match_full_layout(self):
+		"""Confirm resolving each view from the overlay layout gives the document of the full layout"""
+		fullDir = self._transform(OutputLayout.FULL)
+		overlayDir = self._transform(OutputLayout.OVERLAY)
+		fullViews = glob.glob(f"{fullDir}/**/*.json", recursive=True)
+		self.assertGreater(len(fullViews), 0)
+		for viewPath in fullViews:
+			language, apiVersion, addonId, channelFile = os.path.relpath(viewPath, fullDir).split(os.sep)
+			with open(viewPath, "r", encoding="utf-8") as viewFile:
+				expected = json.load(viewFile)
+			with self.subTest(view=viewPath):
+				self.assertEqual(
+					resolveOverlayView(overlayDir, language, apiVersion, addonId, channelFile[:-len(".json")]),
+					expected,
+				)
+		overlayFiles = glob.glob(f"{overlayDir}/**/*.json", recursive=True)
+		self.assertLess(len(overlayFiles), len(fullViews))
+
+	def test_overlay_records_fallback(self):
+		"""Confirm an overlay records the translation used when falling back from a locale"""
+		overlayDir = self._transform(OutputLayout.OVERLAY)
+		with open(os.path.join(overlayDir, "overlays", "pt_BR", "latest", "foo", "stable.json")) as overlayFile:
+			overlay = json.load(overlayFile)
+		self.assertEqual(overlay, {
+			"translationLanguage": "pt",
+			"displayName": "foo pt",
+			"description": "foo in pt",
+		})
+		self.assertFalse(os.path.exists(os.path.join(overlayDir, "overlays", "de", "latest", "baz")))
+
+	def test_missing_addon(self):
+		overlayDir = self._transform(OutputLayout.OVERLAY)
+		self.assertIsNone(resolveOverlayView(overlayDir, "de", "latest", "missing", "stable"))
+
+	def test_aggregate_throws(self):
+		"""Confirm aggregate views are only supported with the full layout"""
+		outputDir = os.path.join(self._tempDir.name, "output")
+		with self.assertRaises(ValueError):
+			runTransformation(
+				NVDA_API_VERSIONS_PATH, self.inputDir, outputDir, aggregate=True, layout=OutputLayout.OVERLAY
+			)
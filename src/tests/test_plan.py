@@ -0,0 +1,138 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import unittest
+from typing import Dict
+
+from src.transform.plan import (
+	applyPlan,
+	PlanReason,
+	planTransformation,
+	updateTransformation,
+)
+from src.transform.transform import (
+	getLatestAddons,
+	getSupportedLanguages,
+	iterOutputFiles,
+	readAddons,
+	readnvdaAPIVersionInfo,
+	runTransformation,
+)
+from src.transform.writer import COMPRESSED_SUFFIX
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+def _readTree(outputDir: str) -> Dict[str, bytes]:
+	tree = {}
+	for path in glob.glob(f"{outputDir}/**/*.json", recursive=True):
+		with open(path, "rb") as viewFile:
+			tree[os.path.relpath(path, outputDir).replace(os.sep, "/")] = viewFile.read()
+	return tree
+
+
+class Test_plan(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		self.outputDir = os.path.join(self._tempDir.name, "output")
+		self._writeAddon("foo", "1.0.0", "Foo")
+		self._writeAddon("bar", "1.0.0", "Bar")
+
+	def _writeAddon(self, addonId: str, version: str, description: str):
+		os.makedirs(os.path.join(self.inputDir, addonId), exist_ok=True)
+		major, minor, patch = (int(part) for part in version.split("."))
+		with open(os.path.join(self.inputDir, addonId, f"{version}.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": description,
+				"channel": "stable",
+				"addonVersionNumber": {"major": major, "minor": minor, "patch": patch},
+				"minNVDAVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"translations": [{"language": "de", "displayName": addonId, "description": description}],
+			}, addonFile)
+
+	def test_plan_without_output(self):
+		"""Confirm every file is added, with the content runTransformation writes"""
+		plan = planTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self.assertFalse(os.path.exists(self.outputDir))
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self.assertEqual(
+			{entry.path: entry.sha256 for entry in plan.entries},
+			{path: hashlib.sha256(data).hexdigest() for path, data in _readTree(self.outputDir).items()},
+		)
+		self.assertEqual({entry.reason for entry in plan.entries}, {PlanReason.ADDED})
+		self.assertEqual(plan.removedPaths, [])
+		self.assertTrue(plan.hasChanges)
+		sources = {entry.path: entry.source for entry in plan.entries}
+		self.assertEqual(sources["en/latest/foo/stable.json"], os.path.join(self.inputDir, "foo", "1.0.0.json"))
+		self.assertIsNone(sources["en/latest/stable.json"])
+
+	def test_plan_unchanged_output(self):
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		plan = planTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self.assertFalse(plan.hasChanges)
+		self.assertEqual(plan.toJson()["unchanged"], len(plan.entries))
+
+	def test_plan_and_apply_changes(self):
+		"""Confirm changes to the input are planned against the existing output, and applying the plan
+		leaves the output identical to a new transformation"""
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self._writeAddon("foo", "1.1.0", "Foo changed")
+		self._writeAddon("baz", "1.0.0", "Baz")
+		os.remove(os.path.join(self.inputDir, "bar", "1.0.0.json"))
+		plan = planTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self.assertIn("en/latest/baz/stable.json", plan.paths(PlanReason.ADDED))
+		self.assertIn("en/latest/foo/stable.json", plan.paths(PlanReason.CHANGED))
+		self.assertIn("en/latest/bar/stable.json", plan.removedPaths)
+		self.assertEqual(plan.toJson()["removed"], plan.removedPaths)
+		latestAddons = getLatestAddons(
+			readAddons(self.inputDir),
+			readnvdaAPIVersionInfo(NVDA_API_VERSIONS_PATH),
+		)
+		files = iterOutputFiles(latestAddons, getSupportedLanguages(latestAddons))
+		applyPlan(plan, files, self.outputDir)
+		expectedDir = os.path.join(self._tempDir.name, "expected")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, expectedDir)
+		self.assertEqual(_readTree(self.outputDir), _readTree(expectedDir))
+		self.assertFalse(os.path.exists(os.path.join(self.outputDir, "en", "latest", "bar")))
+
+	def test_update_only_writes_changes(self):
+		"""Confirm an update writes the added and changed files, and nothing when the output is up to date"""
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		unchangedPath = os.path.join(self.outputDir, "en", "latest", "bar", "stable.json")
+		unchangedMtime = os.stat(unchangedPath).st_mtime_ns
+		self._writeAddon("foo", "1.1.0", "Foo changed")
+		plan = updateTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self.assertIn("en/latest/foo/stable.json", plan.paths(PlanReason.CHANGED))
+		expectedDir = os.path.join(self._tempDir.name, "expected")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, expectedDir, aggregate=True)
+		self.assertEqual(_readTree(self.outputDir), _readTree(expectedDir))
+		self.assertEqual(os.stat(unchangedPath).st_mtime_ns, unchangedMtime)
+		plan = updateTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, aggregate=True)
+		self.assertFalse(plan.hasChanges)
+
+	def test_update_compressed_copies(self):
+		"""Confirm updating without compression removes compressed copies, and with it writes missing ones"""
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, compressLevel=1)
+		self._writeAddon("foo", "1.1.0", "Foo changed")
+		updateTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir)
+		self.assertEqual(glob.glob(f"{self.outputDir}/**/*{COMPRESSED_SUFFIX}", recursive=True), [])
+		self.assertFalse(updateTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir).hasChanges)
+		updateTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, self.outputDir, compressLevel=1)
+		self.assertEqual(
+			sorted(glob.glob(f"{self.outputDir}/**/*{COMPRESSED_SUFFIX}", recursive=True)),
+			sorted(f"{path}{COMPRESSED_SUFFIX}" for path in glob.glob(f"{self.outputDir}/**/*.json", recursive=True)),
+		)
@@ -0,0 +1,141 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import unittest
+
+from src.benchmarks.syntheticData import (
+	syntheticAddons,
+	syntheticAPIVersions,
+)
+from src.transform.datastructures import (
+	Addon,
+	MajorMinorPatch,
+	VersionCompatibility,
+)
+from src.transform.selection import (
+	apiVersionClasses,
+	groupAddons,
+	selectLatestAddons,
+	SortedAPIVersions,
+)
+from src.transform.transform import (
+	_isAddonCompatible,
+	getLatestAddons,
+)
+from src.transform.views import groupAPIVersionClasses
+
+V_2020_1 = MajorMinorPatch(2020, 1)
+V_2020_2 = MajorMinorPatch(2020, 2)
+V_2021_1 = MajorMinorPatch(2021, 1)
+V_2021_2 = MajorMinorPatch(2021, 2)
+
+
+def _addon(addonId: str, version: MajorMinorPatch, minVersion, testedVersion, channel="stable") -> Addon:
+	return Addon(
+		addonId=addonId,
+		addonVersion=version,
+		pathToData=f"{addonId}/{version}.json",
+		channel=channel,
+		minNvdaAPIVersion=minVersion,
+		lastTestedVersion=testedVersion,
+		translations=[],
+	)
+
+
+class Test_groupAddons(unittest.TestCase):
+	def test_grouped_case_insensitively_newest_first(self):
+		"""Confirm add-on IDs with different casing are grouped, and groups are sorted newest first"""
+		old = _addon("Foo", MajorMinorPatch(0, 1), V_2020_1, V_2020_1)
+		new = _addon("foo", MajorMinorPatch(0, 2), V_2020_1, V_2020_1)
+		beta = _addon("foo", MajorMinorPatch(0, 3), V_2020_1, V_2020_1, channel="beta")
+		self.assertEqual(groupAddons([old, beta, new]), {
+			("foo", "stable"): [new, old],
+			("foo", "beta"): [beta],
+		})
+
+
+class Test_SortedAPIVersions(unittest.TestCase):
+	def test_compatibleWindow(self):
+		"""Confirm the window excludes API versions no add-on in the group can be compatible with"""
+		apiVersions = SortedAPIVersions((
+			VersionCompatibility(V_2021_2, V_2021_1),
+			VersionCompatibility(V_2020_1, V_2020_1),
+			VersionCompatibility(V_2020_2, V_2020_1),
+			VersionCompatibility(V_2021_1, V_2021_1),
+		))
+		group = [_addon("foo", MajorMinorPatch(0, 1), V_2020_2, V_2020_2)]
+		window = apiVersions.compatibleWindow(group)
+		self.assertEqual([apiVersions.apiVersions[i] for i in window], [V_2020_2])
+
+	def test_duplicate_apiVer_uses_lowest_backCompatTo(self):
+		"""Confirm an API version listed twice is compatible if either entry is"""
+		apiVersions = SortedAPIVersions((
+			VersionCompatibility(V_2021_1, V_2021_1),
+			VersionCompatibility(V_2021_1, V_2020_1),
+		))
+		self.assertEqual(apiVersions.backCompatTo, [V_2020_1])
+		addon = _addon("foo", MajorMinorPatch(0, 1), V_2020_1, V_2020_2)
+		self.assertEqual(list(selectLatestAddons(groupAddons([addon]), apiVersions)), [(V_2021_1, addon)])
+
+
+class Test_apiVersionClasses(unittest.TestCase):
+	def setUp(self):
+		self.nvdaAPIVersions = (
+			VersionCompatibility(V_2020_1, V_2020_1),
+			VersionCompatibility(MajorMinorPatch(2020, 1, 1), V_2020_1),
+			VersionCompatibility(V_2020_2, V_2020_1),
+			VersionCompatibility(V_2021_1, V_2021_1),
+			VersionCompatibility(MajorMinorPatch(2021, 1, 1), V_2021_1),
+		)
+
+	def test_classes(self):
+		"""Confirm API versions are only split by the versions add-ons require or were tested with"""
+		addons = [
+			_addon("foo", MajorMinorPatch(0, 1), V_2020_1, V_2020_1),
+			_addon("foo", MajorMinorPatch(0, 2), V_2020_2, V_2021_1),
+		]
+		apiVersions = SortedAPIVersions(self.nvdaAPIVersions)
+		self.assertEqual(
+			[
+				[apiVersions.apiVersions[index] for index in members]
+				for members in apiVersionClasses(groupAddons(addons), apiVersions)
+			],
+			[
+				[MajorMinorPatch(2021, 1, 1), V_2021_1],
+				[V_2020_2],
+				[MajorMinorPatch(2020, 1, 1), V_2020_1],
+			],
+		)
+
+	def test_classes_group_selection(self):
+		"""Confirm the API versions of a class are grouped, and editing one doesn't change the others"""
+		addons = [_addon("foo", MajorMinorPatch(0, 1), V_2020_1, V_2021_1)]
+		latestAddons = getLatestAddons(addons, self.nvdaAPIVersions)
+		self.assertEqual(groupAPIVersionClasses(latestAddons), [sorted(latestAddons, reverse=True)])
+		del latestAddons[V_2020_1]["stable"]["foo"]
+		self.assertIn("foo", latestAddons[V_2021_1]["stable"])
+		self.assertEqual(len(groupAPIVersionClasses(latestAddons)), 2)
+
+
+class Test_getLatestAddons_matches_exhaustive_selection(unittest.TestCase):
+	def test_synthetic_store(self):
+		"""Confirm the sorted selection matches checking every add-on against every API version"""
+		nvdaAPIVersions = syntheticAPIVersions(years=3)
+		addons = syntheticAddons(nvdaAPIVersions, addonCount=20, releasesPerAddon=12)
+		expected = {}
+		for nvdaAPIVersion in nvdaAPIVersions:
+			for addon in addons:
+				key = (nvdaAPIVersion.apiVer, addon.channel, addon.addonId)
+				if _isAddonCompatible(addon, nvdaAPIVersion) and (
+					key not in expected or addon.addonVersion > expected[key].addonVersion
+				):
+					expected[key] = addon
+		latestAddons = getLatestAddons(addons, nvdaAPIVersions)
+		actual = {
+			(apiVer, channel, addonId): addon
+			for apiVer, channels in latestAddons.items()
+			for channel, channelAddons in channels.items()
+			for addonId, addon in channelAddons.items()
+		}
+		self.assertEqual(actual, expected)
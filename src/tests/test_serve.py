@@ -0,0 +1,142 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import (
+	Request,
+	urlopen,
+)
+from typing import (
+	Dict,
+	List,
+)
+
+from src.transform.serve import (
+	createServer,
+	ViewService,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+class Test_ViewService(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		self._writeAddon("foo", 2023, "1.0.0", [
+			{"language": "de", "displayName": "Foo", "description": "Foo de"},
+			{"language": "pt", "displayName": "Foo", "description": "Foo pt"},
+		])
+		self._writeAddon("Bar", 2022, "1.0.0", [{"language": "pt_BR", "displayName": "Bar", "description": "Bar"}])
+
+	def _writeAddon(self, addonId: str, minMajor: int, version: str, translations: List[Dict[str, str]]):
+		os.makedirs(os.path.join(self.inputDir, addonId), exist_ok=True)
+		major, minor, patch = (int(part) for part in version.split("."))
+		with open(os.path.join(self.inputDir, addonId, f"{version}.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": f"{addonId} {version}",
+				"channel": "stable",
+				"addonVersionNumber": {"major": major, "minor": minor, "patch": patch},
+				"minNVDAVersion": {"major": minMajor, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"translations": translations,
+			}, addonFile)
+
+	def test_responses_match_static_files(self):
+		"""Confirm each view and aggregate view written by the transformation is served identically"""
+		outputDir = os.path.join(self._tempDir.name, "output")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, outputDir, aggregate=True)
+		service = ViewService(NVDA_API_VERSIONS_PATH, self.inputDir)
+		viewPaths = glob.glob(f"{outputDir}/**/*.json", recursive=True)
+		self.assertGreater(len(viewPaths), 0)
+		for viewPath in viewPaths:
+			path = os.path.relpath(viewPath, outputDir).replace(os.sep, "/")
+			with open(viewPath, "rb") as viewFile:
+				self.assertEqual(service.query(f"/{path}"), viewFile.read(), msg=path)
+
+	def test_missing_views(self):
+		service = ViewService(NVDA_API_VERSIONS_PATH, self.inputDir)
+		self.assertIsNone(service.query("/fr/latest/foo/stable.json"))
+		self.assertIsNone(service.query("/en/latest/baz/stable.json"))
+		self.assertIsNone(service.query("/en/latest/foo/beta.json"))
+		self.assertIsNone(service.query("/en/latest/foo/stable"))
+		self.assertIsNone(service.query("/en/stable.json"))
+
+	def test_reload_on_change(self):
+		"""Confirm the datastore is loaded again when an input file is added"""
+		service = ViewService(NVDA_API_VERSIONS_PATH, self.inputDir)
+		self.assertFalse(service.reloadIfChanged())
+		self._writeAddon("foo", 2023, "2.0.0", [])
+		self.assertTrue(service.reloadIfChanged())
+		self.assertEqual(json.loads(service.query("/en/latest/foo/stable.json"))["description"], "foo 2.0.0")
+
+	def test_http(self):
+		service = ViewService(NVDA_API_VERSIONS_PATH, self.inputDir)
+		server = createServer(service, port=0)
+		self.addCleanup(server.server_close)
+		thread = threading.Thread(target=server.serve_forever)
+		thread.start()
+		self.addCleanup(thread.join)
+		self.addCleanup(server.shutdown)
+		url = f"http://127.0.0.1:{server.server_address[1]}"
+		with urlopen(f"{url}/de/latest/foo/stable.json") as response:
+			self.assertEqual(response.headers["Content-Type"], "application/json")
+			self.assertEqual(response.read(), service.query("/de/latest/foo/stable.json"))
+		with self.assertRaises(HTTPError) as error:
+			urlopen(f"{url}/de/latest/missing/stable.json")
+		self.assertEqual(error.exception.code, 404)
+
+	def test_http_head_and_encoded_paths(self):
+		"""Confirm HEAD requests send the headers of the view without it, and paths are percent-decoded"""
+		self._writeAddon("foo bar", 2023, "1.0.0", [])
+		service = ViewService(NVDA_API_VERSIONS_PATH, self.inputDir)
+		server = createServer(service, port=0)
+		self.addCleanup(server.server_close)
+		thread = threading.Thread(target=server.serve_forever)
+		thread.start()
+		self.addCleanup(thread.join)
+		self.addCleanup(server.shutdown)
+		url = f"http://127.0.0.1:{server.server_address[1]}/en/latest/foo%20bar/stable.json"
+		data = service.query("/en/latest/foo bar/stable.json")
+		self.assertIsNotNone(data)
+		with urlopen(url) as response:
+			self.assertEqual(response.read(), data)
+		with urlopen(Request(url, method="HEAD")) as response:
+			self.assertEqual(response.headers["Content-Length"], str(len(data)))
+			self.assertEqual(response.headers["ETag"], f'"{hashlib.sha256(data).hexdigest()}"')
+			self.assertEqual(response.read(), b"")
+
+	def test_conditional_requests(self):
+		"""Confirm a request with the ETag of the current view is answered with 304 Not Modified"""
+		service = ViewService(NVDA_API_VERSIONS_PATH, self.inputDir)
+		server = createServer(service, port=0)
+		self.addCleanup(server.server_close)
+		thread = threading.Thread(target=server.serve_forever)
+		thread.start()
+		self.addCleanup(thread.join)
+		self.addCleanup(server.shutdown)
+		url = f"http://127.0.0.1:{server.server_address[1]}/de/latest/foo/stable.json"
+		data = service.query("/de/latest/foo/stable.json")
+		with urlopen(url) as response:
+			etag = response.headers["ETag"]
+		self.assertEqual(etag, f'"{hashlib.sha256(data).hexdigest()}"')
+		with self.assertRaises(HTTPError) as error:
+			urlopen(Request(url, headers={"If-None-Match": f'"other", W/{etag}'}))
+		self.assertEqual(error.exception.code, 304)
+		with urlopen(Request(url, headers={"If-None-Match": '"other"'})) as response:
+			self.assertEqual(response.read(), data)
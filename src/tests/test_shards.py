@@ -0,0 +1,114 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+from typing import (
+	Dict,
+	List,
+)
+
+from src.transform.compare import (
+	compareHashes,
+	hashTrees,
+)
+from src.transform.merge import mergeShards
+from src.transform.shards import (
+	Shard,
+	ShardManifest,
+	shardIndex,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+class Test_Shard(unittest.TestCase):
+	def test_parse(self):
+		self.assertEqual(Shard.parse("2/4"), Shard(2, 4))
+		self.assertEqual(str(Shard(2, 4)), "2/4")
+		for value in ("0/4", "5/4", "2", "a/b", "1/0"):
+			with self.assertRaises(ValueError, msg=value):
+				Shard.parse(value)
+
+	def test_case_insensitive(self):
+		"""Confirm add-on IDs which only differ in case are in the same shard"""
+		for count in range(1, 8):
+			self.assertEqual(shardIndex("NVDAOcr", count), shardIndex("nvdaocr", count))
+
+	def test_every_id_in_one_shard(self):
+		shards = [Shard(index, 3) for index in range(1, 4)]
+		for addonId in ("foo", "bar", "baz", "qux", "nvdaOCR"):
+			self.assertEqual(sum(shard.contains(addonId) for shard in shards), 1, msg=addonId)
+
+
+class Test_mergeShards(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		# bar is in the first of two shards, foo and baz are in the second.
+		# The first shard has the pt and en languages, but not pt_BR, which falls back to pt, or de.
+		# The second shard has pt_BR and de, but not pt, or en, which is translated for bar.
+		self._writeAddon("bar", [_translation("pt"), _translation("en")])
+		self._writeAddon("foo", [_translation("pt_BR"), _translation("de")])
+		self._writeAddon("baz", [])
+
+	def _writeAddon(self, addonId: str, translations: List[Dict[str, str]]):
+		os.makedirs(os.path.join(self.inputDir, addonId))
+		with open(os.path.join(self.inputDir, addonId, "1.0.0.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": addonId,
+				"channel": "stable",
+				"addonVersionNumber": {"major": 1, "minor": 0, "patch": 0},
+				"minNVDAVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"translations": translations,
+			}, addonFile)
+
+	def _writeShards(self, count: int) -> List[str]:
+		shardDirs = []
+		for index in range(1, count + 1):
+			shardDir = os.path.join(self._tempDir.name, f"shard{index}")
+			runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, shardDir, shard=Shard(index, count))
+			shardDirs.append(shardDir)
+		return shardDirs
+
+	def test_merge_matches_full_transformation(self):
+		shardDirs = self._writeShards(2)
+		self.assertEqual(ShardManifest.load(shardDirs[0]).languages, ["en", "pt"])
+		self.assertEqual(ShardManifest.load(shardDirs[1]).languages, ["de", "pt_BR"])
+		expectedDir = os.path.join(self._tempDir.name, "expected")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, expectedDir, aggregate=True, etags=True)
+		outputDir = os.path.join(self._tempDir.name, "output")
+		mergeShards(shardDirs, outputDir, aggregate=True, etags=True)
+		self.assertEqual(compareHashes(*hashTrees([expectedDir, outputDir])), [])
+		with open(os.path.join(outputDir, "pt_BR", "latest", "bar", "stable.json"), "r") as viewFile:
+			self.assertEqual(json.load(viewFile)["description"], "pt translation")
+
+	def test_missing_shard(self):
+		shardDirs = self._writeShards(3)
+		with self.assertRaises(ValueError):
+			mergeShards(shardDirs[1:], os.path.join(self._tempDir.name, "output"))
+
+	def test_shard_only_writes_views(self):
+		with self.assertRaises(ValueError):
+			runTransformation(
+				NVDA_API_VERSIONS_PATH,
+				self.inputDir,
+				os.path.join(self._tempDir.name, "shard"),
+				aggregate=True,
+				shard=Shard(1, 2),
+			)
+
+
+def _translation(language: str) -> Dict[str, str]:
+	return {"language": language, "displayName": "translated", "description": f"{language} translation"}
@@ -0,0 +1,205 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import gzip
+import os
+import sqlite3
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from src.transform.datastructures import ViewKind
+from src.transform.sinks import (
+	ArchiveSink,
+	openViewSink,
+	OutputFormat,
+	SQLiteSink,
+)
+from src.transform.writer import (
+	LinkMode,
+	ViewWriter,
+)
+
+VIEWS = {
+	"en/2020.1.0/foo/stable.json": b'{"addonId": "foo"}',
+	"de/2020.1.0/foo/stable.json": b'{"addonId": "foo", "displayName": "Foo"}',
+	"en/latest/foo/stable.json": b'{"addonId": "foo"}',
+}
+
+
+class Test_ArchiveSink(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+
+	def _writeArchive(self, archiveFormat: OutputFormat, fileName: str, **kwargs) -> str:
+		archivePath = os.path.join(self._tempDir.name, "publish", fileName)
+		with ArchiveSink(archivePath, archiveFormat, **kwargs) as sink:
+			for path, data in VIEWS.items():
+				sink.write(path, data)
+		self.assertEqual(sink.filesWritten, len(VIEWS) * (1 if kwargs.get("compressLevel") is None else 2))
+		return archivePath
+
+	def test_tar_entries(self):
+		"""Confirm each view is a tar entry, in the order the views are written"""
+		archivePath = self._writeArchive(OutputFormat.TAR, "views.tar")
+		with tarfile.open(archivePath) as archive:
+			self.assertEqual(archive.getnames(), list(VIEWS))
+			for path, data in VIEWS.items():
+				self.assertEqual(archive.extractfile(path).read(), data)
+
+	def test_zip_entries(self):
+		"""Confirm each view is a zip entry, in the order the views are written"""
+		archivePath = self._writeArchive(OutputFormat.ZIP, "views.zip")
+		with zipfile.ZipFile(archivePath) as archive:
+			self.assertEqual(archive.namelist(), list(VIEWS))
+			for path, data in VIEWS.items():
+				self.assertEqual(archive.read(path), data)
+
+	def test_compressed_entries(self):
+		"""Confirm a gzip compressed copy of each view is added next to it"""
+		archivePath = self._writeArchive(OutputFormat.ZIP, "views.zip", compressLevel=1)
+		with zipfile.ZipFile(archivePath) as archive:
+			self.assertEqual(archive.namelist(), [entry for path in VIEWS for entry in (path, f"{path}.gz")])
+			for path, data in VIEWS.items():
+				self.assertEqual(gzip.decompress(archive.read(f"{path}.gz")), data)
+
+	def test_entries_streamed(self):
+		"""Confirm entries are written to the archive as views are written, rather than held until closed"""
+		for archiveFormat in (OutputFormat.TAR, OutputFormat.ZIP):
+			archivePath = os.path.join(self._tempDir.name, f"views.{archiveFormat.value}")
+			data = os.urandom(1 << 20)
+			with ArchiveSink(archivePath, archiveFormat) as sink:
+				sink.write("en/2020.1.0/foo/stable.json", data)
+				self.assertGreaterEqual(os.path.getsize(archivePath), len(data))
+
+	def test_deterministic(self):
+		"""Confirm identical views produce identical archives"""
+		for archiveFormat in (OutputFormat.TAR, OutputFormat.ZIP):
+			archives = []
+			for fileName in ("first", "second"):
+				with open(self._writeArchive(archiveFormat, f"{fileName}.{archiveFormat.value}"), "rb") as archive:
+					archives.append(archive.read())
+			self.assertEqual(archives[0], archives[1])
+
+	def test_failure_removes_archive(self):
+		"""Confirm a failed run doesn't leave a truncated archive"""
+		for archiveFormat in (OutputFormat.TAR, OutputFormat.ZIP):
+			archivePath = os.path.join(self._tempDir.name, f"views.{archiveFormat.value}")
+			with self.assertRaises(RuntimeError):
+				with ArchiveSink(archivePath, archiveFormat, compressLevel=1) as sink:
+					sink.write("en/2020.1.0/foo/stable.json", b"{}")
+					raise RuntimeError("Transformation failed")
+			self.assertFalse(os.path.exists(archivePath))
+
+	def test_existing_archive_throws(self):
+		archivePath = self._writeArchive(OutputFormat.TAR, "views.tar")
+		with self.assertRaises(FileExistsError):
+			ArchiveSink(archivePath, OutputFormat.TAR)
+
+
+class Test_SQLiteSink(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.databasePath = os.path.join(self._tempDir.name, "publish", "views.db")
+
+	def _writeDatabase(self, views):
+		with SQLiteSink(self.databasePath) as sink:
+			for path, data in views.items():
+				if path.count("/") == 2:
+					sink.write(path, data, ViewKind.AGGREGATE)
+				elif "/latest/" in path:
+					sink.write(path, data, latestAPIVersion="2020.1.0")
+				else:
+					sink.write(path, data)
+		return sink
+
+	def test_views_and_documents(self):
+		"""Confirm each view has a row, and identical documents are stored once"""
+		sink = self._writeDatabase(VIEWS)
+		self.assertEqual(sink.filesWritten, len(VIEWS))
+		self.assertEqual(sink.documentsWritten, 2)
+		connection = sqlite3.connect(self.databasePath)
+		self.addCleanup(connection.close)
+		rows = connection.execute(
+			"SELECT language, apiVer, channel, addonId, isLatest, data "
+			"FROM views JOIN documents ON documents.id = views.documentId"
+		).fetchall()
+		self.assertEqual(sorted(rows), sorted([
+			("de", "2020.1.0", "stable", "foo", 0, VIEWS["de/2020.1.0/foo/stable.json"]),
+			("en", "2020.1.0", "stable", "foo", 0, VIEWS["en/2020.1.0/foo/stable.json"]),
+			("en", "2020.1.0", "stable", "foo", 1, VIEWS["en/latest/foo/stable.json"]),
+		]))
+		# The latest views for an API version are found with one indexed query.
+		self.assertEqual(
+			connection.execute(
+				"SELECT addonId FROM views WHERE language = 'en' AND apiVer = '2020.1.0' AND channel = 'stable' "
+				"AND isLatest = 1"
+			).fetchall(),
+			[("foo",)],
+		)
+
+	def test_latest_view_requires_api_version(self):
+		with SQLiteSink(self.databasePath) as sink:
+			with self.assertRaises(ValueError):
+				sink.write("en/latest/foo/stable.json", b"{}")
+			with self.assertRaises(ValueError):
+				sink.write("en/2020.1.0/foo/stable.json", b"{}", latestAPIVersion="2020.1.0")
+
+	def test_failure_removes_database(self):
+		"""Confirm a failed run doesn't leave a database with some of the views"""
+		with self.assertRaises(RuntimeError):
+			with SQLiteSink(self.databasePath) as sink:
+				sink.write("en/2020.1.0/foo/stable.json", b"{}")
+				raise RuntimeError("Transformation failed")
+		self.assertFalse(os.path.exists(self.databasePath))
+
+	def test_aggregates(self):
+		self._writeDatabase({**VIEWS, "en/2020.1.0/stable.json": b'[{"addonId": "foo"}]'})
+		connection = sqlite3.connect(self.databasePath)
+		self.addCleanup(connection.close)
+		self.assertEqual(
+			connection.execute(
+				"SELECT data FROM aggregates JOIN documents ON documents.id = aggregates.documentId "
+				"WHERE language = 'en' AND apiVer = '2020.1.0' AND channel = 'stable'"
+			).fetchall(),
+			[(b'[{"addonId": "foo"}]',)],
+		)
+
+	def test_deterministic(self):
+		"""Confirm identical views produce an identical database, whatever order they are written in"""
+		self._writeDatabase(VIEWS)
+		with open(self.databasePath, "rb") as databaseFile:
+			first = databaseFile.read()
+		os.remove(self.databasePath)
+		self._writeDatabase(dict(reversed(list(VIEWS.items()))))
+		with open(self.databasePath, "rb") as databaseFile:
+			self.assertEqual(databaseFile.read(), first)
+
+	def test_existing_database_throws(self):
+		self._writeDatabase(VIEWS)
+		with self.assertRaises(FileExistsError):
+			SQLiteSink(self.databasePath)
+
+
+class Test_openViewSink(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+
+	def test_directory(self):
+		with openViewSink(OutputFormat.DIRECTORY, self._tempDir.name) as sink:
+			self.assertIsInstance(sink, ViewWriter)
+
+	def test_archive_dedupe_throws(self):
+		"""Confirm deduplicating with links is only supported for directory output"""
+		with self.assertRaises(ValueError):
+			openViewSink(OutputFormat.TAR, os.path.join(self._tempDir.name, "views.tar"), linkMode=LinkMode.HARDLINK)
+
+	def test_sqlite_gzip_throws(self):
+		"""Confirm compressed copies are not supported for SQLite output"""
+		with self.assertRaises(ValueError):
+			openViewSink(OutputFormat.SQLITE, os.path.join(self._tempDir.name, "views.db"), compressLevel=1)
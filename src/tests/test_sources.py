@@ -0,0 +1,135 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import glob
+import json
+import logging
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from src.transform.sources import (
+	archiveRegistry,
+	listInputFiles,
+	readInputData,
+	splitArchivePath,
+)
+from src.transform.transform import runTransformation
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+class Test_sources(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.addCleanup(archiveRegistry.clear)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "addons")
+		self._writeAddon("foo", "1.0.0", [{"language": "de", "displayName": "Foo", "description": "Foo de"}])
+		self._writeAddon("foo", "1.1.0", [])
+		self._writeAddon("bar", "1.0.0", [])
+		with open(os.path.join(self._tempDir.name, "README.json"), "w") as readmeFile:
+			json.dump({}, readmeFile)
+
+	def _writeAddon(self, addonId: str, version: str, translations):
+		os.makedirs(os.path.join(self.inputDir, addonId), exist_ok=True)
+		major, minor, patch = (int(part) for part in version.split("."))
+		with open(os.path.join(self.inputDir, addonId, f"{version}.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": f"{addonId} {version}",
+				"channel": "stable",
+				"addonVersionNumber": {"major": major, "minor": minor, "patch": patch},
+				"minNVDAVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": 2023, "minor": 1, "patch": 0},
+				"translations": translations,
+			}, addonFile)
+
+	def _createArchive(self, fileName: str) -> str:
+		"""Archives the add-ons directory, and a README.json next to it which isn't an add-on file"""
+		archivePath = os.path.join(self._tempDir.name, fileName)
+		paths = sorted(glob.glob(f"{self._tempDir.name}/**/*.json", recursive=True))
+		if fileName.endswith(".zip"):
+			with zipfile.ZipFile(archivePath, "w") as archive:
+				for path in paths:
+					archive.write(path, os.path.relpath(path, self._tempDir.name))
+		else:
+			with tarfile.open(archivePath, "w:gz" if fileName.endswith(".gz") else "w") as archive:
+				for path in paths:
+					archive.add(path, os.path.relpath(path, self._tempDir.name))
+		return archivePath
+
+	def _readTree(self, outputDir: str):
+		tree = {}
+		for path in glob.glob(f"{outputDir}/**/*.json", recursive=True):
+			with open(path, "rb") as viewFile:
+				tree[os.path.relpath(path, outputDir)] = viewFile.read()
+		return tree
+
+	def test_splitArchivePath(self):
+		zipPath = self._createArchive("store.zip")
+		self.assertEqual(splitArchivePath(f"{zipPath}!addons/foo/1.0.json"), (zipPath, "addons/foo/1.0.json"))
+		tarPath = os.path.join(self._tempDir.name, "store.TAR.GZ")
+		os.rename(self._createArchive("store.tar.gz"), tarPath)
+		self.assertEqual(splitArchivePath(tarPath), (tarPath, ""))
+		self.assertEqual(splitArchivePath("store!/addons/"), (None, "store!/addons/"))
+
+	def test_directory_with_archive_suffix(self):
+		"""Confirm a directory named like an archive is read as a directory"""
+		expectedDir = os.path.join(self._tempDir.name, "expected")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, expectedDir)
+		inputDir = os.path.join(self._tempDir.name, "addons.zip")
+		os.rename(self.inputDir, inputDir)
+		self.assertEqual(splitArchivePath(inputDir), (None, inputDir))
+		outputDir = os.path.join(self._tempDir.name, "output")
+		runTransformation(NVDA_API_VERSIONS_PATH, inputDir, outputDir)
+		self.assertEqual(self._readTree(outputDir), self._readTree(expectedDir))
+
+	def test_listInputFiles(self):
+		"""Confirm the add-on files of an archive are listed as in a directory, by member reference"""
+		directoryFiles = [
+			os.path.relpath(path, self.inputDir).replace(os.sep, "/") for path in listInputFiles(self.inputDir)
+		]
+		self.assertEqual(directoryFiles, ["bar/1.0.0.json", "foo/1.0.0.json", "foo/1.1.0.json"])
+		for fileName in ("store.zip", "store.tar", "store.tar.gz"):
+			archivePath = self._createArchive(fileName)
+			self.assertEqual(
+				listInputFiles(f"{archivePath}!addons"),
+				[f"{archivePath}!addons/{path}" for path in directoryFiles],
+				msg=fileName,
+			)
+			self.assertEqual(listInputFiles(archivePath), [], msg=fileName)
+
+	def test_readInputData(self):
+		for fileName in ("store.zip", "store.tar", "store.tar.gz"):
+			archivePath = self._createArchive(fileName)
+			with open(os.path.join(self.inputDir, "foo", "1.0.0.json"), "r") as addonFile:
+				self.assertEqual(readInputData(f"{archivePath}!addons/foo/1.0.0.json"), addonFile.read())
+			with self.assertRaises(FileNotFoundError):
+				readInputData(f"{archivePath}!addons/foo/9.0.0.json")
+
+	def test_archive_changed(self):
+		"""Confirm a changed archive is opened again"""
+		archivePath = self._createArchive("store.zip")
+		self.assertEqual(len(listInputFiles(f"{archivePath}!addons")), 3)
+		self._writeAddon("baz", "1.0.0", [])
+		os.remove(archivePath)
+		self._createArchive("store.zip")
+		os.utime(archivePath, ns=(0, 0))
+		self.assertEqual(len(listInputFiles(f"{archivePath}!addons")), 4)
+
+	def test_transformation_from_archive(self):
+		"""Confirm the output of a transformation from an archive is identical to one from the directory"""
+		expectedDir = os.path.join(self._tempDir.name, "expected")
+		runTransformation(NVDA_API_VERSIONS_PATH, self.inputDir, expectedDir, aggregate=True)
+		for fileName in ("store.zip", "store.tar.gz"):
+			archivePath = self._createArchive(fileName)
+			outputDir = os.path.join(self._tempDir.name, f"output-{fileName}")
+			runTransformation(NVDA_API_VERSIONS_PATH, f"{archivePath}!addons", outputDir, aggregate=True)
+			self.assertEqual(self._readTree(outputDir), self._readTree(expectedDir), msg=fileName)
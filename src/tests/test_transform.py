@@ -1,11 +1,15 @@
-# Copyright (C) 2021 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
 from copy import deepcopy
+import json
+import os
+import tempfile
 
 from src.transform.datastructures import MajorMinorPatch, VersionCompatibility
-from src.transform.transform import getLatestAddons, _isAddonCompatible
+from src.transform.instrumentation import RunReport
+from src.transform.transform import getLatestAddons, _isAddonCompatible, readAddons, runTransformation
 from src.tests.generateData import MockAddon
 import unittest
 
@@ -164,3 +168,64 @@ def test_is_compatible(self):
 			# addon.minNvdaAPIVersion < nvdaAPIVersion.apiVer
 			V_2021_2: {"stable": {addon.addonId: addon}, "beta": {}, "dev": {}},
 		})
+
+
+class Test_readAddons(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		for addonId, version in (("foo", 2), ("bar", 1), ("foo", 1), ("baz", 1)):
+			addonDir = os.path.join(self._tempDir.name, addonId)
+			os.makedirs(addonDir, exist_ok=True)
+			with open(os.path.join(addonDir, f"{version}.0.0.json"), "w") as addonFile:
+				json.dump({
+					"addonId": addonId,
+					"channel": "stable",
+					"addonVersionNumber": {"major": version, "minor": 0, "patch": 0},
+					"minNVDAVersion": {"major": 2020, "minor": 1, "patch": 0},
+					"lastTestedVersion": {"major": 2020, "minor": 1, "patch": 0},
+				}, addonFile)
+		with open(os.path.join(self._tempDir.name, "baz", "2.0.0.json"), "w") as invalidAddonFile:
+			json.dump({"addonId": "baz"}, invalidAddonFile)
+
+	def test_path_order(self):
+		"""Confirm addons are read in path order, skipping files that don't match the schema"""
+		with self.assertLogs(level="ERROR") as logs:
+			addons = list(readAddons(self._tempDir.name))
+		self.assertEqual(
+			[os.path.relpath(addon.pathToData, self._tempDir.name) for addon in addons],
+			[os.path.join("bar", "1.0.0.json"), os.path.join("baz", "1.0.0.json")]
+			+ [os.path.join("foo", "1.0.0.json"), os.path.join("foo", "2.0.0.json")],
+		)
+		self.assertEqual(len(logs.output), 1)
+		self.assertIn("doesn't match schema", logs.output[0])
+
+	def test_parallel_matches_serial(self):
+		"""Confirm reading with worker processes yields the same addons in the same order"""
+		serialAddons = list(readAddons(self._tempDir.name))
+		with self.assertLogs(level="ERROR") as logs:
+			parallelAddons = list(readAddons(self._tempDir.name, jobs=2))
+		self.assertEqual(parallelAddons, serialAddons)
+		self.assertEqual(len(logs.output), 1)
+
+	def test_report_counts(self):
+		"""Confirm files read and rejected are counted in a report"""
+		report = RunReport()
+		with self.assertLogs(level="ERROR"):
+			list(readAddons(self._tempDir.name, report=report))
+		self.assertEqual(report.counts, {"filesRead": 5, "filesRejected": 1})
+
+
+class Test_runTransformation(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+
+	def test_invalid_sink_options_create_nothing(self):
+		"""Confirm invalid writer options are rejected before the output directory is created"""
+		outputDir = os.path.join(self._tempDir.name, "output")
+		nvdaAPIVersionsPath = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+		for options in ({"compressLevel": 10}, {"writers": 0}):
+			with self.subTest(options=options), self.assertRaises(ValueError):
+				runTransformation(nvdaAPIVersionsPath, self._tempDir.name, outputDir, **options)
+			self.assertFalse(os.path.exists(outputDir))
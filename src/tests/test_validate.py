@@ -0,0 +1,116 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.validate.batch import (
+	expandPaths,
+	failureReport,
+	validateFiles,
+	validateFile,
+)
+from src.validate.validate import (
+	JSONSchemaPaths,
+	SchemaValidatorRegistry,
+	ValidationError,
+	validateJson,
+)
+
+VALID_ADDON_DATA = {
+	"addonId": "foo",
+	"channel": "stable",
+	"addonVersionNumber": {"major": 1, "minor": 0, "patch": 0},
+	"minNVDAVersion": {"major": 2020, "minor": 1, "patch": 0},
+	"lastTestedVersion": {"major": 2020, "minor": 1, "patch": 0},
+}
+
+
+class Test_SchemaValidatorRegistry(unittest.TestCase):
+	def test_schema_compiled_once(self):
+		"""Confirm that repeated lookups of a schema reuse the compiled validator"""
+		registry = SchemaValidatorRegistry()
+		validator = registry.get(JSONSchemaPaths.ADDON_DATA)
+		self.assertIs(validator, registry.get(JSONSchemaPaths.ADDON_DATA))
+		self.assertEqual(registry.cacheInfo(), (1, 1, 1))
+
+	def test_enum_and_path_share_entry(self):
+		"""Confirm that a JSONSchemaPaths member and its path string are cached as the same schema"""
+		registry = SchemaValidatorRegistry()
+		self.assertIs(
+			registry.get(JSONSchemaPaths.NVDA_VERSIONS),
+			registry.get(JSONSchemaPaths.NVDA_VERSIONS.value),
+		)
+		self.assertEqual(registry.cacheInfo(), (1, 1, 1))
+
+	def test_clear(self):
+		"""Confirm that clearing the registry resets the counters"""
+		registry = SchemaValidatorRegistry()
+		registry.get(JSONSchemaPaths.ADDON_DATA)
+		registry.clear()
+		self.assertEqual(registry.cacheInfo(), (0, 0, 0))
+
+
+class Test_validateJson(unittest.TestCase):
+	def test_valid(self):
+		"""Confirm valid data passes validation"""
+		validateJson(VALID_ADDON_DATA, JSONSchemaPaths.ADDON_DATA)
+
+	def test_invalid_throws(self):
+		"""Confirm invalid data raises a ValidationError"""
+		invalidData = dict(VALID_ADDON_DATA, channel="nightly")
+		with self.assertRaises(ValidationError):
+			validateJson(invalidData, JSONSchemaPaths.ADDON_DATA)
+
+
+class Test_validateFiles(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.validPaths = []
+		for addonId in ("foo", "bar"):
+			os.makedirs(os.path.join(self._tempDir.name, addonId))
+			path = os.path.join(self._tempDir.name, addonId, "1.0.0.json")
+			with open(path, "w") as dataFile:
+				json.dump(dict(VALID_ADDON_DATA, addonId=addonId), dataFile)
+			self.validPaths.append(path)
+		self.invalidPath = os.path.join(self._tempDir.name, "foo", "2.0.0.json")
+		with open(self.invalidPath, "w") as dataFile:
+			json.dump(dict(VALID_ADDON_DATA, channel=1), dataFile)
+
+	def test_expandPaths(self):
+		"""Confirm directories and globs are expanded, and other paths are kept"""
+		missingPath = os.path.join(self._tempDir.name, "missing.json")
+		self.assertEqual(
+			expandPaths([self._tempDir.name, os.path.join(self._tempDir.name, "*", "1.0.0.json"), missingPath]),
+			sorted(self.validPaths + [self.invalidPath, missingPath]),
+		)
+
+	def test_failures_reported(self):
+		"""Confirm invalid and unreadable files are reported, in both serial and parallel validation"""
+		missingPath = os.path.join(self._tempDir.name, "missing.json")
+		unmatchedPattern = os.path.join(self._tempDir.name, "*", "9.0.0.json")
+		paths = expandPaths([self._tempDir.name, missingPath, unmatchedPattern])
+		for jobs in (1, 2):
+			with self.subTest(jobs=jobs):
+				report = failureReport(JSONSchemaPaths.ADDON_DATA, validateFiles(JSONSchemaPaths.ADDON_DATA, paths, jobs))
+				self.assertEqual(report["filesValidated"], 5)
+				self.assertEqual(
+					[failure["path"] for failure in report["failures"]],
+					sorted([self.invalidPath, missingPath, unmatchedPattern]),
+				)
+				errors = {failure["path"]: failure["error"] for failure in report["failures"]}
+				self.assertIn("/channel", errors[self.invalidPath])
+				self.assertEqual(errors[unmatchedPattern], "No files match this pattern")
+
+	def test_long_error_truncated(self):
+		"""Confirm errors which include a large invalid value are truncated"""
+		path = os.path.join(self._tempDir.name, "bar", "2.0.0.json")
+		with open(path, "w") as dataFile:
+			json.dump(dict(VALID_ADDON_DATA, channel=["x" * 10000]), dataFile)
+		error = validateFile(JSONSchemaPaths.ADDON_DATA, path).error
+		self.assertLess(len(error), 300)
+		self.assertTrue(error.endswith("validation failed) at /channel"), error)
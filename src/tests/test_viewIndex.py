@@ -0,0 +1,95 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+from typing import (
+	Dict,
+	List,
+)
+
+from src.transform.datastructures import parseViewPath
+from src.transform.transform import (
+	getLatestAddons,
+	getSupportedLanguages,
+	readAddons,
+	readnvdaAPIVersionInfo,
+)
+from src.transform.views import iterAddonViews
+from src.transform.viewIndex import AddonViewIndex
+
+NVDA_API_VERSIONS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "nvdaAPIVersions.json")
+
+
+class Test_AddonViewIndex(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		logging.disable(logging.ERROR)
+		self.addCleanup(logging.disable, logging.NOTSET)
+		self.inputDir = os.path.join(self._tempDir.name, "input")
+		self._writeAddon("foo", 1, 2023, [
+			{"language": "de", "displayName": "Foo", "description": "Foo de"},
+			{"language": "pt", "displayName": "Foo", "description": "Foo pt"},
+		])
+		self._writeAddon("foo", 2, 2024, [])
+		self._writeAddon("Bar", 1, 2022, [{"language": "pt_BR", "displayName": "Bar", "description": "Bar"}])
+		self.index = AddonViewIndex.fromDatastore(NVDA_API_VERSIONS_PATH, self.inputDir)
+
+	def _writeAddon(self, addonId: str, major: int, minMajor: int, translations: List[Dict[str, str]]):
+		os.makedirs(os.path.join(self.inputDir, addonId), exist_ok=True)
+		with open(os.path.join(self.inputDir, addonId, f"{major}.0.0.json"), "w") as addonFile:
+			json.dump({
+				"addonId": addonId,
+				"displayName": addonId,
+				"description": f"{addonId} {major}",
+				"channel": "stable",
+				"addonVersionNumber": {"major": major, "minor": 0, "patch": 0},
+				"minNVDAVersion": {"major": minMajor, "minor": 1, "patch": 0},
+				"lastTestedVersion": {"major": max(minMajor, 2023), "minor": 1, "patch": 0},
+				"translations": translations,
+			}, addonFile)
+
+	def test_views_match_iterAddonViews(self):
+		"""Confirm every view generated by the transformation is in the index with identical data"""
+		latestAddons = getLatestAddons(
+			readAddons(self.inputDir),
+			readnvdaAPIVersionInfo(NVDA_API_VERSIONS_PATH),
+		)
+		views = list(iterAddonViews(latestAddons, getSupportedLanguages(latestAddons)))
+		self.assertGreater(len(views), 0)
+		for view in views:
+			language, apiVersion, addonId, channel = parseViewPath(view.path)
+			self.assertEqual(self.index.viewData(language, apiVersion, channel, addonId), view.data, msg=view.path)
+
+	def test_translation_fallback(self):
+		self.assertEqual(self.index.view("pt_BR", "2023.1.0", "stable", "foo")["description"], "Foo pt")
+		self.assertEqual(self.index.view("de", "2023.1.0", "stable", "Bar")["description"], "Bar 1")
+
+	def test_latest(self):
+		self.assertEqual(self.index.latest("de", "stable", "foo")["description"], "foo 2")
+		self.assertEqual(self.index.latest("en", "stable", "Bar")["description"], "Bar 1")
+		self.assertIsNone(self.index.latest("en", "beta", "foo"))
+
+	def test_missing(self):
+		self.assertIsNone(self.index.view("fr", "2023.1.0", "stable", "foo"))
+		self.assertIsNone(self.index.view("en", "2023.1.0", "stable", "baz"))
+		self.assertIsNone(self.index.view("en", "2019.1.0", "stable", "foo"))
+		self.assertEqual(list(self.index.iterView("fr", "2023.1.0", "stable")), [])
+
+	def test_iterView(self):
+		"""Confirm a view lists each add-on in add-on ID order"""
+		view = self.index.iterView("de", "2023.1.0", "stable")
+		self.assertEqual(
+			[(addonId, document["description"]) for addonId, document in view],
+			[("Bar", "Bar 1"), ("foo", "Foo de")],
+		)
+
+	def test_documents_are_copies(self):
+		document = self.index.latest("en", "stable", "foo")
+		document["description"] = "changed"
+		self.assertEqual(self.index.latest("en", "stable", "foo")["description"], "foo 2")
@@ -0,0 +1,114 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+import gzip
+import os
+import tempfile
+import unittest
+
+from src.transform.writer import (
+	compressView,
+	DEFAULT_CONTENT_STORE_DIRNAME,
+	LinkMode,
+	serializeJson,
+	ViewWriteError,
+	ViewWriter,
+)
+
+
+class Test_ViewWriter(unittest.TestCase):
+	def setUp(self):
+		self._tempDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tempDir.cleanup)
+		self.outputDir = self._tempDir.name
+
+	def test_files_written(self):
+		"""Confirm queued files are written, creating parent directories"""
+		with ViewWriter(self.outputDir, workers=2, queueSize=1) as writer:
+			for i in range(10):
+				writer.write(f"en/2020.1.0/addon{i}/stable.json", b"{}")
+			writer.write("en/latest/addon0/stable.json", b"[]")
+		self.assertEqual(writer.filesWritten, 11)
+		self.assertEqual(writer.bytesWritten, 22)
+		with open(os.path.join(self.outputDir, "en", "latest", "addon0", "stable.json"), "rb") as viewFile:
+			self.assertEqual(viewFile.read(), b"[]")
+
+	def test_errors_raised_on_close(self):
+		"""Confirm write errors are collected and raised once the queue is drained"""
+		with open(os.path.join(self.outputDir, "en"), "w"):
+			pass  # a file where a directory is expected
+		writer = ViewWriter(self.outputDir, workers=2)
+		writer.write("en/2020.1.0/foo/stable.json", b"{}")
+		writer.write("de/2020.1.0/foo/stable.json", b"{}")
+		with self.assertRaises(ViewWriteError) as writeError:
+			writer.close()
+		self.assertEqual([path for path, _error in writeError.exception.errors], ["en/2020.1.0/foo/stable.json"])
+		self.assertEqual(writer.filesWritten, 1)
+
+	def test_write_after_close_throws(self):
+		"""Confirm files can't be queued once the writer is closed"""
+		writer = ViewWriter(self.outputDir)
+		writer.close()
+		with self.assertRaises(RuntimeError):
+			writer.write("en/2020.1.0/foo/stable.json", b"{}")
+
+	def test_compressed_copies_written(self):
+		"""Confirm a gzip compressed copy is written next to each file"""
+		with ViewWriter(self.outputDir, workers=2, compressLevel=6) as writer:
+			writer.write("en/2020.1.0/foo/stable.json", b'{"addonId": "foo"}')
+		self.assertEqual(writer.filesWritten, 2)
+		with open(os.path.join(self.outputDir, "en", "2020.1.0", "foo", "stable.json.gz"), "rb") as viewFile:
+			self.assertEqual(gzip.decompress(viewFile.read()), b'{"addonId": "foo"}')
+
+	def test_compression_deterministic(self):
+		"""Confirm identical views always compress to identical bytes"""
+		self.assertEqual(compressView(b'{"addonId": "foo"}'), compressView(b'{"addonId": "foo"}'))
+
+	def test_invalid_compression_level_throws(self):
+		with self.assertRaises(ValueError):
+			ViewWriter(self.outputDir, compressLevel=10)
+
+	def _assertDeduplicated(self, linkMode: LinkMode):
+		with ViewWriter(self.outputDir, workers=3, linkMode=linkMode) as writer:
+			for lang in ("en", "de", "fr"):
+				writer.write(f"{lang}/2020.1.0/foo/stable.json", b'{"addonId": "foo"}')
+			writer.write("en/2020.1.0/bar/stable.json", b'{"addonId": "bar"}')
+		self.assertEqual(writer.filesWritten, 4)
+		self.assertEqual(writer.blobsWritten, 2)
+		blobs = os.listdir(os.path.join(self.outputDir, DEFAULT_CONTENT_STORE_DIRNAME))
+		self.assertEqual(len(blobs), 2)
+		for lang in ("en", "de", "fr"):
+			with open(os.path.join(self.outputDir, lang, "2020.1.0", "foo", "stable.json"), "rb") as viewFile:
+				self.assertEqual(viewFile.read(), b'{"addonId": "foo"}')
+		return os.path.join(self.outputDir, "en", "2020.1.0", "foo", "stable.json")
+
+	def test_hardlink_deduplication(self):
+		"""Confirm identical files are written once and hard linked into each view path"""
+		viewPath = self._assertDeduplicated(LinkMode.HARDLINK)
+		self.assertEqual(os.stat(viewPath).st_nlink, 4)
+
+	@unittest.skipIf(os.name == "nt", "Creating symlinks requires elevated privileges on Windows")
+	def test_symlink_deduplication(self):
+		"""Confirm identical files are written once and symlinked into each view path"""
+		viewPath = self._assertDeduplicated(LinkMode.SYMLINK)
+		self.assertTrue(os.path.islink(viewPath))
+
+	def test_overwrite_does_not_modify_blob(self):
+		"""Confirm overwriting a linked view replaces the link rather than writing through to the blob"""
+		with ViewWriter(self.outputDir, linkMode=LinkMode.HARDLINK) as writer:
+			writer.write("en/2020.1.0/foo/stable.json", b"{}")
+			writer.write("de/2020.1.0/foo/stable.json", b"{}")
+		with ViewWriter(self.outputDir) as writer:
+			writer.write("en/2020.1.0/foo/stable.json", b"[]")
+		with open(os.path.join(self.outputDir, "de", "2020.1.0", "foo", "stable.json"), "rb") as viewFile:
+			self.assertEqual(viewFile.read(), b"{}")
+
+
+class Test_serializeJson(unittest.TestCase):
+	def test_canonical(self):
+		"""Confirm equal documents serialize to identical bytes, whatever the order of their keys"""
+		first = serializeJson({"b": {"y": 1, "x": [2, "é"]}, "a": None})
+		second = serializeJson({"a": None, "b": {"x": [2, "é"], "y": 1}})
+		self.assertEqual(first, second)
+		self.assertEqual(first, b'{"a":null,"b":{"x":[2,"\\u00e9"],"y":1}}')
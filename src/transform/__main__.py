@@ -1,17 +1,78 @@
-# Copyright (C) 2021 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
 """
-Usage: python -m transform {nvdaAPIVersionsPath} {inputPath} {outputPath} [logLevel]
+Usage: python -m src.transform {nvdaAPIVersionsPath} {inputPath} {outputPath} [options]
+To answer queries for views over HTTP:
+python -m src.transform serve {nvdaAPIVersionsPath} {inputPath} [options]
+To compare two output trees, or an output tree and a saved manifest:
+python -m src.transform compare {outputPathOrManifest} [{outputPathOrManifest}] [options]
+To merge the outputs written with --shard:
+python -m src.transform merge {outputPath} {shardOutputPath} [{shardOutputPath} ...] [options]
 """
 import argparse
+import cProfile
+import json
 import logging
+import os
 import sys
+from typing import Optional
+from .addonDataCache import DEFAULT_CACHE_LIMIT_BYTES
+from .compare import (
+	compareHashes,
+	DEFAULT_DIFFERENCE_LIMIT,
+	DEFAULT_HASH_THREADS,
+	formatDifferences,
+	hashTrees,
+)
+from .explain import DecisionTrace
+from .incremental import runIncrementalTransformation
+from .instrumentation import RunReport
+from .merge import mergeShards
+from .overlay import OutputLayout
+from .plan import (
+	planTransformation,
+	updateTransformation,
+)
+from .serve import (
+	DEFAULT_HOST,
+	DEFAULT_POLL_INTERVAL_SECONDS,
+	DEFAULT_PORT,
+	serve,
+	ViewService,
+)
+from .shards import Shard
+from .sinks import OutputFormat
 from .transform import runTransformation
+from .writer import (
+	DEFAULT_COMPRESS_LEVEL,
+	DEFAULT_CONTENT_STORE_DIRNAME,
+	DEFAULT_WRITE_QUEUE_SIZE,
+	DEFAULT_WRITERS,
+	LinkMode,
+)
 
 log = logging.getLogger()
 
+
+def _nonNegativeInt(value: str) -> int:
+	try:
+		number = int(value)
+	except ValueError:
+		number = -1
+	if number < 0:
+		raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {value!r}")
+	return number
+
+
+def _shard(value: str) -> Shard:
+	try:
+		return Shard.parse(value)
+	except ValueError as error:
+		raise argparse.ArgumentTypeError(str(error)) from None
+
+
 parser = argparse.ArgumentParser()
 parser.add_argument(
 	dest="nvdaAPIVersionsPath",
@@ -19,7 +80,7 @@
 )
 parser.add_argument(
 	dest="sourceDir",
-	help="The input directory, see README for full usage."
+	help="The input directory or archive, see README for full usage."
 )
 parser.add_argument(
 	dest="outputDir",
@@ -32,9 +93,547 @@
 	dest="loglevel",
 	default=logging.WARNING,
 )
-args = parser.parse_args()
+parser.add_argument(
+	"--addon-cache-mb",
+	required=False,
+	type=_nonNegativeInt,
+	help="The memory limit for cached add-on source documents, in megabytes of source JSON.",
+	dest="addonCacheMB",
+	default=DEFAULT_CACHE_LIMIT_BYTES // (1024 * 1024),
+)
+parser.add_argument(
+	"--jobs",
+	required=False,
+	type=int,
+	help="The number of worker processes used to read and validate the input, 1 reads serially.",
+	dest="jobs",
+	default=1,
+)
+parser.add_argument(
+	"--writers",
+	required=False,
+	type=int,
+	help="The number of threads writing output files.",
+	dest="writers",
+	default=DEFAULT_WRITERS,
+)
+parser.add_argument(
+	"--write-queue",
+	required=False,
+	type=int,
+	help="The number of output files which may be queued for the writers.",
+	dest="writeQueueSize",
+	default=DEFAULT_WRITE_QUEUE_SIZE,
+)
+parser.add_argument(
+	"--incremental",
+	action="store_true",
+	help=(
+		"Update the views of a previous incremental run in outputDir, "
+		"only rewriting views for add-ons with changed input."
+	),
+	dest="incremental",
+)
+parser.add_argument(
+	"--dedupe",
+	required=False,
+	choices=[linkMode.value for linkMode in LinkMode],
+	help=(
+		"Write each unique file once to a content store, "
+		"and hardlink or symlink it into each view path."
+	),
+	dest="linkMode",
+	default=None,
+)
+parser.add_argument(
+	"--content-store",
+	required=False,
+	help=(
+		"The directory for deduplicated files, "
+		f"{DEFAULT_CONTENT_STORE_DIRNAME} in the output directory by default."
+	),
+	dest="contentStore",
+	default=None,
+)
+parser.add_argument(
+	"--aggregate",
+	action="store_true",
+	help="Also write a single file listing every add-on for each language, API version and channel.",
+	dest="aggregate",
+)
+parser.add_argument(
+	"--etags",
+	action="store_true",
+	help=(
+		"Also write a manifest of the path, size and sha256 hash of each file "
+		"for each language, API version and channel."
+	),
+	dest="etags",
+)
+parser.add_argument(
+	"--gzip",
+	required=False,
+	type=int,
+	nargs="?",
+	const=DEFAULT_COMPRESS_LEVEL,
+	metavar="LEVEL",
+	help=(
+		"Also write a gzip compressed copy of each file with a .gz suffix, "
+		f"using compression level LEVEL from 0 to 9, {DEFAULT_COMPRESS_LEVEL} by default."
+	),
+	dest="compressLevel",
+	default=None,
+)
+parser.add_argument(
+	"--output-format",
+	required=False,
+	choices=[outputFormat.value for outputFormat in OutputFormat],
+	help=(
+		"Write views to a directory tree, to a single tar or zip archive, or to a SQLite database at outputPath. "
+		"Archives and databases can't be updated incrementally or deduplicated with links."
+	),
+	dest="outputFormat",
+	default=OutputFormat.DIRECTORY.value,
+)
+parser.add_argument(
+	"--layout",
+	required=False,
+	choices=[layout.value for layout in OutputLayout],
+	help=(
+		"Write a full document for each language, or a base document for each add-on with a small "
+		"overlay of the translated fields for each language, see docs/output.md. "
+		"The overlay layout can't be updated incrementally or aggregated."
+	),
+	dest="layout",
+	default=OutputLayout.FULL.value,
+)
+parser.add_argument(
+	"--report",
+	required=False,
+	help=(
+		"Write a JSON report of the time spent in each phase, the number of files read, validated and "
+		"written, and the number of views per language and API version to this path."
+	),
+	dest="reportPath",
+	default=None,
+)
+parser.add_argument(
+	"--profile",
+	required=False,
+	help="Run the transformation with cProfile, and dump the profile statistics to this path.",
+	dest="profilePath",
+	default=None,
+)
+parser.add_argument(
+	"--explain",
+	required=False,
+	help=(
+		"Write a JSON lines trace to this path, explaining why each add-on version was selected or rejected "
+		"for each NVDA API version and channel, and which version was chosen for the latest view."
+	),
+	dest="explainPath",
+	default=None,
+)
+parser.add_argument(
+	"--dry-run",
+	required=False,
+	nargs="?",
+	const="-",
+	metavar="PATH",
+	help=(
+		"Write nothing, and instead write a JSON plan of the files which would be added, changed "
+		"and removed in an existing output directory at outputPath, to PATH or stdout by default."
+	),
+	dest="dryRunPath",
+	default=None,
+)
+parser.add_argument(
+	"--update",
+	action="store_true",
+	help=(
+		"Update an existing output directory at outputPath, only writing the files which are added "
+		"or changed and removing the files no longer generated, or nothing if it is up to date."
+	),
+	dest="update",
+)
+parser.add_argument(
+	"--shard",
+	required=False,
+	type=_shard,
+	metavar="INDEX/COUNT",
+	help=(
+		"Only write the views of the add-ons in shard INDEX of COUNT, by a hash of the add-on ID, "
+		"to be combined with the other shards by the merge command."
+	),
+	dest="shard",
+	default=None,
+)
+
+serveParser = argparse.ArgumentParser(prog="python -m src.transform serve")
+serveParser.add_argument(
+	dest="nvdaAPIVersionsPath",
+	help="The path to the nvdaAPIVersions.json, see README for full usage."
+)
+serveParser.add_argument(
+	dest="sourceDir",
+	help="The input directory or archive, see README for full usage."
+)
+serveParser.add_argument(
+	"--loglevel",
+	required=False,
+	help=f"The loglevel, one of {logging._nameToLevel}",
+	dest="loglevel",
+	default=logging.WARNING,
+)
+serveParser.add_argument(
+	"--host",
+	required=False,
+	help=f"The address to listen on, {DEFAULT_HOST} by default.",
+	dest="host",
+	default=DEFAULT_HOST,
+)
+serveParser.add_argument(
+	"--port",
+	required=False,
+	type=int,
+	help=f"The port to listen on, {DEFAULT_PORT} by default.",
+	dest="port",
+	default=DEFAULT_PORT,
+)
+serveParser.add_argument(
+	"--poll-interval",
+	required=False,
+	type=float,
+	help=(
+		"The number of seconds between checks for changes to the input, "
+		f"{DEFAULT_POLL_INTERVAL_SECONDS} by default."
+	),
+	dest="pollIntervalSeconds",
+	default=DEFAULT_POLL_INTERVAL_SECONDS,
+)
+serveParser.add_argument(
+	"--addon-cache-mb",
+	required=False,
+	type=_nonNegativeInt,
+	help="The memory limit for cached add-on source documents, in megabytes of source JSON.",
+	dest="addonCacheMB",
+	default=DEFAULT_CACHE_LIMIT_BYTES // (1024 * 1024),
+)
+serveParser.add_argument(
+	"--jobs",
+	required=False,
+	type=int,
+	help="The number of worker processes used to read and validate the input, 1 reads serially.",
+	dest="jobs",
+	default=1,
+)
+
+compareParser = argparse.ArgumentParser(prog="python -m src.transform compare")
+compareParser.add_argument(
+	dest="first",
+	metavar="A",
+	help="An output directory, or a manifest saved with --save-manifest.",
+)
+compareParser.add_argument(
+	dest="second",
+	metavar="B",
+	nargs="?",
+	help="The output directory, or manifest, to compare with A.",
+	default=None,
+)
+compareParser.add_argument(
+	"--save-manifest",
+	required=False,
+	help="Write a manifest of the sha256 hash of each file in A to this path.",
+	dest="manifestPath",
+	default=None,
+)
+compareParser.add_argument(
+	"--limit",
+	required=False,
+	type=int,
+	help=f"The number of differences to list, {DEFAULT_DIFFERENCE_LIMIT} by default.",
+	dest="limit",
+	default=DEFAULT_DIFFERENCE_LIMIT,
+)
+compareParser.add_argument(
+	"--jobs",
+	required=False,
+	type=int,
+	help=f"The number of threads hashing files, {DEFAULT_HASH_THREADS} by default.",
+	dest="jobs",
+	default=DEFAULT_HASH_THREADS,
+)
+
+mergeParser = argparse.ArgumentParser(prog="python -m src.transform merge")
+mergeParser.add_argument(
+	dest="outputDir",
+	help="The output directory, see README for full usage."
+)
+mergeParser.add_argument(
+	dest="shardDirs",
+	nargs="+",
+	metavar="shardOutputDir",
+	help="The output directory of each shard, written with --shard.",
+)
+mergeParser.add_argument(
+	"--loglevel",
+	required=False,
+	help=f"The loglevel, one of {logging._nameToLevel}",
+	dest="loglevel",
+	default=logging.WARNING,
+)
+mergeParser.add_argument(
+	"--writers",
+	required=False,
+	type=int,
+	help="The number of threads writing output files.",
+	dest="writers",
+	default=DEFAULT_WRITERS,
+)
+mergeParser.add_argument(
+	"--write-queue",
+	required=False,
+	type=int,
+	help="The number of output files which may be queued for the writers.",
+	dest="writeQueueSize",
+	default=DEFAULT_WRITE_QUEUE_SIZE,
+)
+mergeParser.add_argument(
+	"--dedupe",
+	required=False,
+	choices=[linkMode.value for linkMode in LinkMode],
+	help="As for the transformation.",
+	dest="linkMode",
+	default=None,
+)
+mergeParser.add_argument(
+	"--content-store",
+	required=False,
+	help="As for the transformation.",
+	dest="contentStore",
+	default=None,
+)
+mergeParser.add_argument(
+	"--aggregate",
+	action="store_true",
+	help="As for the transformation.",
+	dest="aggregate",
+)
+mergeParser.add_argument(
+	"--etags",
+	action="store_true",
+	help="As for the transformation.",
+	dest="etags",
+)
+mergeParser.add_argument(
+	"--gzip",
+	required=False,
+	type=int,
+	nargs="?",
+	const=DEFAULT_COMPRESS_LEVEL,
+	metavar="LEVEL",
+	help="As for the transformation.",
+	dest="compressLevel",
+	default=None,
+)
+mergeParser.add_argument(
+	"--output-format",
+	required=False,
+	choices=[outputFormat.value for outputFormat in OutputFormat],
+	help="As for the transformation.",
+	dest="outputFormat",
+	default=OutputFormat.DIRECTORY.value,
+)
+
+
+def _configureLogging(loglevel) -> None:
+	handler = logging.StreamHandler(sys.stdout)  # always log to stdout
+	log.setLevel(loglevel)
+	log.addHandler(handler)
+
+
+def main():
+	if sys.argv[1:2] == ["serve"]:
+		_serve(serveParser.parse_args(sys.argv[2:]))
+		return
+	if sys.argv[1:2] == ["compare"]:
+		sys.exit(_compare(compareParser.parse_args(sys.argv[2:])))
+	if sys.argv[1:2] == ["merge"]:
+		_merge(mergeParser.parse_args(sys.argv[2:]))
+		return
+	args = parser.parse_args()
+
+	_configureLogging(args.loglevel)
+	if args.outputFormat != OutputFormat.DIRECTORY and (args.incremental or args.linkMode):
+		parser.error("--incremental and --dedupe require directory output")
+	if args.outputFormat == OutputFormat.SQLITE and args.compressLevel is not None:
+		parser.error("--gzip is not supported for sqlite output")
+	if args.incremental and args.reportPath:
+		parser.error("--report is not supported with --incremental")
+	if args.layout != OutputLayout.FULL and (args.incremental or args.aggregate or args.etags):
+		parser.error("--incremental, --aggregate and --etags require the full layout")
+	if args.layout != OutputLayout.FULL and args.outputFormat == OutputFormat.SQLITE:
+		parser.error("sqlite output requires the full layout")
+	if args.etags and (args.incremental or args.outputFormat == OutputFormat.SQLITE):
+		parser.error("--etags is not supported with --incremental or sqlite output")
+	if args.shard is not None and _shardConflicts(args):
+		parser.error(
+			"--shard only writes the full layout to a directory, and is not supported with --incremental, "
+			"--dry-run, --update, --aggregate, --etags or --gzip, which are options of the merge"
+		)
+	if (args.dryRunPath is not None or args.update) and (
+		args.outputFormat != OutputFormat.DIRECTORY or args.reportPath or args.incremental
+	):
+		parser.error(
+			"--dry-run and --update require directory output, and are not supported with --report or --incremental"
+		)
+	profiler = cProfile.Profile() if args.profilePath else None
+	if profiler is not None:
+		profiler.enable()
+	try:
+		if args.explainPath:
+			with DecisionTrace(args.explainPath) as trace:
+				_transform(args, trace)
+		else:
+			_transform(args)
+	finally:
+		if profiler is not None:
+			profiler.disable()
+			profiler.dump_stats(args.profilePath)
+
+
+def _serve(args: argparse.Namespace) -> None:
+	_configureLogging(args.loglevel)
+	service = ViewService(
+		args.nvdaAPIVersionsPath,
+		args.sourceDir,
+		addonCacheLimitBytes=args.addonCacheMB * 1024 * 1024,
+		jobs=args.jobs,
+	)
+	serve(service, args.host, args.port, args.pollIntervalSeconds)
+
+
+def _shardConflicts(args: argparse.Namespace) -> bool:
+	return (
+		args.incremental or args.dryRunPath is not None or args.update or args.aggregate or args.etags
+		or args.compressLevel is not None or args.layout != OutputLayout.FULL
+		or args.outputFormat != OutputFormat.DIRECTORY
+	)
+
+
+def _merge(args: argparse.Namespace) -> None:
+	_configureLogging(args.loglevel)
+	if args.outputFormat != OutputFormat.DIRECTORY and args.linkMode:
+		mergeParser.error("--dedupe requires directory output")
+	if args.outputFormat == OutputFormat.SQLITE and (args.compressLevel is not None or args.etags):
+		mergeParser.error("--gzip and --etags are not supported for sqlite output")
+	try:
+		mergeShards(
+			args.shardDirs,
+			args.outputDir,
+			writers=args.writers,
+			writeQueueSize=args.writeQueueSize,
+			linkMode=args.linkMode,
+			contentStore=args.contentStore,
+			aggregate=args.aggregate,
+			compressLevel=args.compressLevel,
+			outputFormat=OutputFormat(args.outputFormat),
+			etags=args.etags,
+		)
+	except (FileNotFoundError, ValueError) as error:
+		mergeParser.error(str(error))
+
+
+def _compare(args: argparse.Namespace) -> int:
+	"""
+	Returns the exit code, 1 if the trees differ.
+	"""
+	if args.second is None and args.manifestPath is None:
+		compareParser.error("B is required unless --save-manifest is given")
+	paths = [args.first] if args.second is None else [args.first, args.second]
+	for path in paths:
+		if not os.path.exists(path):
+			compareParser.error(f"{path} does not exist")
+	treeHashes = hashTrees(paths, args.jobs, [args.manifestPath, None])
+	if args.second is None:
+		print(f"Saved the hashes of {len(treeHashes[0])} files to {args.manifestPath}")
+		return 0
+	differences = compareHashes(*treeHashes)
+	print(
+		f"Compared {len(treeHashes[0])} files in {args.first} with {len(treeHashes[1])} files in {args.second}: "
+		f"{len(differences)} difference(s)"
+	)
+	for line in formatDifferences(differences, args.limit):
+		print(line)
+	return 1 if differences else 0
+
+
+def _transform(args: argparse.Namespace, trace: Optional[DecisionTrace] = None) -> None:
+	options = dict(
+		addonCacheLimitBytes=args.addonCacheMB * 1024 * 1024,
+		jobs=args.jobs,
+		writers=args.writers,
+		writeQueueSize=args.writeQueueSize,
+		linkMode=args.linkMode,
+		contentStore=args.contentStore,
+		aggregate=args.aggregate,
+		compressLevel=args.compressLevel,
+		trace=trace,
+	)
+	if args.dryRunPath is not None:
+		_dryRun(args, trace)
+		return
+	if args.update:
+		updateTransformation(
+			args.nvdaAPIVersionsPath,
+			args.sourceDir,
+			args.outputDir,
+			layout=OutputLayout(args.layout),
+			etags=args.etags,
+			**options,
+		)
+		return
+	if args.incremental:
+		runIncrementalTransformation(args.nvdaAPIVersionsPath, args.sourceDir, args.outputDir, **options)
+		return
+	report = RunReport() if args.reportPath else None
+	runTransformation(
+		args.nvdaAPIVersionsPath,
+		args.sourceDir,
+		args.outputDir,
+		outputFormat=OutputFormat(args.outputFormat),
+		report=report,
+		layout=OutputLayout(args.layout),
+		etags=args.etags,
+		shard=args.shard,
+		**options,
+	)
+	if report is not None:
+		report.save(args.reportPath)
+
+
+def _dryRun(args: argparse.Namespace, trace: Optional[DecisionTrace] = None) -> None:
+	plan = planTransformation(
+		args.nvdaAPIVersionsPath,
+		args.sourceDir,
+		args.outputDir,
+		addonCacheLimitBytes=args.addonCacheMB * 1024 * 1024,
+		jobs=args.jobs,
+		aggregate=args.aggregate,
+		trace=trace,
+		layout=OutputLayout(args.layout),
+		etags=args.etags,
+	)
+	if args.dryRunPath == "-":
+		json.dump(plan.toJson(), sys.stdout, indent="\t")
+		sys.stdout.write("\n")
+	else:
+		with open(args.dryRunPath, "w", encoding="utf-8") as planFile:
+			json.dump(plan.toJson(), planFile, indent="\t")
+
 
-handler = logging.StreamHandler(sys.stdout)  # always log to stdout
-log.setLevel(args.loglevel)
-log.addHandler(handler)
-runTransformation(args.nvdaAPIVersionsPath, args.sourceDir, args.outputDir)
+# Worker processes started with the "spawn" method re-import this module,
+# so the transformation must only run in the main process.
+if __name__ == "__main__":
+	main()
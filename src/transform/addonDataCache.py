@@ -0,0 +1,84 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+from collections import OrderedDict
+import json
+from typing import (
+	Dict,
+	List,
+	NamedTuple,
+	Tuple,
+)
+from .datastructures import Addon
+from .sources import readInputBytes
+
+DEFAULT_CACHE_LIMIT_BYTES = 256 * 1024 * 1024
+
+
+class AddonDataCacheInfo(NamedTuple):
+	hits: int
+	misses: int
+	size: int
+	sizeBytes: int
+
+
+class AddonDataCache:
+	"""
+	A bounded LRU cache of parsed add-on source documents, keyed by the path to the data.
+	The translations are removed from the cached documents, as they are not written to views,
+	and are kept on the add-on instead, see loadTranslations.
+
+	The memory limit is measured as the size in bytes of the source file of each cached document.
+	Cached documents are shared between callers and must not be mutated.
+	"""
+
+	def __init__(self, limitBytes: int = DEFAULT_CACHE_LIMIT_BYTES):
+		if limitBytes < 0:
+			raise ValueError(f"Cache limit must not be negative, got {limitBytes}")
+		self.limitBytes = limitBytes
+		self._documents: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+		self._sizeBytes = 0
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, pathToData: str) -> Dict:
+		"""
+		Returns the de-translated document at pathToData, reading it from its source if it is not cached.
+		"""
+		cached = self._documents.get(pathToData)
+		if cached is not None:
+			self.hits += 1
+			self._documents.move_to_end(pathToData)
+			return cached[0]
+		addonData, _translations = self._read(pathToData)
+		return addonData
+
+	def loadTranslations(self, addon: Addon) -> List[Dict[str, str]]:
+		"""
+		Returns the translations of addon, loading them from its source document if they are not loaded yet.
+		The source document is parsed once, and the de-translated document is cached for its views.
+		"""
+		if not addon.translationsLoaded:
+			_addonData, addon.translations = self._read(addon.pathToData)
+		return addon.translations
+
+	def _read(self, pathToData: str) -> Tuple[Dict, List[Dict[str, str]]]:
+		self.misses += 1
+		rawData = readInputBytes(pathToData)
+		addonData: Dict = json.loads(rawData.decode("utf-8"))
+		translations = addonData.pop("translations", [])
+		self._store(pathToData, addonData, len(rawData))
+		return addonData, translations
+
+	def _store(self, pathToData: str, addonData: Dict, sizeBytes: int) -> None:
+		if sizeBytes > self.limitBytes or pathToData in self._documents:
+			return
+		self._documents[pathToData] = (addonData, sizeBytes)
+		self._sizeBytes += sizeBytes
+		while self._sizeBytes > self.limitBytes:
+			_evictedPath, (_evictedData, evictedSize) = self._documents.popitem(last=False)
+			self._sizeBytes -= evictedSize
+
+	def cacheInfo(self) -> AddonDataCacheInfo:
+		return AddonDataCacheInfo(self.hits, self.misses, len(self._documents), self._sizeBytes)
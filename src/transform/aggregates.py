@@ -0,0 +1,70 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Aggregate views list every add-on for a (language, API version, channel) in a single file,
+so the hosting server doesn't need to glob and concatenate the add-on views.
+An aggregate is a JSON array of the add-on views, sorted by add-on ID.
+"""
+
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	List,
+	Tuple,
+)
+
+from .datastructures import (
+	AddonChannels,
+	AddonView,
+)
+
+AggregateKey = Tuple[str, str, AddonChannels]
+
+
+def aggregatePath(language: str, apiVersion: str, channel: AddonChannels) -> str:
+	"""
+	Aggregates are written next to the add-on directories, e.g. en/2023.1.0/stable.json.
+	"""
+	return f"{language}/{apiVersion}/{channel}.json"
+
+
+def parseAggregatePath(path: str) -> AggregateKey:
+	"""
+	Returns the (language, apiVersion, channel) of an aggregate path.
+	"""
+	language, apiVersion, fileName = path.split("/")
+	channel, _extension = fileName.rsplit(".", 1)
+	return language, apiVersion, channel
+
+
+def buildAggregate(addonViews: Iterable[Tuple[str, bytes]]) -> bytes:
+	"""
+	Joins serialized (addonId, data) views into a JSON array, sorted by addon ID.
+	The result matches serializing the list of documents with serializeJson.
+	"""
+	sortedViews = sorted(addonViews, key=lambda addonView: (addonView[0].casefold(), addonView[0]))
+	return b"[" + b",".join(data for _addonId, data in sortedViews) + b"]"
+
+
+class AggregateCollector:
+	"""
+	Collects the views written by writeAddons, to build the aggregate views.
+	Serialized data is shared with the views, so collecting only holds references.
+	"""
+
+	def __init__(self):
+		self._views: Dict[AggregateKey, List[Tuple[str, bytes]]] = {}
+
+	def add(self, view: AddonView) -> None:
+		key = (view.language, view.apiVersion, view.channel)
+		self._views.setdefault(key, []).append((view.addonId, view.data))
+
+	def iterAggregates(self) -> Iterator[Tuple[str, bytes]]:
+		"""
+		Yields (path, data) for each aggregate view, in path order.
+		"""
+		for key in sorted(self._views):
+			yield aggregatePath(*key), buildAggregate(self._views[key])
@@ -0,0 +1,161 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Compares two output trees, or an output tree and a saved manifest, by the content hash of each file.
+
+A manifest lists the sha256 hash and path of each file in a tree, one per line in path order,
+in the format of sha256sum, so it can also be checked with "sha256sum -c" from the root of the tree.
+Files and directories starting with ".", such as the content store and the incremental manifest, are skipped.
+"""
+
+from concurrent.futures import (
+	Executor,
+	ThreadPoolExecutor,
+)
+from enum import Enum
+import os
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Tuple,
+)
+
+from .incremental import hashFile
+from .overlay import OVERLAYS_DIRNAME
+from .plan import existingOutputPaths
+from .writer import COMPRESSED_SUFFIX
+
+DEFAULT_HASH_THREADS = 8
+DEFAULT_DIFFERENCE_LIMIT = 20
+
+TreeHashes = Dict[str, str]
+
+
+class DifferenceKind(str, Enum):
+	MISSING = "missing"  # Only in the first tree
+	EXTRA = "extra"  # Only in the second tree
+	CHANGED = "changed"
+
+
+class Difference(NamedTuple):
+	kind: DifferenceKind
+	path: str
+
+
+def _iterTreeHashes(outputDir: str, executor: Executor) -> Iterator[Tuple[str, str]]:
+	"""
+	Submits every file in outputDir to be hashed by executor, and returns an iterator of (path, sha256)
+	in path order.
+	Files are submitted before returning, so several trees can be hashed at once.
+	"""
+	paths = sorted(existingOutputPaths(outputDir, includeCompressed=True))
+	fullPaths = (os.path.join(outputDir, *path.split("/")) for path in paths)
+	return zip(paths, executor.map(hashFile, fullPaths))
+
+
+def _collectHashes(hashes: Iterable[Tuple[str, str]], manifestPath: Optional[str] = None) -> TreeHashes:
+	"""
+	Collects the hashes of a tree, writing each to the manifest at manifestPath as it is received.
+	"""
+	if manifestPath is None:
+		return dict(hashes)
+	treeHashes: TreeHashes = {}
+	with open(manifestPath, "w", encoding="utf-8", newline="\n") as manifestFile:
+		for path, sha256 in hashes:
+			manifestFile.write(f"{sha256}  {path}\n")
+			treeHashes[path] = sha256
+	return treeHashes
+
+
+def readTreeManifest(manifestPath: str) -> TreeHashes:
+	treeHashes: TreeHashes = {}
+	with open(manifestPath, "r", encoding="utf-8") as manifestFile:
+		for lineNumber, line in enumerate(manifestFile, start=1):
+			line = line.rstrip("\n")
+			if not line:
+				continue
+			sha256, separator, path = line.partition("  ")
+			if not separator or len(sha256) != 64:
+				raise ValueError(f"{manifestPath}:{lineNumber}: expected '<sha256>  <path>', got {line!r}")
+			treeHashes[path] = sha256
+	return treeHashes
+
+
+def hashTrees(
+		paths: List[str],
+		jobs: int = DEFAULT_HASH_THREADS,
+		manifestPaths: Optional[List[Optional[str]]] = None,
+) -> List[TreeHashes]:
+	"""
+	The hashes of each path, which is either an output tree or a manifest file.
+	The files of every tree are hashed at once by jobs threads.
+	The hashes of a tree are written to the corresponding manifest path, if one is given.
+	"""
+	if manifestPaths is None:
+		manifestPaths = [None] * len(paths)
+	with ThreadPoolExecutor(max_workers=jobs) as executor:
+		treeHashes = [
+			_iterTreeHashes(path, executor) if os.path.isdir(path) else readTreeManifest(path).items()
+			for path in paths
+		]
+		return [
+			_collectHashes(hashes, manifestPath)
+			for hashes, manifestPath in zip(treeHashes, manifestPaths)
+		]
+
+
+def compareHashes(first: TreeHashes, second: TreeHashes) -> List[Difference]:
+	"""
+	The differences between two trees, in path order.
+	"""
+	differences = []
+	for path in sorted(first.keys() | second.keys()):
+		if path not in second:
+			differences.append(Difference(DifferenceKind.MISSING, path))
+		elif path not in first:
+			differences.append(Difference(DifferenceKind.EXTRA, path))
+		elif first[path] != second[path]:
+			differences.append(Difference(DifferenceKind.CHANGED, path))
+	return differences
+
+
+def differenceGroup(path: str) -> str:
+	"""
+	The <language>/<apiVersion>/<channel> of the view or aggregate view at path.
+	Base documents of the overlay layout are grouped under the "base" language.
+	Paths which aren't views are their own group.
+	"""
+	if path.endswith(COMPRESSED_SUFFIX):
+		path = path[:-len(COMPRESSED_SUFFIX)]
+	parts = path.split("/")
+	if len(parts) == 5 and parts[0] == OVERLAYS_DIRNAME:
+		parts = parts[1:]
+	if len(parts) not in (3, 4) or not parts[-1].endswith(".json"):
+		return path
+	channel = parts[-1][:-len(".json")]
+	return f"{parts[0]}/{parts[1]}/{channel}"
+
+
+def formatDifferences(differences: List[Difference], limit: int = DEFAULT_DIFFERENCE_LIMIT) -> List[str]:
+	"""
+	Lines reporting the number of differences in each group, and the first limit differences, under their group.
+	"""
+	groups: Dict[str, List[Difference]] = {}
+	for difference in differences:
+		groups.setdefault(differenceGroup(difference.path), []).append(difference)
+	lines = []
+	remaining = limit
+	for group, groupDifferences in sorted(groups.items()):
+		lines.append(f"{group}: {len(groupDifferences)} difference(s)")
+		for difference in groupDifferences[:max(remaining, 0)]:
+			lines.append(f"\t{difference.kind.value} {difference.path}")
+		remaining -= len(groupDifferences)
+	if remaining < 0:
+		lines.append(f"{-remaining} more difference(s) not listed")
+	return lines
@@ -1,17 +1,27 @@
-# Copyright (C) 2021-2023 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
 from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+import json
+import sys
 from typing import (
+	Any,
 	Dict,
 	List,
 	Literal,
 	NamedTuple,
+	Optional,
+	Tuple,
+	Union,
 )
 
 from requests.structures import CaseInsensitiveDict
 
+from .sources import readInputData
+
 # These values are validated using runtime validation -> see addon_data.schema.json
 AddonChannels = Literal["beta", "stable", "dev"]
 
@@ -31,15 +41,204 @@ class VersionCompatibility:
 	backCompatTo: MajorMinorPatch  # The earliest API version that this NVDA version supports
 
 
-@dataclass
+# The number of bits for each of the minor and patch numbers of a packed version.
+_VERSION_PART_BITS = 20
+_VERSION_PART_LIMIT = 1 << _VERSION_PART_BITS
+
+
+def packVersion(version: MajorMinorPatch) -> int:
+	"""
+	Packs a version into a single int, which orders the same as the version.
+	Throws a ValueError if the minor or patch number is too large to pack.
+	"""
+	major, minor, patch = version
+	if not (0 <= minor < _VERSION_PART_LIMIT and 0 <= patch < _VERSION_PART_LIMIT):
+		raise ValueError(f"Version {version} can't be packed")
+	return (major << (2 * _VERSION_PART_BITS)) | (minor << _VERSION_PART_BITS) | patch
+
+
+@lru_cache(maxsize=None)
+def unpackVersion(packedVersion: int) -> MajorMinorPatch:
+	"""
+	Cached, so each distinct version is unpacked once and shared by every add-on with that version.
+	"""
+	return MajorMinorPatch(
+		packedVersion >> (2 * _VERSION_PART_BITS),
+		(packedVersion >> _VERSION_PART_BITS) & (_VERSION_PART_LIMIT - 1),
+		packedVersion & (_VERSION_PART_LIMIT - 1),
+	)
+
+
+# A version as stored on an add-on, packed if it fits, otherwise the version itself.
+StoredVersion = Union[int, MajorMinorPatch]
+
+
+def _storeVersion(version: MajorMinorPatch) -> StoredVersion:
+	"""
+	Versions which are valid but too large to pack, e.g. a date as the patch number, are stored unpacked.
+	"""
+	try:
+		return packVersion(version)
+	except ValueError:
+		return MajorMinorPatch(*version)
+
+
+def _loadVersion(storedVersion: StoredVersion) -> MajorMinorPatch:
+	if isinstance(storedVersion, int):
+		return unpackVersion(storedVersion)
+	return storedVersion
+
+
 class Addon:
+	"""
+	An add-on version read from the datastore.
+	A record is kept for every version in the store, so records are slotted,
+	addonId and channel are interned, and versions are stored packed into ints where they fit.
+	If translations is None, they are loaded from pathToData when first accessed,
+	so they are only held for add-on versions which are used.
+	"""
+
+	__slots__ = (
+		"addonId",
+		"_addonVersion",
+		"pathToData",
+		"channel",
+		"_minNvdaAPIVersion",
+		"_lastTestedVersion",
+		"_translations",
+	)
+
+	def __init__(
+			self,
+			addonId: str,
+			addonVersion: MajorMinorPatch,
+			pathToData: str,
+			channel: AddonChannels,
+			minNvdaAPIVersion: MajorMinorPatch,
+			lastTestedVersion: MajorMinorPatch,
+			translations: Optional[List[Dict[str, str]]] = None,
+	):
+		self.addonId = sys.intern(addonId)
+		self.addonVersion = addonVersion
+		self.pathToData = pathToData
+		self.channel: AddonChannels = sys.intern(channel)
+		self.minNvdaAPIVersion = minNvdaAPIVersion
+		self.lastTestedVersion = lastTestedVersion
+		self._translations = translations
+
+	@property
+	def addonVersion(self) -> MajorMinorPatch:
+		return _loadVersion(self._addonVersion)
+
+	@addonVersion.setter
+	def addonVersion(self, version: MajorMinorPatch) -> None:
+		self._addonVersion = _storeVersion(version)
+
+	@property
+	def minNvdaAPIVersion(self) -> MajorMinorPatch:
+		return _loadVersion(self._minNvdaAPIVersion)
+
+	@minNvdaAPIVersion.setter
+	def minNvdaAPIVersion(self, version: MajorMinorPatch) -> None:
+		self._minNvdaAPIVersion = _storeVersion(version)
+
+	@property
+	def lastTestedVersion(self) -> MajorMinorPatch:
+		return _loadVersion(self._lastTestedVersion)
+
+	@lastTestedVersion.setter
+	def lastTestedVersion(self, version: MajorMinorPatch) -> None:
+		self._lastTestedVersion = _storeVersion(version)
+
+	@property
+	def translations(self) -> List[Dict[str, str]]:
+		if self._translations is None:
+			self._translations = json.loads(readInputData(self.pathToData)).get("translations", [])
+		return self._translations
+
+	@translations.setter
+	def translations(self, translations: Optional[List[Dict[str, str]]]) -> None:
+		self._translations = translations
+
+	@property
+	def translationsLoaded(self) -> bool:
+		return self._translations is not None
+
+	def _fields(self) -> Tuple[Any, ...]:
+		return (
+			self.addonId,
+			self.addonVersion,
+			self.pathToData,
+			self.channel,
+			self.minNvdaAPIVersion,
+			self.lastTestedVersion,
+			self._translations,
+		)
+
+	def __eq__(self, other: object) -> bool:
+		if other.__class__ is not self.__class__:
+			return NotImplemented
+		# Translations are only compared once both are loaded, so comparing add-ons never reads their source.
+		if self._fields()[:-1] != other._fields()[:-1]:
+			return False
+		if self.translationsLoaded and other.translationsLoaded:
+			return self._translations == other._translations
+		return True
+
+	# Mutable, so not hashable, matching a dataclass.
+	__hash__ = None
+
+	def __repr__(self) -> str:
+		return (
+			f"Addon(addonId={self.addonId!r}, addonVersion={self.addonVersion!r}, pathToData={self.pathToData!r}, "
+			f"channel={self.channel!r}, minNvdaAPIVersion={self.minNvdaAPIVersion!r}, "
+			f"lastTestedVersion={self.lastTestedVersion!r}, translations={self._translations!r})"
+		)
+
+	def __reduce__(self):
+		# Slotted classes without a __dict__ need to be pickled explicitly to be sent between processes.
+		return self.__class__, self._fields()
+
+
+LATEST_VIEW = "latest"
+
+
+class ViewKind(str, Enum):
+	"""
+	The kind of a file written by the transformation, for sinks which store each kind differently.
+	"""
+	ADDON = "addon"  # An add-on view, or another file at an add-on view path
+	AGGREGATE = "aggregate"
+	ETAG_MANIFEST = "etagManifest"
+
+
+class AddonView(NamedTuple):
+	language: str
+	apiVersion: str  # The NVDA API version, or LATEST_VIEW
 	addonId: str
-	addonVersion: MajorMinorPatch
-	pathToData: str
 	channel: AddonChannels
-	minNvdaAPIVersion: MajorMinorPatch
-	lastTestedVersion: MajorMinorPatch
-	translations: List[Dict[str, str]]
+	data: bytes  # The serialized add-on data written to the view file
+	addon: Addon  # The add-on version the view was generated from
+	# For a latest view, the newest NVDA API version the add-on version is selected for.
+	latestAPIVersion: Optional[str] = None
+
+	@property
+	def path(self) -> str:
+		"""The path of the view file relative to the output directory, using "/" separators"""
+		return viewPath(self.language, self.apiVersion, self.addonId, self.channel)
+
+
+def viewPath(language: str, apiVersion: str, addonId: str, channel: AddonChannels) -> str:
+	return f"{language}/{apiVersion}/{addonId}/{channel}.json"
+
+
+def parseViewPath(path: str) -> Tuple[str, str, str, AddonChannels]:
+	"""
+	Returns the (language, apiVersion, addonId, channel) of a view path.
+	"""
+	language, apiVersion, addonId, fileName = path.split("/")
+	channel, _extension = fileName.rsplit(".", 1)
+	return language, apiVersion, addonId, channel
 
 
 AddonChannelDict = Dict[AddonChannels, Dict[str, Addon]]
@@ -0,0 +1,67 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+ETag manifests, listing the path, size and content hash of each file of a (language, API version, channel).
+Views are serialized canonically, so the sha256 hash of a file is a strong ETag for it,
+which only changes when the content of the view changes.
+A manifest is written next to the add-on directories, e.g. en/2023.1.0/stable.etags.json.
+"""
+
+import hashlib
+from typing import (
+	Dict,
+	Iterator,
+	List,
+	Tuple,
+)
+
+from .aggregates import AggregateKey
+from .writer import serializeJson
+
+ETAG_MANIFEST_SUFFIX = ".etags.json"
+
+
+def etagManifestPath(language: str, apiVersion: str, channel: str) -> str:
+	return f"{language}/{apiVersion}/{channel}{ETAG_MANIFEST_SUFFIX}"
+
+
+def _etagManifestKey(path: str) -> AggregateKey:
+	"""
+	The (language, apiVersion, channel) of an add-on view or aggregate view path.
+	"""
+	parts = path.split("/")
+	channel = parts[-1].rsplit(".", 1)[0]
+	return parts[0], parts[1], channel
+
+
+class ETagCollector:
+	"""
+	Collects the size and hash of each file written by writeAddons, to build the ETag manifests.
+	"""
+
+	def __init__(self):
+		self._files: Dict[AggregateKey, List[Dict]] = {}
+
+	def add(self, path: str, data: bytes) -> None:
+		self._files.setdefault(_etagManifestKey(path), []).append({
+			"path": path,
+			"size": len(data),
+			"sha256": hashlib.sha256(data).hexdigest(),
+		})
+
+	def iterManifests(self) -> Iterator[Tuple[str, bytes]]:
+		"""
+		Yields (path, data) for each ETag manifest, in path order.
+		Each manifest lists its files in path order.
+		"""
+		for key in sorted(self._files):
+			language, apiVersion, channel = key
+			manifest = {
+				"language": language,
+				"apiVersion": apiVersion,
+				"channel": channel,
+				"files": sorted(self._files[key], key=lambda file: file["path"]),
+			}
+			yield etagManifestPath(*key), serializeJson(manifest)
@@ -0,0 +1,115 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+An optional trace of the decisions made by the transformation, written as JSON lines.
+Each line is a JSON object with a "decision" of:
+- "select": the version of an add-on selected for an API version and channel,
+	and why each other version of the add-on was rejected.
+- "latest": the version of an add-on written to the latest view of a channel, and why.
+Decisions are only explained when a DecisionTrace is given, so there is no cost otherwise.
+"""
+
+import json
+from typing import (
+	Any,
+	Dict,
+	Iterable,
+	List,
+	TextIO,
+)
+
+from .datastructures import (
+	Addon,
+	MajorMinorPatch,
+)
+from .selection import (
+	selectNewestCompatible,
+	SortedAPIVersions,
+)
+
+
+class DecisionTrace:
+	"""
+	Writes decisions as JSON lines to a file at path.
+	"""
+
+	def __init__(self, path: str):
+		self.path = path
+		self.decisions = 0
+		self._file: TextIO = open(path, "w", encoding="utf-8")
+
+	def record(self, decision: Dict[str, Any]) -> None:
+		self._file.write(json.dumps(decision))
+		self._file.write("\n")
+		self.decisions += 1
+
+	def close(self) -> None:
+		self._file.close()
+
+	def __enter__(self) -> "DecisionTrace":
+		return self
+
+	def __exit__(self, excType, excValue, traceback) -> None:
+		self.close()
+
+
+def rejectionReason(addon: Addon, apiVer: MajorMinorPatch, backCompatTo: MajorMinorPatch) -> str:
+	"""
+	The reason addon isn't compatible with the API version apiVer, which is backwards compatible to backCompatTo.
+	Returns an empty string if it is compatible.
+	"""
+	if apiVer < addon.minNvdaAPIVersion:
+		return f"minNVDAVersion {addon.minNvdaAPIVersion} is newer than the API version"
+	if addon.lastTestedVersion < backCompatTo:
+		return f"lastTestedVersion {addon.lastTestedVersion} is older than backCompatTo {backCompatTo}"
+	return ""
+
+
+def explainSelection(
+		trace: DecisionTrace,
+		groups: Iterable[List[Addon]],
+		apiVersions: SortedAPIVersions,
+) -> None:
+	"""
+	Records a "select" decision for each add-on group and API version, explaining every version in the group.
+	Groups are sorted newest first, as created by groupAddons.
+	"""
+	for group in groups:
+		for apiVer, backCompatTo in zip(apiVersions.apiVersions, apiVersions.backCompatTo):
+			selected = selectNewestCompatible(group, apiVer, backCompatTo)
+			candidates: List[Dict[str, Any]] = []
+			for addon in group:
+				reason = rejectionReason(addon, apiVer, backCompatTo)
+				if addon is selected:
+					reason = "newest compatible version"
+				elif not reason:
+					reason = f"older than the selected version {selected.addonVersion}"
+				candidates.append({
+					"addonVersion": str(addon.addonVersion),
+					"path": addon.pathToData,
+					"selected": addon is selected,
+					"reason": reason,
+				})
+			trace.record({
+				"decision": "select",
+				"addonId": group[0].addonId,
+				"channel": group[0].channel,
+				"apiVersion": str(apiVer),
+				"backCompatTo": str(backCompatTo),
+				"selectedVersion": None if selected is None else str(selected.addonVersion),
+				"candidates": candidates,
+			})
+
+
+def explainLatest(trace: DecisionTrace, addon: Addon, apiVersion: MajorMinorPatch) -> None:
+	trace.record({
+		"decision": "latest",
+		"addonId": addon.addonId,
+		"channel": addon.channel,
+		"apiVersion": str(apiVersion),
+		"addonVersion": str(addon.addonVersion),
+		"path": addon.pathToData,
+		"reason": "selected for the newest API version with a compatible version of the add-on",
+	})
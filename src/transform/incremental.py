@@ -0,0 +1,427 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Incrementally updates the views written by a previous transformation.
+
+A manifest of each run is kept in the output directory.
+It records the content hash of the nvdaAPIVersions.json file,
+the content hash of each input file, and the content hash and input file of each view written.
+Inputs are tracked per (addonId, channel) group, as the views of a group only depend on its inputs
+and the set of supported languages.
+Only groups with changed inputs are selected and written again,
+only view files with changed content are rewritten, and views that are no longer generated are removed.
+All groups are updated when there is no previous manifest,
+or when the NVDA API versions or supported languages have changed.
+Every view is rewritten when the compression level has changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+from typing import (
+	Dict,
+	Iterable,
+	List,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from .addonDataCache import (
+	AddonDataCache,
+	DEFAULT_CACHE_LIMIT_BYTES,
+)
+from .aggregates import (
+	AggregateKey,
+	aggregatePath,
+	buildAggregate,
+)
+from .datastructures import (
+	Addon,
+	AddonView,
+	parseViewPath,
+	VersionCompatibility,
+	ViewKind,
+	WriteableAddons,
+)
+from .explain import (
+	DecisionTrace,
+	explainSelection,
+)
+from .selection import (
+	AddonGroupKey,
+	addonGroupKey,
+	groupAddons,
+	SortedAPIVersions,
+)
+from .sinks import (
+	checkSinkOptions,
+	OutputFormat,
+)
+from .sources import (
+	readInputBytes,
+	splitArchivePath,
+)
+from .transform import (
+	getLatestAddons,
+	logCacheInfo,
+	readAddons,
+	readnvdaAPIVersionInfo,
+)
+from .writer import (
+	COMPRESSED_SUFFIX,
+	DEFAULT_WRITE_QUEUE_SIZE,
+	DEFAULT_WRITERS,
+	LinkMode,
+	removeView,
+	ViewWriter,
+)
+from .views import iterAddonViews
+
+log = logging.getLogger()
+
+MANIFEST_FILENAME = ".transform-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hashBytes(data: bytes) -> str:
+	return hashlib.sha256(data).hexdigest()
+
+
+def hashFile(path: str) -> str:
+	with open(path, "rb") as f:
+		return hashBytes(f.read())
+
+
+def _manifestGroupKey(groupKey: AddonGroupKey) -> str:
+	addonId, channel = groupKey
+	return f"{channel}/{addonId}"
+
+
+def _relativePath(path: str, start: str) -> str:
+	archivePath, memberName = splitArchivePath(path)
+	if archivePath is not None:
+		# Members of an archive source are relative to the directory named in the source path, if any.
+		_archivePath, startMemberName = splitArchivePath(start)
+		return posixpath.relpath(memberName, startMemberName or ".")
+	return os.path.relpath(path, start).replace(os.sep, "/")
+
+
+class TransformManifest:
+	"""
+	groups maps "channel/addonid" to a dictionary with:
+	- inputs: input path relative to the source directory -> content hash
+	- languages: the translation languages of the add-on versions selected from the group
+	- outputs: view path -> {"sha256": content hash, "source": input path}
+	aggregates maps aggregate view paths to their content hash,
+	or is None if aggregate views were not written.
+	compressLevel is the gzip compression level of the compressed views,
+	or None if compressed views were not written.
+	"""
+
+	def __init__(
+			self,
+			nvdaAPIVersionsHash: str,
+			languages: Iterable[str],
+			groups: Dict[str, Dict],
+			aggregates: Optional[Dict[str, str]] = None,
+			compressLevel: Optional[int] = None,
+	):
+		self.nvdaAPIVersionsHash = nvdaAPIVersionsHash
+		self.languages: Set[str] = set(languages)
+		self.groups = groups
+		self.aggregates = aggregates
+		self.compressLevel = compressLevel
+
+	@classmethod
+	def load(cls, path: str) -> Optional["TransformManifest"]:
+		"""
+		Returns None if there is no manifest at path, or it was written by an incompatible version.
+		"""
+		try:
+			with open(path, "r", encoding="utf-8") as manifestFile:
+				manifestData = json.load(manifestFile)
+		except FileNotFoundError:
+			return None
+		if manifestData.get("manifestVersion") != MANIFEST_VERSION:
+			log.warning(f"Ignoring manifest {path} with unsupported version {manifestData.get('manifestVersion')}")
+			return None
+		return cls(
+			manifestData["nvdaAPIVersionsHash"],
+			manifestData["languages"],
+			manifestData["groups"],
+			manifestData.get("aggregates"),
+			manifestData.get("compressLevel"),
+		)
+
+	def save(self, path: str) -> None:
+		tempPath = f"{path}.tmp"
+		with open(tempPath, "w", encoding="utf-8") as manifestFile:
+			json.dump({
+				"manifestVersion": MANIFEST_VERSION,
+				"nvdaAPIVersionsHash": self.nvdaAPIVersionsHash,
+				"languages": sorted(self.languages),
+				"groups": self.groups,
+				"aggregates": self.aggregates,
+				"compressLevel": self.compressLevel,
+			}, manifestFile, sort_keys=True)
+		os.replace(tempPath, path)
+
+	def outputHashes(self, groupKeys: Iterable[str]) -> Dict[str, str]:
+		return {
+			viewPath: output["sha256"]
+			for groupKey in groupKeys
+			for viewPath, output in self.groups.get(groupKey, {}).get("outputs", {}).items()
+		}
+
+
+def _groupLanguages(latestAddons: WriteableAddons, addonDataCache: AddonDataCache) -> Dict[str, Set[str]]:
+	groupLanguages: Dict[str, Set[str]] = {}
+	for channels in latestAddons.values():
+		for channelAddons in channels.values():
+			for addon in channelAddons.values():
+				groupLanguages.setdefault(_manifestGroupKey(addonGroupKey(addon)), set()).update(
+					t["language"] for t in addonDataCache.loadTranslations(addon)
+				)
+	return groupLanguages
+
+
+def _removeCompressedViews(outputDir: str, viewPaths: Iterable[str]) -> None:
+	for viewPath in viewPaths:
+		compressedPath = os.path.join(outputDir, *f"{viewPath}{COMPRESSED_SUFFIX}".split("/"))
+		if os.path.lexists(compressedPath):
+			os.remove(compressedPath)
+
+
+def _writeViews(
+		writer: ViewWriter,
+		views: List[AddonView],
+		previousOutputs: Dict[str, str],
+		groups: Dict[str, Dict],
+		sourceDir: str,
+		rewriteViews: bool,
+) -> int:
+	"""
+	Records views in the outputs of their group, and writes those which have changed since the previous run.
+	If rewriteViews is True, unchanged views are also written.
+	Returns the number of unchanged views.
+	"""
+	unchangedViews = 0
+	for view in views:
+		viewHash = hashBytes(view.data)
+		groups[_manifestGroupKey(addonGroupKey(view.addon))]["outputs"][view.path] = {
+			"sha256": viewHash,
+			"source": _relativePath(view.addon.pathToData, sourceDir),
+		}
+		if not rewriteViews and previousOutputs.get(view.path) == viewHash:
+			unchangedViews += 1
+		else:
+			writer.write(view.path, view.data, latestAPIVersion=view.latestAPIVersion)
+	return unchangedViews
+
+
+def _aggregateKeyOfPath(aggregateViewPath: str) -> AggregateKey:
+	language, apiVersion, fileName = aggregateViewPath.split("/")
+	channel, _extension = fileName.rsplit(".", 1)
+	return language, apiVersion, channel
+
+
+def _updateAggregates(
+		outputDir: str,
+		writer: ViewWriter,
+		aggregate: bool,
+		rewriteAggregates: bool,
+		previousAggregates: Optional[Dict[str, str]],
+		groups: Dict[str, Dict],
+		newViews: List[AddonView],
+		staleViews: List[str],
+) -> Optional[Dict[str, str]]:
+	"""
+	Writes the aggregate views which include an updated or removed view,
+	or every aggregate view if the previous run didn't write them or rewriteAggregates is True.
+	Views of unchanged add-ons are read from outputDir.
+	If aggregate is False, aggregate views from the previous run are removed.
+	Returns the aggregate view paths and hashes for the manifest.
+	"""
+	if not aggregate:
+		for aggregateViewPath in previousAggregates or ():
+			removeView(outputDir, aggregateViewPath)
+		return None
+	newViewData = {view.path: view.data for view in newViews}
+	affectedKeys: Set[AggregateKey] = set((view.language, view.apiVersion, view.channel) for view in newViews)
+	for viewPath in staleViews:
+		language, apiVersion, _addonId, channel = parseViewPath(viewPath)
+		affectedKeys.add((language, apiVersion, channel))
+	aggregateViews: Dict[AggregateKey, List[Tuple[str, bytes]]] = {}
+	for group in groups.values():
+		for viewPath in group["outputs"]:
+			language, apiVersion, addonId, channel = parseViewPath(viewPath)
+			key = (language, apiVersion, channel)
+			if previousAggregates is not None and not rewriteAggregates and key not in affectedKeys:
+				continue
+			data = newViewData.get(viewPath)
+			if data is None:
+				with open(os.path.join(outputDir, *viewPath.split("/")), "rb") as viewFile:
+					data = viewFile.read()
+			aggregateViews.setdefault(key, []).append((addonId, data))
+
+	previousAggregates = previousAggregates or {}
+	newAggregates = {
+		aggregateViewPath: aggregateHash
+		for aggregateViewPath, aggregateHash in previousAggregates.items()
+		if _aggregateKeyOfPath(aggregateViewPath) not in affectedKeys
+	}
+	for key, addonViews in aggregateViews.items():
+		aggregateViewPath = aggregatePath(*key)
+		aggregateData = buildAggregate(addonViews)
+		newAggregates[aggregateViewPath] = hashBytes(aggregateData)
+		if rewriteAggregates or previousAggregates.get(aggregateViewPath) != newAggregates[aggregateViewPath]:
+			writer.write(aggregateViewPath, aggregateData, ViewKind.AGGREGATE)
+	for aggregateViewPath in previousAggregates:
+		if aggregateViewPath not in newAggregates:
+			removeView(outputDir, aggregateViewPath)
+	return newAggregates
+
+
+def _explainSelection(
+		trace: Optional[DecisionTrace],
+		groups: Dict[str, List[Addon]],
+		groupKeys: Set[str],
+		nvdaAPIVersionInfo: Tuple[VersionCompatibility],
+) -> None:
+	"""
+	Explains the selection for the updated groups, if a trace is given.
+	"""
+	if trace is None:
+		return
+	selectedGroups = (groups[groupKey] for groupKey in sorted(groupKeys))
+	explainSelection(trace, selectedGroups, SortedAPIVersions(nvdaAPIVersionInfo))
+
+
+def runIncrementalTransformation(
+		nvdaAPIVersionsPath: str,
+		sourceDir: str,
+		outputDir: str,
+		addonCacheLimitBytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+		jobs: int = 1,
+		writers: int = DEFAULT_WRITERS,
+		writeQueueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+		linkMode: Optional[LinkMode] = None,
+		contentStore: Optional[str] = None,
+		aggregate: bool = False,
+		compressLevel: Optional[int] = None,
+		trace: Optional[DecisionTrace] = None,
+) -> None:
+	"""
+	Performs the transformation described in the readme, updating the views of a previous run in outputDir.
+	outputDir must contain the manifest of a previous incremental run, or be empty or not exist.
+	See runTransformation for the other arguments.
+	Blobs in the content store are reused between runs, and are not removed when they are no longer linked.
+	"""
+	outputDir = os.path.abspath(outputDir)
+	manifestPath = os.path.join(outputDir, MANIFEST_FILENAME)
+	previousManifest = TransformManifest.load(manifestPath)
+	if previousManifest is None and os.path.isdir(outputDir) and os.listdir(outputDir):
+		raise FileExistsError(f"{outputDir} is not empty and has no transform manifest to update incrementally")
+	checkSinkOptions(OutputFormat.DIRECTORY, writers, linkMode, compressLevel)
+	os.makedirs(outputDir, exist_ok=True)
+
+	nvdaAPIVersionsHash = hashFile(nvdaAPIVersionsPath)
+	nvdaAPIVersionInfo = readnvdaAPIVersionInfo(nvdaAPIVersionsPath)
+	groups = {
+		_manifestGroupKey(groupKey): group
+		for groupKey, group in groupAddons(readAddons(sourceDir, jobs)).items()
+	}
+	groupInputs = {
+		groupKey: {
+			_relativePath(addon.pathToData, sourceDir): hashBytes(readInputBytes(addon.pathToData))
+			for addon in group
+		}
+		for groupKey, group in groups.items()
+	}
+
+	rebuildAll = previousManifest is None or previousManifest.nvdaAPIVersionsHash != nvdaAPIVersionsHash
+	rewriteViews = previousManifest is not None and previousManifest.compressLevel != compressLevel
+	if previousManifest is None:
+		previousManifest = TransformManifest(nvdaAPIVersionsHash, (), {})
+	elif rebuildAll:
+		log.info("NVDA API versions changed, updating all views")
+	elif rewriteViews:
+		log.info("Compression level changed, rewriting all views")
+		rebuildAll = True
+
+	def _selectGroups(groupKeys: Set[str]) -> WriteableAddons:
+		selectedAddons: Iterable[Addon] = (addon for groupKey in groupKeys for addon in groups[groupKey])
+		return getLatestAddons(selectedAddons, nvdaAPIVersionInfo)
+
+	if rebuildAll:
+		updatedGroups = set(groups)
+	else:
+		updatedGroups = set(
+			groupKey for groupKey in groups
+			if previousManifest.groups.get(groupKey, {}).get("inputs") != groupInputs[groupKey]
+		)
+	addonDataCache = AddonDataCache(addonCacheLimitBytes)
+	latestAddons = _selectGroups(updatedGroups)
+	groupLanguages = _groupLanguages(latestAddons, addonDataCache)
+	supportedLanguages: Set[str] = set()
+	for groupKey in groups:
+		if groupKey in groupLanguages:
+			supportedLanguages.update(groupLanguages[groupKey])
+		elif groupKey not in updatedGroups:
+			supportedLanguages.update(previousManifest.groups[groupKey]["languages"])
+	if not rebuildAll and supportedLanguages != previousManifest.languages:
+		log.info("Supported languages changed, updating all views")
+		updatedGroups = set(groups)
+		latestAddons = _selectGroups(updatedGroups)
+		groupLanguages = _groupLanguages(latestAddons, addonDataCache)
+
+	removedGroups = set(groupKey for groupKey in previousManifest.groups if groupKey not in groups)
+	log.info(f"Updating {len(updatedGroups)} of {len(groups)} add-on groups, removing {len(removedGroups)}")
+	previousOutputs = previousManifest.outputHashes(updatedGroups | removedGroups)
+	newGroups: Dict[str, Dict] = {
+		groupKey: previousManifest.groups[groupKey]
+		for groupKey in groups
+		if groupKey not in updatedGroups
+	}
+	for groupKey in updatedGroups:
+		newGroups[groupKey] = {
+			"inputs": groupInputs[groupKey],
+			"languages": sorted(groupLanguages.get(groupKey, ())),
+			"outputs": {},
+		}
+	# Views written by an interrupted run are unknown, so the manifest is only valid once the run completes.
+	if os.path.exists(manifestPath):
+		os.remove(manifestPath)
+
+	# Views are generated before writing, so that stale views can be removed first.
+	# Add-on IDs may change casing between runs,
+	# and on a case insensitive file system a stale path may refer to a view that is being written.
+	# Views generated for the same add-on version share their serialized data.
+	_explainSelection(trace, groups, updatedGroups, nvdaAPIVersionInfo)
+	newViews = list(iterAddonViews(latestAddons, supportedLanguages, addonDataCache, trace))
+	newViewPaths = set(view.path for view in newViews)
+	staleViews = [viewPath for viewPath in previousOutputs if viewPath not in newViewPaths]
+	for viewPath in staleViews:
+		removeView(outputDir, viewPath)
+	if rewriteViews and compressLevel is None:
+		_removeCompressedViews(outputDir, list(previousOutputs) + list(previousManifest.aggregates or ()))
+
+	with ViewWriter(outputDir, writers, writeQueueSize, linkMode, contentStore, compressLevel) as writer:
+		unchangedViews = _writeViews(writer, newViews, previousOutputs, newGroups, sourceDir, rewriteViews)
+		newAggregates = _updateAggregates(
+			outputDir, writer, aggregate, rewriteViews, previousManifest.aggregates, newGroups, newViews, staleViews
+		)
+	log.info(
+		f"Wrote {writer.filesWritten} changed files, kept {unchangedViews} unchanged views, "
+		f"removed {len(staleViews)} stale views"
+	)
+	writer.logDeduplicationSummary()
+	logCacheInfo(addonDataCache)
+	TransformManifest(
+		nvdaAPIVersionsHash, supportedLanguages, newGroups, newAggregates, compressLevel
+	).save(manifestPath)
@@ -0,0 +1,153 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Optional instrumentation of a transformation run.
+Functions take an Optional[RunReport], and only measure when one is given,
+so there is no per-view cost when instrumentation is off.
+"""
+
+from contextlib import (
+	contextmanager,
+	nullcontext,
+)
+import json
+import time
+from typing import (
+	ContextManager,
+	Dict,
+	Iterator,
+	List,
+	Optional,
+)
+
+from .datastructures import (
+	AddonView,
+	ViewKind,
+)
+from .writer import ViewSink
+
+
+class PhaseTimes:
+	def __init__(self):
+		self.wallSeconds = 0.0
+		self.cpuSeconds = 0.0
+		self.calls = 0
+
+
+class RunReport:
+	"""
+	Collects the wall and CPU time of each phase of a run, counts, and the number of views written
+	per language and API version.
+	CPU time is measured for the whole process, so it includes writer threads running during a phase,
+	but not worker processes.
+	"""
+
+	def __init__(self):
+		self.phases: Dict[str, PhaseTimes] = {}
+		self.counts: Dict[str, int] = {}
+		# language -> API version -> number of views
+		self.outputs: Dict[str, Dict[str, int]] = {}
+		# The API versions which share the selected add-ons, see groupAPIVersionClasses.
+		self.apiVersionClasses: List[List[str]] = []
+		self._startWall = time.perf_counter()
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		"""
+		Adds the time spent in the context to the phase, which may be entered any number of times.
+		"""
+		startWall = time.perf_counter()
+		startCPU = time.process_time()
+		try:
+			yield
+		finally:
+			phaseTimes = self.phases.get(name)
+			if phaseTimes is None:
+				phaseTimes = self.phases[name] = PhaseTimes()
+			phaseTimes.wallSeconds += time.perf_counter() - startWall
+			phaseTimes.cpuSeconds += time.process_time() - startCPU
+			phaseTimes.calls += 1
+
+	def count(self, name: str, increment: int = 1) -> None:
+		self.counts[name] = self.counts.get(name, 0) + increment
+
+	def instrumentViews(self, views: Iterator[AddonView]) -> Iterator[AddonView]:
+		"""
+		Times generating views in the generateViews phase, and counts them by language and API version.
+		"""
+		while True:
+			with self.phase("generateViews"):
+				view = next(views, None)
+			if view is None:
+				return
+			languageOutputs = self.outputs.setdefault(view.language, {})
+			languageOutputs[view.apiVersion] = languageOutputs.get(view.apiVersion, 0) + 1
+			yield view
+
+	def instrumentSink(self, sink: ViewSink) -> ViewSink:
+		return _TimedSink(sink, self)
+
+	def toJson(self) -> Dict:
+		return {
+			"wallSeconds": time.perf_counter() - self._startWall,
+			"phases": {
+				name: {
+					"wallSeconds": phaseTimes.wallSeconds,
+					"cpuSeconds": phaseTimes.cpuSeconds,
+					"calls": phaseTimes.calls,
+				}
+				for name, phaseTimes in self.phases.items()
+			},
+			"counts": dict(sorted(self.counts.items())),
+			"outputs": self.outputs,
+			"apiVersionClasses": self.apiVersionClasses,
+		}
+
+	def save(self, path: str) -> None:
+		with open(path, "w", encoding="utf-8") as reportFile:
+			json.dump(self.toJson(), reportFile, indent="\t", sort_keys=True)
+
+
+def timedPhase(report: Optional[RunReport], name: str) -> ContextManager:
+	"""
+	Times a phase if a report is given.
+	"""
+	if report is None:
+		return nullcontext()
+	return report.phase(name)
+
+
+class _TimedSink(ViewSink):
+	"""
+	Times queuing files on a sink in the queueWrites phase.
+	"""
+
+	def __init__(self, sink: ViewSink, report: RunReport):
+		self._sink = sink
+		self._report = report
+
+	@property
+	def filesWritten(self) -> int:
+		return self._sink.filesWritten
+
+	@property
+	def bytesWritten(self) -> int:
+		return self._sink.bytesWritten
+
+	def write(
+			self,
+			path: str,
+			data: bytes,
+			kind: ViewKind = ViewKind.ADDON,
+			latestAPIVersion: Optional[str] = None,
+	) -> None:
+		with self._report.phase("queueWrites"):
+			self._sink.write(path, data, kind, latestAPIVersion)
+
+	def close(self) -> None:
+		self._sink.close()
+
+	def discard(self) -> None:
+		self._sink.discard()
@@ -0,0 +1,162 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Merges the output of every shard of a transformation into the output of a full transformation.
+
+The supported languages are the languages of every shard.
+A shard only has views for its own languages, so the views of each other language are copied
+from the shard's views which the language falls back to, see resolveTranslationLanguage:
+the views of the language without its locale if the shard has them, otherwise the untranslated English views.
+None of the shard's add-ons have a translation for a language the shard doesn't have,
+so the copied views are identical to the views a full transformation writes.
+Aggregate views, ETag manifests and compressed copies are written by the merge.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import (
+	Dict,
+	List,
+	Optional,
+	Set,
+)
+
+from .aggregates import AggregateCollector
+from .datastructures import (
+	AddonView,
+	LATEST_VIEW,
+	parseViewPath,
+	ViewKind,
+)
+from .etags import ETagCollector
+from .plan import existingOutputPaths
+from .shards import (
+	ENGLISH_FALLBACK_DIRNAME,
+	latestViewKey,
+	ShardManifest,
+)
+from .sinks import (
+	checkSinkOptions,
+	openViewSink,
+	OutputFormat,
+)
+from .writer import (
+	DEFAULT_WRITE_QUEUE_SIZE,
+	DEFAULT_WRITERS,
+	LinkMode,
+	ViewSink,
+)
+
+log = logging.getLogger()
+
+
+def _loadShardManifests(shardDirs: List[str]) -> List[ShardManifest]:
+	"""
+	Raises a ValueError unless shardDirs are the outputs of every shard of one transformation.
+	"""
+	manifests = [ShardManifest.load(shardDir) for shardDir in shardDirs]
+	counts = {manifest.shard.count for manifest in manifests}
+	if len(counts) != 1:
+		raise ValueError(f"The shards were written with different shard counts: {sorted(counts)}")
+	count = counts.pop()
+	indexes = sorted(manifest.shard.index for manifest in manifests)
+	if indexes != list(range(1, count + 1)):
+		raise ValueError(f"Expected each of {count} shards once, got shards {indexes}")
+	if len({manifest.nvdaAPIVersionsHash for manifest in manifests}) != 1:
+		raise ValueError("The shards were written with different NVDA API versions")
+	return manifests
+
+
+def _sourceLanguages(languages: Set[str], shardLanguages: Set[str]) -> Dict[str, List[str]]:
+	"""
+	Maps each language of a shard's views, and ENGLISH_FALLBACK_DIRNAME, to the languages to copy them to.
+	"""
+	# A shard without English as a supported language writes untranslated English views.
+	englishSource = ENGLISH_FALLBACK_DIRNAME if "en" in shardLanguages else "en"
+	targets: Dict[str, List[str]] = {}
+	for language in sorted(languages):
+		if language in shardLanguages or language == "en":
+			source = language
+		elif language.split("_")[0] in shardLanguages:
+			source = language.split("_")[0]
+		else:
+			source = englishSource
+		targets.setdefault(source, []).append(language)
+	return targets
+
+
+def _mergeShard(
+		shardDir: str,
+		targets: Dict[str, List[str]],
+		latestAPIVersions: Dict[str, str],
+		sink: ViewSink,
+		aggregates: Optional[AggregateCollector],
+		etagManifests: Optional[ETagCollector],
+) -> None:
+	viewPaths = sorted(existingOutputPaths(shardDir))
+	fallbackDir = os.path.join(shardDir, ENGLISH_FALLBACK_DIRNAME)
+	if ENGLISH_FALLBACK_DIRNAME in targets:
+		viewPaths.extend(
+			f"{ENGLISH_FALLBACK_DIRNAME}/{path}" for path in sorted(existingOutputPaths(fallbackDir))
+		)
+	for path in viewPaths:
+		with open(os.path.join(shardDir, *path.split("/")), "rb") as viewFile:
+			data = viewFile.read()
+		sourceLanguage, apiVersion, addonId, channel = parseViewPath(path)
+		latestAPIVersion = latestAPIVersions[latestViewKey(addonId, channel)] if apiVersion == LATEST_VIEW else None
+		for language in targets.get(sourceLanguage, []):
+			view = AddonView(language, apiVersion, addonId, channel, data, None, latestAPIVersion)
+			sink.write(view.path, data, latestAPIVersion=latestAPIVersion)
+			if aggregates is not None:
+				aggregates.add(view)
+			if etagManifests is not None:
+				etagManifests.add(view.path, data)
+
+
+def mergeShards(
+		shardDirs: List[str],
+		outputDir: str,
+		writers: int = DEFAULT_WRITERS,
+		writeQueueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+		linkMode: Optional[LinkMode] = None,
+		contentStore: Optional[str] = None,
+		aggregate: bool = False,
+		compressLevel: Optional[int] = None,
+		outputFormat: OutputFormat = OutputFormat.DIRECTORY,
+		etags: bool = False,
+) -> None:
+	"""
+	Writes the views of every shard in shardDirs to outputDir, as a full transformation writes them.
+	See runTransformation for the other arguments.
+	"""
+	if outputFormat == OutputFormat.SQLITE and etags:
+		raise ValueError("ETag manifests are not supported for sqlite output")
+	manifests = _loadShardManifests(shardDirs)
+	languages = {"en"}.union(*(manifest.languages for manifest in manifests))
+	log.info(f"Merging {len(shardDirs)} shards with {len(languages)} languages")
+	checkSinkOptions(outputFormat, writers, linkMode, compressLevel)
+	if outputFormat == OutputFormat.DIRECTORY:
+		# Make sure the directory doesn't already exist so data isn't overwritten
+		Path(outputDir).mkdir(parents=True, exist_ok=False)
+	elif os.path.lexists(outputDir):
+		raise FileExistsError(f"{outputDir} already exists")
+	aggregates = AggregateCollector() if aggregate else None
+	etagManifests = ETagCollector() if etags else None
+	with openViewSink(
+		outputFormat, outputDir, writers, writeQueueSize, linkMode, contentStore, compressLevel
+	) as sink:
+		for shardDir, manifest in zip(shardDirs, manifests):
+			targets = _sourceLanguages(languages, set(manifest.languages))
+			_mergeShard(shardDir, targets, manifest.latestAPIVersions, sink, aggregates, etagManifests)
+		if aggregates is not None:
+			for path, data in aggregates.iterAggregates():
+				sink.write(path, data, ViewKind.AGGREGATE)
+				if etagManifests is not None:
+					etagManifests.add(path, data)
+		if etagManifests is not None:
+			for path, data in etagManifests.iterManifests():
+				sink.write(path, data, ViewKind.ETAG_MANIFEST)
+	sink.logSummary()
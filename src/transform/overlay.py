@@ -0,0 +1,158 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+The translation overlay output layout.
+
+Rather than a full copy of each add-on document for every language,
+a base document is written once per (API version, add-on, channel):
+- base/<apiVersion>/<addonId>/<channel>.json
+and a small overlay of the translated fields is written for each language which has a translation:
+- overlays/<language>/<apiVersion>/<addonId>/<channel>.json
+Overlays are resolved, so a language with a locale falls back to the translation without the locale,
+and the translationLanguage of the overlay records which translation was used.
+Languages without an overlay use the English base document.
+resolveOverlayView merges a base document and overlay into the document written by the full layout.
+"""
+
+from enum import Enum
+import json
+import os
+from typing import (
+	Dict,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from .addonDataCache import AddonDataCache
+from .datastructures import (
+	Addon,
+	AddonChannels,
+	LATEST_VIEW,
+	WriteableAddons,
+)
+from .explain import DecisionTrace
+from .views import (
+	iterSelectedAddons,
+	resolveTranslationLanguage,
+	translateAddonData,
+)
+from .writer import serializeJson
+from src.validate.validate import (
+	JSONSchemaPaths,
+	validateJson,
+)
+
+BASE_DIRNAME = "base"
+OVERLAYS_DIRNAME = "overlays"
+# The fields of an add-on document which are translated.
+TRANSLATED_FIELDS = ("displayName", "description")
+
+
+class OutputLayout(str, Enum):
+	FULL = "full"
+	OVERLAY = "overlay"
+
+
+class OverlayView(NamedTuple):
+	language: Optional[str]  # The language of the overlay, or None for the base document
+	apiVersion: str  # The NVDA API version, or LATEST_VIEW
+	addonId: str
+	channel: AddonChannels
+	data: bytes
+	addon: Addon
+	# For a latest view, the newest NVDA API version the add-on version is selected for.
+	latestAPIVersion: Optional[str] = None
+
+	@property
+	def path(self) -> str:
+		if self.language is None:
+			return basePath(self.apiVersion, self.addonId, self.channel)
+		return overlayPath(self.language, self.apiVersion, self.addonId, self.channel)
+
+
+def basePath(apiVersion: str, addonId: str, channel: AddonChannels) -> str:
+	return f"{BASE_DIRNAME}/{apiVersion}/{addonId}/{channel}.json"
+
+
+def overlayPath(language: str, apiVersion: str, addonId: str, channel: AddonChannels) -> str:
+	return f"{OVERLAYS_DIRNAME}/{language}/{apiVersion}/{addonId}/{channel}.json"
+
+
+def iterOverlayViews(
+		addons: WriteableAddons,
+		supportedLanguages: Set[str],
+		addonDataCache: Optional[AddonDataCache] = None,
+		trace: Optional[DecisionTrace] = None,
+) -> Iterator[OverlayView]:
+	"""
+	Generates the base documents and overlays for the addons, see iterAddonViews.
+	Translated documents are validated as they are in the full layout.
+	"""
+	if addonDataCache is None:
+		addonDataCache = AddonDataCache()
+	# Languages are generated in sorted order, so the views are generated in the same order for the same input.
+	languages = sorted(supportedLanguages)
+	for nvdaAPIVersions, addonName, channel, addon, addLatest in iterSelectedAddons(addons, trace):
+		# The API version of each view, and for the latest view, the newest API version of the class.
+		apiVersions: List[Tuple[str, Optional[str]]] = [
+			(str(nvdaAPIVersion), None) for nvdaAPIVersion in nvdaAPIVersions
+		]
+		if addLatest:
+			apiVersions.append((LATEST_VIEW, str(nvdaAPIVersions[0])))
+		# Translations are loaded first, so the source document is only parsed once.
+		translations = addonDataCache.loadTranslations(addon)
+		addonData: Dict = addonDataCache.get(addon.pathToData)
+		validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
+		baseData = serializeJson(addonData)
+		for apiVersion, latestAPIVersion in apiVersions:
+			yield OverlayView(None, apiVersion, addonName, channel, baseData, addon, latestAPIVersion)
+
+		addonTranslations = {t["language"]: t for t in translations}
+		# Languages which fall back to the same translation share the serialized overlay.
+		serializedOverlays: Dict[str, bytes] = {}
+		for lang in languages:
+			translationLanguage = resolveTranslationLanguage(addonTranslations, lang)
+			if translationLanguage is None:
+				continue
+			overlayData = serializedOverlays.get(translationLanguage)
+			if overlayData is None:
+				translation = addonTranslations[translationLanguage]
+				validateJson(translateAddonData(addonData, translation), JSONSchemaPaths.ADDON_DATA)
+				overlay = {"translationLanguage": translationLanguage}
+				overlay.update((field, translation[field]) for field in TRANSLATED_FIELDS)
+				overlayData = serializeJson(overlay)
+				serializedOverlays[translationLanguage] = overlayData
+			for apiVersion, latestAPIVersion in apiVersions:
+				yield OverlayView(lang, apiVersion, addonName, channel, overlayData, addon, latestAPIVersion)
+
+
+def resolveOverlayView(
+		outputDir: str,
+		language: str,
+		apiVersion: str,
+		addonId: str,
+		channel: AddonChannels,
+) -> Optional[Dict]:
+	"""
+	A reference resolver for the overlay layout written to outputDir.
+	Returns the add-on document for language, matching the full layout,
+	or None if there is no add-on for the API version and channel.
+	"""
+	try:
+		with open(os.path.join(outputDir, *basePath(apiVersion, addonId, channel).split("/")), "rb") as baseFile:
+			addonData = json.load(baseFile)
+	except FileNotFoundError:
+		return None
+	overlayFilePath = os.path.join(outputDir, *overlayPath(language, apiVersion, addonId, channel).split("/"))
+	try:
+		with open(overlayFilePath, "rb") as overlayFile:
+			overlay = json.load(overlayFile)
+	except FileNotFoundError:
+		return addonData
+	return translateAddonData(addonData, overlay)
@@ -0,0 +1,298 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Plans the files written by a transformation, without writing them, and applies a plan to an output tree.
+
+A plan lists each file the transformation generates, with the content hash of the file,
+the input file it was generated from, and whether it is added or changed
+compared with an existing output tree.
+Files in the existing tree which are no longer generated are listed to be removed.
+Files and directories starting with ".", such as the content store and the incremental manifest,
+are not compared, nor are compressed copies unless the plan is made to update the tree.
+A plan only keeps the hash of each file, so the files are generated again to apply it.
+"""
+
+from enum import Enum
+import logging
+import os
+from typing import (
+	Callable,
+	Dict,
+	Iterable,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Set,
+)
+
+from .addonDataCache import (
+	AddonDataCache,
+	DEFAULT_CACHE_LIMIT_BYTES,
+)
+from .explain import DecisionTrace
+from .incremental import hashBytes
+from .overlay import OutputLayout
+from .transform import (
+	getLatestAddons,
+	getSupportedLanguages,
+	iterOutputFiles,
+	OutputFile,
+	readAddons,
+	readnvdaAPIVersionInfo,
+)
+from .writer import (
+	COMPRESSED_SUFFIX,
+	removeView,
+	DEFAULT_WRITE_QUEUE_SIZE,
+	DEFAULT_WRITERS,
+	LinkMode,
+	ViewSink,
+	ViewWriter,
+)
+
+log = logging.getLogger()
+
+
+class PlanReason(str, Enum):
+	ADDED = "added"
+	CHANGED = "changed"
+	UNCHANGED = "unchanged"
+
+
+class PlanEntry(NamedTuple):
+	path: str
+	sha256: str
+	source: Optional[str]  # The input file of a view, None for an aggregate view
+	reason: PlanReason
+
+
+class TransformPlan(NamedTuple):
+	entries: List[PlanEntry]
+	removedPaths: List[str]
+
+	def paths(self, reason: PlanReason) -> List[str]:
+		return [entry.path for entry in self.entries if entry.reason == reason]
+
+	@property
+	def hasChanges(self) -> bool:
+		return bool(self.removedPaths) or any(entry.reason != PlanReason.UNCHANGED for entry in self.entries)
+
+	def toJson(self) -> Dict:
+		"""
+		The added, changed and removed paths, and the number of unchanged files.
+		"""
+		return {
+			"hasChanges": self.hasChanges,
+			PlanReason.ADDED.value: [
+				_entryJson(entry) for entry in self.entries if entry.reason == PlanReason.ADDED
+			],
+			PlanReason.CHANGED.value: [
+				_entryJson(entry) for entry in self.entries if entry.reason == PlanReason.CHANGED
+			],
+			"removed": self.removedPaths,
+			PlanReason.UNCHANGED.value: len(self.paths(PlanReason.UNCHANGED)),
+		}
+
+
+def _entryJson(entry: PlanEntry) -> Dict:
+	return {"path": entry.path, "sha256": entry.sha256, "source": entry.source}
+
+
+def existingOutputPaths(outputDir: str, includeCompressed: bool = False) -> Set[str]:
+	"""
+	The paths of the files in an existing output tree, relative to outputDir and using "/" as the separator.
+	Files and directories starting with "." are skipped,
+	as are compressed copies unless includeCompressed is True.
+	"""
+	paths: Set[str] = set()
+	for directory, dirNames, fileNames in os.walk(outputDir):
+		dirNames[:] = [dirName for dirName in dirNames if not dirName.startswith(".")]
+		relativeDir = os.path.relpath(directory, outputDir).replace(os.sep, "/")
+		for fileName in fileNames:
+			if fileName.startswith(".") or (not includeCompressed and fileName.endswith(COMPRESSED_SUFFIX)):
+				continue
+			paths.add(fileName if relativeDir == "." else f"{relativeDir}/{fileName}")
+	return paths
+
+
+def planOutputFiles(
+		files: Iterable[OutputFile],
+		outputDir: Optional[str] = None,
+		compressed: Optional[bool] = None,
+) -> TransformPlan:
+	"""
+	Plans writing files to outputDir, comparing each file with the existing file at its path.
+	If outputDir is None or doesn't exist, every file is added.
+	If compressed is given, compressed copies are compared too: an unchanged file is changed
+	if it is missing its compressed copy when compressed is True, or has one when compressed is False,
+	and compressed copies of files which are no longer generated are removed.
+	"""
+	existingPaths = existingOutputPaths(outputDir) if outputDir is not None else set()
+	compressedPaths: Set[str] = set()
+	if outputDir is not None and compressed is not None:
+		compressedPaths = {
+			path[:-len(COMPRESSED_SUFFIX)]
+			for path in existingOutputPaths(outputDir, includeCompressed=True)
+			if path.endswith(COMPRESSED_SUFFIX)
+		}
+	entries: List[PlanEntry] = []
+	for outputFile in files:
+		sha256 = hashBytes(outputFile.data)
+		if outputFile.path not in existingPaths:
+			reason = PlanReason.ADDED
+		else:
+			existingPath = os.path.join(outputDir, *outputFile.path.split("/"))
+			with open(existingPath, "rb") as existingFile:
+				existingData = existingFile.read()
+			reason = PlanReason.UNCHANGED if existingData == outputFile.data else PlanReason.CHANGED
+			if compressed is not None and (outputFile.path in compressedPaths) != compressed:
+				reason = PlanReason.CHANGED
+		entries.append(PlanEntry(outputFile.path, sha256, outputFile.source, reason))
+	plannedPaths = {entry.path for entry in entries}
+	return TransformPlan(entries, sorted((existingPaths | compressedPaths) - plannedPaths))
+
+
+def _outputFiles(
+		nvdaAPIVersionsPath: str,
+		sourceDir: str,
+		addonCacheLimitBytes: int,
+		jobs: int,
+		aggregate: bool,
+		trace: Optional[DecisionTrace],
+		layout: OutputLayout,
+		etags: bool,
+) -> Callable[[bool], Iterator[OutputFile]]:
+	"""
+	Reads the add-ons once, and returns a function generating the files of the transformation.
+	The function is called with traced=True to explain the latest views in trace.
+	"""
+	if (aggregate or etags) and layout == OutputLayout.OVERLAY:
+		raise ValueError("Aggregate views and ETag manifests are not supported with the overlay layout")
+	nvdaAPIVersionInfo = readnvdaAPIVersionInfo(nvdaAPIVersionsPath)
+	latestAddons = getLatestAddons(readAddons(sourceDir, jobs), nvdaAPIVersionInfo, trace)
+	addonDataCache = AddonDataCache(addonCacheLimitBytes)
+	supportedLanguages = getSupportedLanguages(latestAddons, addonDataCache)
+	return lambda traced: iterOutputFiles(
+		latestAddons,
+		supportedLanguages,
+		addonDataCache,
+		aggregate,
+		trace=trace if traced else None,
+		layout=layout,
+		etags=etags,
+	)
+
+
+def _logPlan(plan: TransformPlan) -> None:
+	log.info(
+		f"Planned {len(plan.paths(PlanReason.ADDED))} added, {len(plan.paths(PlanReason.CHANGED))} changed, "
+		f"{len(plan.removedPaths)} removed and {len(plan.paths(PlanReason.UNCHANGED))} unchanged files"
+	)
+
+
+def planTransformation(
+		nvdaAPIVersionsPath: str,
+		sourceDir: str,
+		outputDir: Optional[str] = None,
+		addonCacheLimitBytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+		jobs: int = 1,
+		aggregate: bool = False,
+		trace: Optional[DecisionTrace] = None,
+		layout: OutputLayout = OutputLayout.FULL,
+		etags: bool = False,
+) -> TransformPlan:
+	"""
+	Plans the transformation of the addon data found in sourceDir, as runTransformation would write it,
+	compared with the existing output tree in outputDir.
+	Nothing is written to outputDir.
+	"""
+	outputFiles = _outputFiles(
+		nvdaAPIVersionsPath, sourceDir, addonCacheLimitBytes, jobs, aggregate, trace, layout, etags
+	)
+	if outputDir is not None and not os.path.isdir(outputDir):
+		outputDir = None
+	plan = planOutputFiles(outputFiles(True), outputDir)
+	_logPlan(plan)
+	return plan
+
+
+def applyPlan(
+		plan: TransformPlan,
+		files: Iterable[OutputFile],
+		outputDir: str,
+		writer: Optional[ViewSink] = None,
+) -> None:
+	"""
+	Removes the files of outputDir no longer generated, and writes the added and changed files of a plan,
+	taking their data from files, the files the plan was made from generated again.
+	Throws a ValueError if a file to write has changed since the plan was made.
+	Files are queued on writer, by default a ViewWriter for outputDir which is closed before returning.
+	The existing compressed copy of each file written is removed, the writer writes a new one if it compresses.
+	"""
+	if writer is None:
+		with ViewWriter(outputDir) as writer:
+			applyPlan(plan, files, outputDir, writer)
+		return
+	plannedHashes = {
+		entry.path: entry.sha256 for entry in plan.entries if entry.reason != PlanReason.UNCHANGED
+	}
+	# Files are removed first, so directories left empty aren't removed while files are written to them.
+	for path in plan.removedPaths:
+		removeView(outputDir, path)
+	for outputFile in files:
+		sha256 = plannedHashes.pop(outputFile.path, None)
+		if sha256 is None:
+			continue
+		if hashBytes(outputFile.data) != sha256:
+			raise ValueError(f"{outputFile.path} has changed since the plan was made")
+		compressedPath = os.path.join(outputDir, *f"{outputFile.path}{COMPRESSED_SUFFIX}".split("/"))
+		if os.path.lexists(compressedPath):
+			os.remove(compressedPath)
+		writer.write(outputFile.path, outputFile.data, outputFile.kind, outputFile.latestAPIVersion)
+	if plannedHashes:
+		raise ValueError(f"{len(plannedHashes)} planned files were not generated, e.g. {min(plannedHashes)}")
+
+
+def updateTransformation(
+		nvdaAPIVersionsPath: str,
+		sourceDir: str,
+		outputDir: str,
+		addonCacheLimitBytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+		jobs: int = 1,
+		writers: int = DEFAULT_WRITERS,
+		writeQueueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+		linkMode: Optional[LinkMode] = None,
+		contentStore: Optional[str] = None,
+		aggregate: bool = False,
+		compressLevel: Optional[int] = None,
+		trace: Optional[DecisionTrace] = None,
+		layout: OutputLayout = OutputLayout.FULL,
+		etags: bool = False,
+) -> TransformPlan:
+	"""
+	Plans the transformation against the existing output tree in outputDir, and applies the plan,
+	so only added and changed files are written, and files no longer generated are removed.
+	Files are rewritten if they are missing a compressed copy when a compressLevel is given,
+	or have a stale one when it isn't.
+	Nothing is written if the output is up to date.
+	outputDir is created if it doesn't exist.
+	See runTransformation for the other arguments.
+	Returns the plan applied.
+	"""
+	outputFiles = _outputFiles(
+		nvdaAPIVersionsPath, sourceDir, addonCacheLimitBytes, jobs, aggregate, trace, layout, etags
+	)
+	plan = planOutputFiles(
+		outputFiles(True), outputDir if os.path.isdir(outputDir) else None, compressLevel is not None
+	)
+	_logPlan(plan)
+	if not plan.hasChanges:
+		log.info(f"{outputDir} is up to date, nothing to write")
+		return plan
+	with ViewWriter(outputDir, writers, writeQueueSize, linkMode, contentStore, compressLevel) as writer:
+		applyPlan(plan, outputFiles(False), outputDir, writer)
+	writer.logSummary()
+	return plan
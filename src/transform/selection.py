@@ -0,0 +1,152 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Selects the newest compatible version of each add-on for each NVDA API version.
+
+Add-on versions are grouped by (addonId, channel), and each group is sorted newest first.
+For each API version, the first compatible entry in a group is selected.
+API versions are sorted so that the window of API versions a group can be compatible with
+is found with a bisect, rather than checking every API version.
+API versions which are compatible with the same add-on versions are selected for once, see apiVersionClasses.
+"""
+
+from bisect import (
+	bisect_left,
+	bisect_right,
+)
+from typing import (
+	Dict,
+	Iterable,
+	List,
+	Optional,
+	Tuple,
+)
+
+from .datastructures import (
+	Addon,
+	AddonChannels,
+	MajorMinorPatch,
+	VersionCompatibility,
+)
+
+AddonGroupKey = Tuple[str, AddonChannels]
+AddonGroups = Dict[AddonGroupKey, List[Addon]]
+
+
+def addonGroupKey(addon: Addon) -> AddonGroupKey:
+	"""
+	Identical add-on IDs may have different casing due to legacy add-on submissions,
+	so add-on IDs are compared case insensitively, matching CaseInsensitiveDict.
+	"""
+	return addon.addonId.lower(), addon.channel
+
+
+def groupAddons(addons: Iterable[Addon]) -> AddonGroups:
+	"""
+	Groups add-on versions by (addonId, channel), each group ordered by addonVersion, newest first.
+	"""
+	groups: AddonGroups = {}
+	for addon in addons:
+		groups.setdefault(addonGroupKey(addon), []).append(addon)
+	for group in groups.values():
+		group.sort(key=lambda addon: addon.addonVersion, reverse=True)
+	return groups
+
+
+class SortedAPIVersions:
+	"""
+	The unique NVDA API versions in ascending order.
+	An API version listed more than once is compatible with an add-on if any of its entries are,
+	which is the case when the add-on is compatible with the lowest backCompatTo listed for it.
+	"""
+
+	def __init__(self, nvdaAPIVersions: Iterable[VersionCompatibility]):
+		lowestBackCompatTo: Dict[MajorMinorPatch, MajorMinorPatch] = {}
+		for nvdaAPIVersion in nvdaAPIVersions:
+			backCompatTo = lowestBackCompatTo.get(nvdaAPIVersion.apiVer, nvdaAPIVersion.backCompatTo)
+			lowestBackCompatTo[nvdaAPIVersion.apiVer] = min(backCompatTo, nvdaAPIVersion.backCompatTo)
+		self.apiVersions: List[MajorMinorPatch] = sorted(lowestBackCompatTo)
+		self.backCompatTo: List[MajorMinorPatch] = [lowestBackCompatTo[apiVer] for apiVer in self.apiVersions]
+		# The lowest backCompatTo of each API version and every API version after it.
+		# This is non-decreasing, so it can be bisected even if backCompatTo is not.
+		self._suffixMinBackCompatTo: List[MajorMinorPatch] = []
+		for backCompatTo in reversed(self.backCompatTo):
+			if self._suffixMinBackCompatTo:
+				backCompatTo = min(backCompatTo, self._suffixMinBackCompatTo[-1])
+			self._suffixMinBackCompatTo.append(backCompatTo)
+		self._suffixMinBackCompatTo.reverse()
+
+	def compatibleWindow(self, group: List[Addon]) -> range:
+		"""
+		Returns the indexes of the API versions that any add-on in group may be compatible with.
+		API versions outside of this window are not compatible with any add-on in the group.
+		"""
+		lowestMinNvdaAPIVersion = min(addon.minNvdaAPIVersion for addon in group)
+		highestLastTestedVersion = max(addon.lastTestedVersion for addon in group)
+		start = bisect_left(self.apiVersions, lowestMinNvdaAPIVersion)
+		stop = bisect_right(self._suffixMinBackCompatTo, highestLastTestedVersion)
+		return range(start, stop)
+
+
+def apiVersionClasses(groups: AddonGroups, apiVersions: SortedAPIVersions) -> List[List[int]]:
+	"""
+	Partitions the API versions into classes which select the same add-on versions from groups.
+	An add-on version is compatible if its minNvdaAPIVersion is not newer than the API version,
+	and its lastTestedVersion is not older than backCompatTo.
+	So API versions after the same minNvdaAPIVersions, with a backCompatTo after the same lastTestedVersions,
+	are compatible with the same add-on versions. Patch releases and releases with the same backCompatTo
+	are often equivalent.
+	Returns the indexes of the API versions in each class, newest first,
+	and the classes in order of their newest API version, newest first.
+	"""
+	minNvdaAPIVersions = sorted({addon.minNvdaAPIVersion for group in groups.values() for addon in group})
+	lastTestedVersions = sorted({addon.lastTestedVersion for group in groups.values() for addon in group})
+	classes: Dict[Tuple[int, int], List[int]] = {}
+	for index in reversed(range(len(apiVersions.apiVersions))):
+		key = (
+			bisect_right(minNvdaAPIVersions, apiVersions.apiVersions[index]),
+			bisect_left(lastTestedVersions, apiVersions.backCompatTo[index]),
+		)
+		classes.setdefault(key, []).append(index)
+	return list(classes.values())
+
+
+def selectNewestCompatible(
+		group: List[Addon],
+		apiVer: MajorMinorPatch,
+		backCompatTo: MajorMinorPatch,
+) -> Optional[Addon]:
+	"""
+	Returns the newest add-on in group, which must be sorted newest first, that is compatible with
+	the API version apiVer, which is backwards compatible to backCompatTo.
+	Throws a ValueError if another add-on with the same version is also compatible.
+	"""
+	for index, addon in enumerate(group):
+		if backCompatTo <= addon.lastTestedVersion and addon.minNvdaAPIVersion <= apiVer:
+			for otherIndex in range(index + 1, len(group)):
+				other = group[otherIndex]
+				if other.addonVersion != addon.addonVersion:
+					break
+				if backCompatTo <= other.lastTestedVersion and other.minNvdaAPIVersion <= apiVer:
+					raise ValueError(
+						f"Addon {other.addonId} {other.addonVersion} already added to addons dictionary"
+					)
+			return addon
+	return None
+
+
+def selectLatestAddons(
+		groups: AddonGroups,
+		apiVersions: SortedAPIVersions,
+) -> Iterable[Tuple[MajorMinorPatch, Addon]]:
+	"""
+	Yields (apiVer, addon) for the newest compatible add-on of each group for each API version.
+	"""
+	for group in groups.values():
+		for apiVersionIndex in apiVersions.compatibleWindow(group):
+			apiVer = apiVersions.apiVersions[apiVersionIndex]
+			selected = selectNewestCompatible(group, apiVer, apiVersions.backCompatTo[apiVersionIndex])
+			if selected is not None:
+				yield apiVer, selected
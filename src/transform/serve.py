@@ -0,0 +1,208 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+A resident query service, answering requests for views from the selected add-ons held in memory.
+Views are served at the paths they are written to by the transformation:
+- /<language>/<apiVersion>/<addonId>/<channel>.json: the view of an add-on.
+- /<language>/<apiVersion>/<channel>.json: the aggregate view of every add-on, as written with --aggregate.
+Responses are identical to the files written by the transformation.
+The ETag of a response is the sha256 hash listed for the file in the ETag manifests,
+so clients can make conditional requests.
+The datastore is loaded again when the input directory or archive, or nvdaAPIVersions.json, changes.
+"""
+
+import glob
+import hashlib
+from http import HTTPStatus
+from http.server import (
+	BaseHTTPRequestHandler,
+	ThreadingHTTPServer,
+)
+import logging
+import os
+import threading
+from typing import Optional
+from urllib.parse import (
+	unquote,
+	urlsplit,
+)
+
+from .addonDataCache import DEFAULT_CACHE_LIMIT_BYTES
+from .sources import splitArchivePath
+from .viewIndex import AddonViewIndex
+
+log = logging.getLogger()
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+
+
+def _inputSignature(nvdaAPIVersionsPath: str, sourceDir: str) -> str:
+	"""
+	A hash of the path, size and modification time of each input file read by the transformation.
+	An archive source is a single input file.
+	"""
+	signature = hashlib.sha256()
+	archivePath, _memberName = splitArchivePath(sourceDir)
+	inputPaths = sorted(glob.glob(f"{sourceDir}/**/*.json")) if archivePath is None else [archivePath]
+	for path in [nvdaAPIVersionsPath] + inputPaths:
+		try:
+			stat = os.stat(path)
+		except FileNotFoundError:
+			continue
+		signature.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+	return signature.hexdigest()
+
+
+class ViewService:
+	"""
+	Loads the datastore into an AddonViewIndex, and loads it again when the input changes.
+	"""
+
+	def __init__(
+			self,
+			nvdaAPIVersionsPath: str,
+			sourceDir: str,
+			addonCacheLimitBytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+			jobs: int = 1,
+	):
+		self.nvdaAPIVersionsPath = nvdaAPIVersionsPath
+		self.sourceDir = sourceDir
+		self.addonCacheLimitBytes = addonCacheLimitBytes
+		self.jobs = jobs
+		self._signature = _inputSignature(nvdaAPIVersionsPath, sourceDir)
+		self.index = self._load()
+
+	def _load(self) -> AddonViewIndex:
+		index = AddonViewIndex.fromDatastore(
+			self.nvdaAPIVersionsPath, self.sourceDir, self.addonCacheLimitBytes, self.jobs
+		)
+		log.info(f"Loaded add-ons from {self.sourceDir}")
+		return index
+
+	def reloadIfChanged(self) -> bool:
+		"""
+		Loads the datastore again if the input has changed since it was last loaded.
+		Requests are answered from the previous index until the new index is loaded.
+		If the new input can't be loaded, the error is logged and the previous index is kept.
+		Returns True if the index was replaced.
+		"""
+		signature = _inputSignature(self.nvdaAPIVersionsPath, self.sourceDir)
+		if signature == self._signature:
+			return False
+		try:
+			index = self._load()
+		except Exception:
+			log.exception(f"Failed to reload add-ons from {self.sourceDir}, serving the previous views")
+			return False
+		finally:
+			self._signature = signature
+		self.index = index
+		return True
+
+	def query(self, path: str) -> Optional[bytes]:
+		"""
+		Returns the view written to path by the transformation, or None if there is no view at path.
+		"""
+		parts = path.strip("/").split("/")
+		if not parts[-1].endswith(".json"):
+			return None
+		parts[-1] = parts[-1][:-len(".json")]
+		index = self.index
+		if len(parts) == 3:
+			language, apiVersion, channel = parts
+			return index.aggregateData(language, apiVersion, channel)
+		if len(parts) == 4:
+			language, apiVersion, addonId, channel = parts
+			return index.viewData(language, apiVersion, channel, addonId)
+		return None
+
+
+def _etagMatches(etag: str, ifNoneMatch: Optional[str]) -> bool:
+	"""
+	Whether an If-None-Match header matches the ETag of a view, using the weak comparison of RFC 9110.
+	"""
+	if ifNoneMatch is None:
+		return False
+	if ifNoneMatch.strip() == "*":
+		return True
+	for tag in ifNoneMatch.split(","):
+		tag = tag.strip()
+		if tag.startswith("W/"):
+			tag = tag[len("W/"):]
+		if tag == etag:
+			return True
+	return False
+
+
+def _requestHandler(service: ViewService):
+	class ViewRequestHandler(BaseHTTPRequestHandler):
+		def do_GET(self):
+			self._sendView(includeBody=True)
+
+		def do_HEAD(self):
+			self._sendView(includeBody=False)
+
+		def _sendView(self, includeBody: bool) -> None:
+			# Add-on IDs may be percent-encoded in the request path.
+			data = service.query(unquote(urlsplit(self.path).path))
+			if data is None:
+				self.send_error(HTTPStatus.NOT_FOUND)
+				return
+			etag = f'"{hashlib.sha256(data).hexdigest()}"'
+			if _etagMatches(etag, self.headers.get("If-None-Match")):
+				self.send_response(HTTPStatus.NOT_MODIFIED)
+				self.send_header("ETag", etag)
+				self.end_headers()
+				return
+			self.send_response(HTTPStatus.OK)
+			self.send_header("ETag", etag)
+			self.send_header("Content-Type", "application/json")
+			self.send_header("Content-Length", str(len(data)))
+			self.end_headers()
+			if includeBody:
+				self.wfile.write(data)
+
+		def log_message(self, format: str, *args) -> None:
+			log.debug(f"{self.address_string()} {format % args}")
+
+	return ViewRequestHandler
+
+
+def createServer(
+		service: ViewService,
+		host: str = DEFAULT_HOST,
+		port: int = DEFAULT_PORT,
+) -> ThreadingHTTPServer:
+	return ThreadingHTTPServer((host, port), _requestHandler(service))
+
+
+def serve(
+		service: ViewService,
+		host: str = DEFAULT_HOST,
+		port: int = DEFAULT_PORT,
+		pollIntervalSeconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+) -> None:
+	"""
+	Answers requests until interrupted, checking for changed input every pollIntervalSeconds.
+	"""
+	stopped = threading.Event()
+
+	def pollInput():
+		while not stopped.wait(pollIntervalSeconds):
+			if service.reloadIfChanged():
+				log.info("Input changed, views reloaded")
+
+	poller = threading.Thread(target=pollInput, name="inputPoller", daemon=True)
+	with createServer(service, host, port) as server:
+		poller.start()
+		log.info(f"Serving views at http://{host}:{server.server_address[1]}/")
+		try:
+			server.serve_forever()
+		except KeyboardInterrupt:
+			pass
+		finally:
+			stopped.set()
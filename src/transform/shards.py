@@ -0,0 +1,140 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Shards the transformation by add-on ID, so a full rebuild can be spread across processes or machines.
+
+The selection and views of an add-on only depend on its own versions, so each shard selects and writes
+the add-ons whose IDs hash to it.
+Add-on IDs are hashed in lower case, matching the CaseInsensitiveDict used to select add-ons,
+so versions of an add-on submitted with different casing are in the same shard.
+Each shard only writes views for the languages its add-ons are translated to,
+and records them in a shard manifest, so the merge can write the other languages, see the merge module.
+"""
+
+import hashlib
+import json
+import os
+from typing import (
+	Dict,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Tuple,
+)
+
+from .addonDataCache import AddonDataCache
+from .datastructures import WriteableAddons
+from .views import (
+	iterAddonViews,
+	iterSelectedAddons,
+)
+
+SHARD_MANIFEST_FILENAME = ".shard.json"
+# When English is a supported language, the English views of add-ons with an English translation
+# are translated, so the untranslated views which other languages fall back to are kept here for the merge.
+ENGLISH_FALLBACK_DIRNAME = ".english"
+
+
+def shardIndex(addonId: str, count: int) -> int:
+	"""
+	The shard of an add-on ID, from 1 to count.
+	The hash is stable across processes and machines.
+	"""
+	digest = hashlib.sha256(addonId.lower().encode("utf-8")).digest()
+	return int.from_bytes(digest[:8], "big") % count + 1
+
+
+class Shard(NamedTuple):
+	index: int  # From 1 to count
+	count: int
+
+	@classmethod
+	def parse(cls, value: str) -> "Shard":
+		"""
+		Parses a shard written as index/count, e.g. 2/4 for the second of four shards.
+		"""
+		indexPart, separator, countPart = value.partition("/")
+		try:
+			shard = cls(int(indexPart), int(countPart))
+		except ValueError:
+			raise ValueError(f"Expected a shard as index/count, e.g. 1/4, got {value!r}") from None
+		if not separator or not 1 <= shard.index <= shard.count:
+			raise ValueError(f"Expected a shard as index/count with an index from 1 to count, got {value!r}")
+		return shard
+
+	def contains(self, addonId: str) -> bool:
+		return shardIndex(addonId, self.count) == self.index
+
+	def __str__(self) -> str:
+		return f"{self.index}/{self.count}"
+
+
+def hashNvdaAPIVersions(nvdaAPIVersionsPath: str) -> str:
+	with open(nvdaAPIVersionsPath, "rb") as nvdaAPIVersionsFile:
+		return hashlib.sha256(nvdaAPIVersionsFile.read()).hexdigest()
+
+
+def iterEnglishFallbackFiles(
+		addons: WriteableAddons,
+		addonDataCache: Optional[AddonDataCache] = None,
+) -> Iterator[Tuple[str, bytes]]:
+	"""
+	Yields (path, data) for the untranslated English view of each add-on, under ENGLISH_FALLBACK_DIRNAME.
+	"""
+	for view in iterAddonViews(addons, set(), addonDataCache):
+		yield f"{ENGLISH_FALLBACK_DIRNAME}/{view.apiVersion}/{view.addonId}/{view.channel}.json", view.data
+
+
+def latestViewKey(addonId: str, channel: str) -> str:
+	return f"{addonId}/{channel}"
+
+
+def getLatestAPIVersions(addons: WriteableAddons) -> Dict[str, str]:
+	"""
+	Maps the latestViewKey of each latest view to the newest API version its add-on version is selected for,
+	which is the same for every language.
+	"""
+	return {
+		latestViewKey(addonId, channel): str(nvdaAPIVersions[0])
+		for nvdaAPIVersions, addonId, channel, _addon, addLatest in iterSelectedAddons(addons)
+		if addLatest
+	}
+
+
+class ShardManifest(NamedTuple):
+	"""
+	Written to the output directory of a shard.
+	languages are the supported languages of the shard's add-ons,
+	and the NVDA API versions hash confirms every shard used the same NVDA API versions.
+	latestAPIVersions are the API versions of the latest views, see getLatestAPIVersions.
+	"""
+	shard: Shard
+	languages: List[str]
+	nvdaAPIVersionsHash: str
+	latestAPIVersions: Dict[str, str]
+
+	def save(self, outputDir: str) -> None:
+		with open(os.path.join(outputDir, SHARD_MANIFEST_FILENAME), "w", encoding="utf-8") as manifestFile:
+			json.dump({
+				"shard": str(self.shard),
+				"languages": sorted(self.languages),
+				"nvdaAPIVersionsHash": self.nvdaAPIVersionsHash,
+				"latestAPIVersions": dict(sorted(self.latestAPIVersions.items())),
+			}, manifestFile, indent="\t")
+
+	@classmethod
+	def load(cls, outputDir: str) -> "ShardManifest":
+		"""
+		Raises a FileNotFoundError if outputDir isn't the output of a shard.
+		"""
+		with open(os.path.join(outputDir, SHARD_MANIFEST_FILENAME), "r", encoding="utf-8") as manifestFile:
+			data = json.load(manifestFile)
+		return cls(
+			Shard.parse(data["shard"]),
+			data["languages"],
+			data["nvdaAPIVersionsHash"],
+			data["latestAPIVersions"],
+		)
@@ -0,0 +1,344 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Output sinks for the views of a transformation.
+Views are written to a directory tree by a ViewWriter, to a single tar or zip archive by an ArchiveSink,
+or to a SQLite database by a SQLiteSink.
+"""
+
+from collections import deque
+from concurrent.futures import (
+	Future,
+	ThreadPoolExecutor,
+)
+from enum import Enum
+import io
+import logging
+import os
+import sqlite3
+import tarfile
+from typing import (
+	Deque,
+	Dict,
+	List,
+	Optional,
+	Tuple,
+)
+import zipfile
+
+from .aggregates import parseAggregatePath
+from .datastructures import (
+	LATEST_VIEW,
+	parseViewPath,
+	ViewKind,
+)
+from .writer import (
+	compressView,
+	COMPRESSED_SUFFIX,
+	DEFAULT_WRITE_QUEUE_SIZE,
+	DEFAULT_WRITERS,
+	LinkMode,
+	ViewSink,
+	ViewWriter,
+)
+
+# Archive entries have a fixed modification time, so identical views produce identical archives.
+# Zip archives can't represent times before 1980.
+ZIP_ENTRY_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ARCHIVE_ENTRY_MODE = 0o644
+
+log = logging.getLogger()
+
+
+class OutputFormat(str, Enum):
+	DIRECTORY = "directory"
+	TAR = "tar"
+	ZIP = "zip"
+	SQLITE = "sqlite"
+
+
+class ArchiveSink(ViewSink):
+	"""
+	Writes views as the entries of a single tar or zip archive at archivePath.
+	Entries are streamed to the archive as the views are written, in the order they are generated,
+	which is the same for the same input, so identical views produce identical archives.
+	If a compressLevel is given, a gzip compressed copy of each view is added after it,
+	compressed by workers threads.
+	Up to queueSize views are held while they are compressed.
+	"""
+
+	def __init__(
+			self,
+			archivePath: str,
+			archiveFormat: OutputFormat,
+			workers: int = DEFAULT_WRITERS,
+			compressLevel: Optional[int] = None,
+			queueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+	):
+		if archiveFormat not in (OutputFormat.TAR, OutputFormat.ZIP):
+			raise ValueError(f"Unsupported archive format {archiveFormat}")
+		if os.path.lexists(archivePath):
+			raise FileExistsError(f"{archivePath} already exists")
+		self.archivePath = archivePath
+		self.archiveFormat = OutputFormat(archiveFormat)
+		self.compressLevel = compressLevel
+		self.queueSize = queueSize
+		self.filesWritten = 0
+		self.bytesWritten = 0
+		self._closed = False
+		# Views waiting for their compressed copy, oldest first.
+		self._pending: Deque[Tuple[str, bytes, Future]] = deque()
+		self._executor = ThreadPoolExecutor(workers) if compressLevel is not None else None
+		os.makedirs(os.path.dirname(os.path.abspath(archivePath)), exist_ok=True)
+		if self.archiveFormat is OutputFormat.TAR:
+			self._archive = tarfile.open(archivePath, "x", format=tarfile.PAX_FORMAT)
+		else:
+			self._archive = zipfile.ZipFile(archivePath, "x", compression=zipfile.ZIP_DEFLATED)
+
+	def write(
+			self,
+			path: str,
+			data: bytes,
+			kind: ViewKind = ViewKind.ADDON,
+			latestAPIVersion: Optional[str] = None,
+	) -> None:
+		if self._closed:
+			raise RuntimeError("ArchiveSink is closed")
+		if self._executor is None:
+			self._addEntry(path, data)
+			return
+		self._pending.append((path, data, self._executor.submit(compressView, data, self.compressLevel)))
+		if len(self._pending) > self.queueSize:
+			self._addPending()
+
+	def close(self) -> None:
+		if self._closed:
+			return
+		try:
+			while self._pending:
+				self._addPending()
+		except Exception:
+			self.discard()
+			raise
+		self._closed = True
+		if self._executor is not None:
+			self._executor.shutdown()
+		self._archive.close()
+
+	def discard(self) -> None:
+		"""
+		Removes the partial archive.
+		"""
+		if self._closed:
+			return
+		self._closed = True
+		self._pending.clear()
+		if self._executor is not None:
+			self._executor.shutdown()
+		try:
+			self._archive.close()
+		finally:
+			os.remove(self.archivePath)
+
+	def _addPending(self) -> None:
+		path, data, compressedView = self._pending.popleft()
+		self._addEntry(path, data)
+		self._addEntry(f"{path}{COMPRESSED_SUFFIX}", compressedView.result())
+
+	def _addEntry(self, path: str, data: bytes) -> None:
+		if self.archiveFormat is OutputFormat.TAR:
+			entryInfo = tarfile.TarInfo(path)
+			entryInfo.size = len(data)
+			entryInfo.mtime = 0
+			entryInfo.mode = ARCHIVE_ENTRY_MODE
+			self._archive.addfile(entryInfo, io.BytesIO(data))
+		else:
+			entryInfo = zipfile.ZipInfo(path, date_time=ZIP_ENTRY_DATE_TIME)
+			entryInfo.external_attr = ARCHIVE_ENTRY_MODE << 16
+			# Compressed views are stored as is, deflating them again would only cost time.
+			if path.endswith(COMPRESSED_SUFFIX):
+				entryInfo.compress_type = zipfile.ZIP_STORED
+			else:
+				entryInfo.compress_type = zipfile.ZIP_DEFLATED
+			self._archive.writestr(entryInfo, data)
+		self.filesWritten += 1
+		self.bytesWritten += len(data)
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE documents (
+	id INTEGER PRIMARY KEY,
+	data BLOB NOT NULL
+);
+CREATE TABLE views (
+	language TEXT NOT NULL,
+	apiVer TEXT NOT NULL,
+	channel TEXT NOT NULL,
+	addonId TEXT NOT NULL,
+	isLatest INTEGER NOT NULL,
+	documentId INTEGER NOT NULL REFERENCES documents (id),
+	PRIMARY KEY (language, apiVer, channel, addonId, isLatest)
+) WITHOUT ROWID;
+CREATE TABLE aggregates (
+	language TEXT NOT NULL,
+	apiVer TEXT NOT NULL,
+	channel TEXT NOT NULL,
+	documentId INTEGER NOT NULL REFERENCES documents (id),
+	PRIMARY KEY (language, apiVer, channel)
+) WITHOUT ROWID;
+"""
+# Created after the rows are inserted, which is faster than updating them for each row.
+SQLITE_INDEXES = """
+CREATE INDEX viewsByAddon ON views (addonId, channel, language, apiVer);
+CREATE INDEX viewsByDocument ON views (documentId);
+"""
+
+
+def _sqlStatements(script: str) -> List[str]:
+	return [statement.strip() for statement in script.split(";") if statement.strip()]
+
+
+class SQLiteSink(ViewSink):
+	"""
+	Writes views to a new SQLite database at databasePath.
+	Each unique document is stored once in the documents table.
+	The views table has a row for each add-on view, keyed by (language, apiVer, channel, addonId, isLatest).
+	A latest view has isLatest set, and the newest API version its add-on version is selected for as apiVer,
+	so it is also a row of that API version.
+	Aggregate views are stored in the aggregates table, keyed by (language, apiVer, channel).
+	Rows are inserted in sorted path order in a single transaction when the sink is closed,
+	so identical views produce an identical database.
+	If the sink is discarded, the views are dropped and no database is created.
+	"""
+
+	def __init__(self, databasePath: str):
+		if os.path.lexists(databasePath):
+			raise FileExistsError(f"{databasePath} already exists")
+		self.databasePath = databasePath
+		self.filesWritten = 0
+		self.bytesWritten = 0
+		self.documentsWritten = 0
+		# The data, kind and latest API version of each view.
+		self._views: Dict[str, Tuple[bytes, ViewKind, Optional[str]]] = {}
+		self._closed = False
+
+	def write(
+			self,
+			path: str,
+			data: bytes,
+			kind: ViewKind = ViewKind.ADDON,
+			latestAPIVersion: Optional[str] = None,
+	) -> None:
+		if self._closed:
+			raise RuntimeError("SQLiteSink is closed")
+		if kind is ViewKind.ETAG_MANIFEST:
+			raise ValueError("ETag manifests are not supported for sqlite output")
+		if kind is ViewKind.ADDON and (latestAPIVersion is None) != (parseViewPath(path)[1] != LATEST_VIEW):
+			raise ValueError(f"The latest API version is required for latest views, and only latest views: {path}")
+		self._views[path] = (data, kind, latestAPIVersion)
+
+	def close(self) -> None:
+		if self._closed:
+			return
+		self._closed = True
+		documentIds: Dict[bytes, int] = {}
+		viewRows: List[Tuple[str, str, str, str, int, int]] = []
+		aggregateRows: List[Tuple[str, str, str, int]] = []
+		for path in sorted(self._views):
+			data, kind, latestAPIVersion = self._views[path]
+			documentId = documentIds.setdefault(data, len(documentIds) + 1)
+			if kind is ViewKind.AGGREGATE:
+				language, apiVersion, channel = parseAggregatePath(path)
+				aggregateRows.append((language, apiVersion, channel, documentId))
+			else:
+				language, apiVersion, addonId, channel = parseViewPath(path)
+				isLatest = latestAPIVersion is not None
+				if isLatest:
+					apiVersion = latestAPIVersion
+				viewRows.append((language, apiVersion, channel, addonId, int(isLatest), documentId))
+		self._views.clear()
+		os.makedirs(os.path.dirname(os.path.abspath(self.databasePath)), exist_ok=True)
+		# Transactions are managed here, so the schema, rows and indexes are created in one transaction.
+		connection = sqlite3.connect(self.databasePath, isolation_level=None)
+		try:
+			# The database is new, so it is removed rather than recovered if writing fails.
+			connection.execute("PRAGMA journal_mode = OFF")
+			connection.execute("PRAGMA synchronous = OFF")
+			connection.execute("BEGIN")
+			for statement in _sqlStatements(SQLITE_SCHEMA):
+				connection.execute(statement)
+			connection.executemany(
+				"INSERT INTO documents (id, data) VALUES (?, ?)",
+				((documentId, data) for data, documentId in documentIds.items()),
+			)
+			connection.executemany("INSERT INTO views VALUES (?, ?, ?, ?, ?, ?)", viewRows)
+			connection.executemany("INSERT INTO aggregates VALUES (?, ?, ?, ?)", aggregateRows)
+			for statement in _sqlStatements(SQLITE_INDEXES):
+				connection.execute(statement)
+			connection.execute("COMMIT")
+		except Exception:
+			connection.close()
+			os.remove(self.databasePath)
+			raise
+		connection.close()
+		self.filesWritten = len(viewRows) + len(aggregateRows)
+		self.documentsWritten = len(documentIds)
+		self.bytesWritten = sum(len(data) for data in documentIds)
+
+	def discard(self) -> None:
+		self._closed = True
+		self._views.clear()
+
+	def logSummary(self) -> None:
+		log.info(
+			f"Wrote {self.filesWritten} views of {self.documentsWritten} unique documents, "
+			f"{self.bytesWritten} bytes, to {self.databasePath}"
+		)
+
+
+def checkSinkOptions(
+		outputFormat: OutputFormat,
+		writers: int = DEFAULT_WRITERS,
+		linkMode: Optional[LinkMode] = None,
+		compressLevel: Optional[int] = None,
+) -> None:
+	"""
+	Raises a ValueError if the options are not supported for outputFormat.
+	Called before the output is created, so an invalid option doesn't leave an empty output behind.
+	"""
+	outputFormat = OutputFormat(outputFormat)
+	if writers < 1:
+		raise ValueError(f"At least one writer is required, got {writers}")
+	if compressLevel is not None and not 0 <= compressLevel <= 9:
+		raise ValueError(f"The compression level must be between 0 and 9, got {compressLevel}")
+	if outputFormat is not OutputFormat.DIRECTORY and linkMode is not None:
+		raise ValueError(f"Deduplicating with links is not supported for {outputFormat.value} output")
+	if outputFormat is OutputFormat.SQLITE and compressLevel is not None:
+		raise ValueError("Compressed copies are not supported for sqlite output")
+
+
+def openViewSink(
+		outputFormat: OutputFormat,
+		outputPath: str,
+		writers: int = DEFAULT_WRITERS,
+		writeQueueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+		linkMode: Optional[LinkMode] = None,
+		contentStore: Optional[str] = None,
+		compressLevel: Optional[int] = None,
+) -> ViewSink:
+	"""
+	Creates the sink for outputFormat.
+	For directory output, outputPath is the output directory,
+	otherwise it is the path of the archive or database to create.
+	Deduplicating with links is only supported for directory output.
+	Compressed copies are not supported for SQLite output.
+	"""
+	outputFormat = OutputFormat(outputFormat)
+	checkSinkOptions(outputFormat, writers, linkMode, compressLevel)
+	if outputFormat is OutputFormat.DIRECTORY:
+		return ViewWriter(outputPath, writers, writeQueueSize, linkMode, contentStore, compressLevel)
+	if outputFormat is OutputFormat.SQLITE:
+		return SQLiteSink(outputPath)
+	return ArchiveSink(outputPath, outputFormat, writers, compressLevel, writeQueueSize)
@@ -0,0 +1,181 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Input sources for the transformation, which read the add-on files of a datastore
+from a directory, or from a tar or zip archive without extracting it.
+
+The pathToData of an archive member is <archivePath>!<memberName>,
+so add-on files can be read again by path while views are written.
+A source path may also name a directory within an archive, e.g. datastore.zip!addons.
+"""
+
+import glob
+import os
+import tarfile
+import threading
+from typing import (
+	Dict,
+	List,
+	Optional,
+	Tuple,
+)
+import zipfile
+
+ARCHIVE_MEMBER_SEPARATOR = "!"
+_COMPRESSED_TAR_SUFFIXES = (".tar.gz", ".tgz")
+ARCHIVE_SUFFIXES = (".zip", ".tar") + _COMPRESSED_TAR_SUFFIXES
+
+
+def splitArchivePath(path: str) -> Tuple[Optional[str], str]:
+	"""
+	Returns (archivePath, memberName) for a path within an archive, or (None, path) for other paths.
+	A directory with an archive suffix isn't an archive.
+	"""
+	archivePath, _separator, memberName = path.partition(ARCHIVE_MEMBER_SEPARATOR)
+	if not archivePath.lower().endswith(ARCHIVE_SUFFIXES) or not os.path.isfile(archivePath):
+		return None, path
+	return archivePath, memberName.strip("/")
+
+
+def isArchiveSource(sourcePath: str) -> bool:
+	return splitArchivePath(sourcePath)[0] is not None
+
+
+def _fileSignature(path: str) -> Tuple[int, int]:
+	stat = os.stat(path)
+	return stat.st_size, stat.st_mtime_ns
+
+
+class ArchiveReader:
+	"""
+	Reads the .json members of a tar or zip archive without extracting them.
+	Members of zip and uncompressed tar archives are read from the archive when requested.
+	A compressed tar archive can only be read in order, so its .json members are read into memory when opened.
+	Reads are safe to use from multiple threads.
+	"""
+
+	def __init__(self, archivePath: str):
+		self.archivePath = archivePath
+		self.signature = _fileSignature(archivePath)
+		self._lock = threading.Lock()
+		self._zip: Optional[zipfile.ZipFile] = None
+		self._tar: Optional[tarfile.TarFile] = None
+		self._tarMembers: Dict[str, tarfile.TarInfo] = {}
+		self._data: Dict[str, bytes] = {}
+		if archivePath.lower().endswith(".zip"):
+			self._zip = zipfile.ZipFile(archivePath)
+			memberNames = [name for name in self._zip.namelist() if name.endswith(".json")]
+		elif archivePath.lower().endswith(_COMPRESSED_TAR_SUFFIXES):
+			with tarfile.open(archivePath, "r|*") as tar:
+				for member in tar:
+					if member.isfile() and member.name.endswith(".json"):
+						self._data[_normaliseMemberName(member.name)] = tar.extractfile(member).read()
+			memberNames = list(self._data)
+		else:
+			self._tar = tarfile.open(archivePath, "r:")
+			for member in self._tar:
+				if member.isfile() and member.name.endswith(".json"):
+					self._tarMembers[_normaliseMemberName(member.name)] = member
+			memberNames = list(self._tarMembers)
+		self.memberNames: List[str] = sorted(memberNames)
+
+	def read(self, memberName: str) -> bytes:
+		data = self._data.get(memberName)
+		if data is not None:
+			return data
+		with self._lock:
+			if self._zip is not None:
+				try:
+					return self._zip.read(memberName)
+				except KeyError:
+					pass
+			elif memberName in self._tarMembers:
+				return self._tar.extractfile(self._tarMembers[memberName]).read()
+		raise FileNotFoundError(f"{memberName} is not in {self.archivePath}")
+
+	def close(self) -> None:
+		with self._lock:
+			if self._zip is not None:
+				self._zip.close()
+			if self._tar is not None:
+				self._tar.close()
+
+
+def _normaliseMemberName(name: str) -> str:
+	# Archives created from the root of a directory, e.g. with "tar -C addons .", prefix members with "./".
+	while name.startswith("./"):
+		name = name[2:]
+	return name
+
+
+class ArchiveRegistry:
+	"""
+	Opens each archive once per process, and again if it has changed,
+	so members can be read by their pathToData.
+	"""
+
+	def __init__(self):
+		self._readers: Dict[str, ArchiveReader] = {}
+		self._lock = threading.Lock()
+
+	def get(self, archivePath: str) -> ArchiveReader:
+		key = os.path.normcase(os.path.abspath(archivePath))
+		with self._lock:
+			reader = self._readers.get(key)
+			if reader is not None and reader.signature != _fileSignature(archivePath):
+				reader.close()
+				reader = None
+			if reader is None:
+				reader = self._readers[key] = ArchiveReader(archivePath)
+			return reader
+
+	def clear(self) -> None:
+		with self._lock:
+			for reader in self._readers.values():
+				reader.close()
+			self._readers.clear()
+
+
+archiveRegistry = ArchiveRegistry()
+
+
+def listInputFiles(sourcePath: str) -> List[str]:
+	"""
+	The pathToData of each add-on file, <addonId>/<version>.json, in a directory or archive, in path order.
+	"""
+	archivePath, memberName = splitArchivePath(sourcePath)
+	if archivePath is None:
+		return sorted(glob.glob(f"{sourcePath}/**/*.json"))
+	prefix = f"{memberName}/" if memberName else ""
+	return [
+		f"{archivePath}{ARCHIVE_MEMBER_SEPARATOR}{name}"
+		for name in archiveRegistry.get(archivePath).memberNames
+		# Matches the directory glob, which skips hidden files and directories.
+		if name.startswith(prefix)
+		and name.count("/", len(prefix)) == 1
+		and not any(part.startswith(".") for part in name[len(prefix):].split("/"))
+	]
+
+
+def readInputBytes(pathToData: str) -> bytes:
+	"""
+	The content of the add-on file at pathToData, in a directory or archive.
+	"""
+	archivePath, memberName = splitArchivePath(pathToData)
+	if archivePath is None:
+		with open(pathToData, "rb") as addonFile:
+			return addonFile.read()
+	return archiveRegistry.get(archivePath).read(memberName)
+
+
+def readInputData(pathToData: str) -> str:
+	"""
+	The text of the add-on file at pathToData, in a directory or archive.
+	"""
+	archivePath, _memberName = splitArchivePath(pathToData)
+	if archivePath is None:
+		with open(pathToData, "r", encoding="utf-8") as addonFile:
+			return addonFile.read()
+	return readInputBytes(pathToData).decode("utf-8")
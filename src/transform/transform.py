@@ -1,28 +1,89 @@
-# Copyright (C) 2021-2023 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
-import glob
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import json
 import logging
+import os
 from pathlib import Path
 from typing import (
 	Dict,
 	Iterable,
+	Iterator,
+	NamedTuple,
+	Optional,
 	Set,
 	Tuple,
 )
+from .addonDataCache import (
+	AddonDataCache,
+	DEFAULT_CACHE_LIMIT_BYTES,
+)
+from .aggregates import AggregateCollector
 from .datastructures import (
 	Addon,
+	AddonChannelDict,
 	generateAddonChannelDict,
 	MajorMinorPatch,
 	VersionCompatibility,
+	ViewKind,
 	WriteableAddons
 )
+from .etags import ETagCollector
+from .explain import (
+	DecisionTrace,
+	explainSelection,
+)
+from .instrumentation import (
+	RunReport,
+	timedPhase,
+)
+from .overlay import (
+	iterOverlayViews,
+	OutputLayout,
+)
+from .selection import (
+	apiVersionClasses,
+	groupAddons,
+	selectLatestAddons,
+	SortedAPIVersions,
+)
+from .shards import (
+	getLatestAPIVersions,
+	hashNvdaAPIVersions,
+	iterEnglishFallbackFiles,
+	Shard,
+	ShardManifest,
+)
+from .sinks import (
+	checkSinkOptions,
+	openViewSink,
+	OutputFormat,
+)
+from .sources import (
+	isArchiveSource,
+	listInputFiles,
+	readInputData,
+)
+from .writer import (
+	DEFAULT_WRITE_QUEUE_SIZE,
+	DEFAULT_WRITERS,
+	LinkMode,
+	ViewSink,
+	ViewWriter,
+)
+from .views import (
+	groupAPIVersionClasses,
+	iterAddonViews,
+)
 from src.validate.validate import (
 	ValidationError,
+	ValidatorCacheInfo,
 	validateJson,
 	JSONSchemaPaths,
+	validatorRegistry,
 )
 
 log = logging.getLogger()
@@ -38,147 +99,213 @@ def _isAddonCompatible(addon: Addon, nvdaAPIVersion: VersionCompatibility) -> bo
 	)
 
 
-def _isAddonNewer(addons: Dict[str, Addon], addon: Addon) -> bool:
+def getSupportedLanguages(
+		addons: WriteableAddons,
+		addonDataCache: Optional[AddonDataCache] = None,
+) -> Set[str]:
 	"""
-	Confirms that a given addon is newer than the most recent version of that addon in the addons dict.
+	The languages of the translations of the selected add-ons.
+	Translations are loaded through addonDataCache, which caches the source documents for writing views.
 	"""
-	_addonVersionNotAlreadyAdded(addons, addon)
-	return addon.addonId not in addons or addon.addonVersion > addons[addon.addonId].addonVersion
-
-
-def _addonVersionNotAlreadyAdded(addons: Dict[str, Addon], addon: Addon) -> True:
-	"""
-	Throws an exception if an addon with that version has already been added to addons.
-	"""
-	if addon.addonId in addons and addon.addonVersion == addons[addon.addonId].addonVersion:
-		raise ValueError(f"Addon {addon.addonId} {addon.addonVersion} already added to addons dictionary")
-	return True
-
-
-def getSupportedLanguages(addons: WriteableAddons) -> Set[str]:
+	if addonDataCache is None:
+		addonDataCache = AddonDataCache()
 	supportedLanguages: Set[str] = set()
 	for apiVersion in addons:
 		for channel in addons[apiVersion]:
-			for addonId in addons[apiVersion][channel]:
-				supportedLanguages.update({t["language"] for t in addons[apiVersion][channel][addonId].translations})
+			for addon in addons[apiVersion][channel].values():
+				supportedLanguages.update({t["language"] for t in addonDataCache.loadTranslations(addon)})
 	return supportedLanguages
 
 
-def getLatestAddons(addons: Iterable[Addon], nvdaAPIVersions: Tuple[VersionCompatibility]) -> WriteableAddons:
+def getLatestAddons(
+		addons: Iterable[Addon],
+		nvdaAPIVersions: Tuple[VersionCompatibility],
+		trace: Optional[DecisionTrace] = None,
+) -> WriteableAddons:
 	"""
 	Given a set of addons and NVDA versions, create a dictionary mapping each nvdaAPIVersion and channel
 	to the newest compatible addon.
+	Throws a ValueError if two compatible addons have the same version.
+	Add-ons are selected once for each class of API versions which select the same add-ons,
+	and each API version of a class is given a copy of the selection, see groupAPIVersionClasses.
+	If a trace is given, the selection for each API version is explained in it.
 	"""
-	uniqueApiVersions = set(nvdaAPIVersion.apiVer for nvdaAPIVersion in nvdaAPIVersions)
-	latestAddons: WriteableAddons = dict(
-		(nvdaAPIVersion, generateAddonChannelDict())
-		for nvdaAPIVersion in uniqueApiVersions
+	apiVersions = SortedAPIVersions(nvdaAPIVersions)
+	groups = groupAddons(addons)
+	classes = apiVersionClasses(groups, apiVersions)
+	log.info(f"{len(apiVersions.apiVersions)} API versions select add-ons in {len(classes)} classes")
+	# The newest API version of each class is selected for.
+	representatives = SortedAPIVersions(
+		VersionCompatibility(apiVersions.apiVersions[members[0]], apiVersions.backCompatTo[members[0]])
+		for members in classes
+	)
+	classAddons: Dict[MajorMinorPatch, AddonChannelDict] = dict(
+		(apiVer, generateAddonChannelDict())
+		for apiVer in representatives.apiVersions
 	)
-	for addon in addons:
-		for nvdaAPIVersion in nvdaAPIVersions:
-			addonsForVersionChannel = latestAddons[nvdaAPIVersion.apiVer][addon.channel]
-			if (
-				_isAddonCompatible(addon, nvdaAPIVersion)
-				and _isAddonNewer(addonsForVersionChannel, addon)
-			):
-				addonsForVersionChannel[addon.addonId] = addon
-				log.error(f"added {addon.addonId} {addon.addonVersion}")
-			else:
-				log.error(f"ignoring {addon.addonId} {addon.addonVersion}")
+	for apiVer, addon in selectLatestAddons(groups, representatives):
+		classAddons[apiVer][addon.channel][addon.addonId] = addon
+	latestAddons: WriteableAddons = {}
+	for members in classes:
+		selectedAddons = classAddons[apiVersions.apiVersions[members[0]]]
+		for index in members:
+			latestAddons[apiVersions.apiVersions[index]] = {
+				channel: channelAddons.copy() for channel, channelAddons in selectedAddons.items()
+			}
+	latestAddons = dict(sorted(latestAddons.items()))
+	if trace is not None:
+		explainSelection(trace, groups.values(), apiVersions)
 	return latestAddons
 
 
-def writeAddons(addonDir: str, addons: WriteableAddons, supportedLanguages: Set[str]) -> None:
+class OutputFile(NamedTuple):
+	path: str
+	data: bytes
+	source: Optional[str]  # The input file of a view, None for an aggregate view
+	kind: ViewKind = ViewKind.ADDON
+	latestAPIVersion: Optional[str] = None  # See AddonView
+
+
+def iterOutputFiles(
+		addons: WriteableAddons,
+		supportedLanguages: Set[str],
+		addonDataCache: Optional[AddonDataCache] = None,
+		aggregate: bool = False,
+		report: Optional[RunReport] = None,
+		trace: Optional[DecisionTrace] = None,
+		layout: OutputLayout = OutputLayout.FULL,
+		etags: bool = False,
+) -> Iterator[OutputFile]:
+	"""
+	Yields each file written for a unique mapping of (nvdaAPIVersion, channel) -> addon,
+	followed by the aggregate views if aggregate is True,
+	and an ETag manifest for each (language, API version, channel) if etags is True.
+	Throws a ValidationError if writeable data does not match expected schema.
+	If a report is given, generating views is timed, and views are counted.
+	If a trace is given, the add-on version chosen for each latest view is explained in it.
+	With the overlay layout, base documents and translation overlays are generated instead of a document
+	for each language, see the overlay module.
+	"""
+	if (aggregate or etags) and layout == OutputLayout.OVERLAY:
+		raise ValueError("Aggregate views and ETag manifests are not supported with the overlay layout")
+	if layout == OutputLayout.OVERLAY:
+		views = iterOverlayViews(addons, supportedLanguages, addonDataCache, trace)
+	else:
+		views = iterAddonViews(addons, supportedLanguages, addonDataCache, trace)
+	if report is not None:
+		views = report.instrumentViews(views)
+	aggregates = AggregateCollector() if aggregate else None
+	etagManifests = ETagCollector() if etags else None
+	for view in views:
+		yield OutputFile(view.path, view.data, view.addon.pathToData, latestAPIVersion=view.latestAPIVersion)
+		if aggregates is not None:
+			aggregates.add(view)
+		if etagManifests is not None:
+			etagManifests.add(view.path, view.data)
+	if aggregates is not None:
+		for path, data in aggregates.iterAggregates():
+			yield OutputFile(path, data, None, ViewKind.AGGREGATE)
+			if etagManifests is not None:
+				etagManifests.add(path, data)
+	if etagManifests is not None:
+		for path, data in etagManifests.iterManifests():
+			yield OutputFile(path, data, None, ViewKind.ETAG_MANIFEST)
+
+
+def writeAddons(
+		addonDir: str,
+		addons: WriteableAddons,
+		supportedLanguages: Set[str],
+		addonDataCache: Optional[AddonDataCache] = None,
+		writer: Optional[ViewSink] = None,
+		aggregate: bool = False,
+		report: Optional[RunReport] = None,
+		trace: Optional[DecisionTrace] = None,
+		layout: OutputLayout = OutputLayout.FULL,
+		etags: bool = False,
+) -> None:
 	"""
 	Given a unique mapping of (nvdaAPIVersion, channel) -> addon, write the addons to file.
-	Throws a ValidationError and exits if writeable data does not match expected schema.
-	"""
-	writtenLatestAddonForChannel: Set[str] = set()
-	for nvdaAPIVersion in sorted(addons.keys(), reverse=True):
-		# To generate the 'latest view',
-		# check each api version, starting with the latest.
-		# For a given 'latest' addon write path,
-		# store the path when the path is first encountered.
-		# This ensures the latest path is returned.
-		for channel in addons[nvdaAPIVersion]:
-			for addonName in addons[nvdaAPIVersion][channel]:
-				addon = addons[nvdaAPIVersion][channel][addonName]
-				addonWritePath = f"{addonDir}/en/{str(nvdaAPIVersion)}/{addonName}"
-				with open(addon.pathToData, "r", encoding="utf-8") as oldAddonFile:
-					addonData: Dict = json.load(oldAddonFile)
-					if "translations" in addonData:
-						del addonData["translations"]
-				Path(addonWritePath).mkdir(parents=True, exist_ok=True)
-				with open(f"{addonWritePath}/{channel}.json", "w") as newAddonFile:
-					validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
-					json.dump(addonData, newAddonFile)
-
-				latestAddonWritePath = f"{addonDir}/en/latest/{addonName}"
-				Path(latestAddonWritePath).mkdir(parents=True, exist_ok=True)
-				# paths are case insensitive
-				# Identical add-on IDs may have different casing
-				# due to legacy add-on submissions.
-				# This can be removed when old submissions are given updated casing.
-				caseInsensitiveLatestAddonForChannel = f"{addonName.lower()}-{channel}".casefold()
-				addLatest = caseInsensitiveLatestAddonForChannel not in writtenLatestAddonForChannel
-				if addLatest:
-					log.error(f"Latest version: {addonName} {channel} {nvdaAPIVersion}")
-					writtenLatestAddonForChannel.add(caseInsensitiveLatestAddonForChannel)
-					with open(f"{latestAddonWritePath}/{channel}.json", "w") as latestAddonFile:
-						json.dump(addonData, latestAddonFile)
-
-				addonTranslations = {t["language"]: t for t in addon.translations}
-				translatedAddonData = addonData.copy()
-				for lang in supportedLanguages:
-					addonWritePath = f"{addonDir}/{lang}/{str(nvdaAPIVersion)}/{addonName}"
-					langWithoutLocale = lang.split("_")[0]
-					if lang in addonTranslations:
-						# update with translated version
-						translatedAddonData["displayName"] = addonTranslations[lang]["displayName"]
-						translatedAddonData["description"] = addonTranslations[lang]["description"]
-					elif langWithoutLocale in addonTranslations:
-						# fallback to lang without locale translated version
-						translatedAddonData["displayName"] = addonTranslations[langWithoutLocale]["displayName"]
-						translatedAddonData["description"] = addonTranslations[langWithoutLocale]["description"]
-					else:
-						# fallback and update to english
-						translatedAddonData["displayName"] = addonData["displayName"]
-						translatedAddonData["description"] = addonData["description"]
-					Path(addonWritePath).mkdir(parents=True, exist_ok=True)
-					with open(f"{addonWritePath}/{channel}.json", "w") as newAddonFile:
-						validateJson(translatedAddonData, JSONSchemaPaths.ADDON_DATA)
-						json.dump(translatedAddonData, newAddonFile)
-					if addLatest:
-						latestAddonWritePath = f"{addonDir}/{lang}/latest/{addonName}"
-						Path(latestAddonWritePath).mkdir(parents=True, exist_ok=True)
-						with open(f"{latestAddonWritePath}/{channel}.json", "w") as newAddonFile:
-							validateJson(translatedAddonData, JSONSchemaPaths.ADDON_DATA)
-							json.dump(translatedAddonData, newAddonFile)
-
-
-def readAddons(addonDir: str) -> Iterable[Addon]:
-	"""
-	Read addons from a directory and capture required data for processing.
+	Files are generated by iterOutputFiles, and written as they are generated.
+	Files are queued on writer, by default a ViewWriter for addonDir which is closed before returning.
+	If a report is given, queuing files is also timed.
+	To find the files that would be written without writing them, see the plan module.
+	"""
+	if (aggregate or etags) and layout == OutputLayout.OVERLAY:
+		raise ValueError("Aggregate views and ETag manifests are not supported with the overlay layout")
+	if writer is None:
+		with ViewWriter(addonDir) as writer:
+			writeAddons(
+				addonDir, addons, supportedLanguages, addonDataCache, writer, aggregate, report, trace, layout, etags
+			)
+		return
+	if report is not None:
+		writer = report.instrumentSink(writer)
+	outputFiles = iterOutputFiles(
+		addons, supportedLanguages, addonDataCache, aggregate, report, trace, layout, etags
+	)
+	for outputFile in outputFiles:
+		writer.write(outputFile.path, outputFile.data, outputFile.kind, outputFile.latestAPIVersion)
+
+
+def _readAddonFile(fileName: str, rawData: Optional[str] = None) -> Tuple[Optional[Addon], Optional[str]]:
+	"""
+	Reads and validates a single add-on file, or the rawData read from it.
+	Returns the add-on, or an error message if the file doesn't match the schema.
+	Runs in worker processes when reading in parallel, so errors are returned to be logged by the caller.
+	"""
+	if rawData is None:
+		rawData = readInputData(fileName)
+	addonData = json.loads(rawData)
+	try:
+		validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
+	except ValidationError as e:
+		return None, f"{fileName} doesn't match schema: {e}"
+	return Addon(
+		addonId=addonData["addonId"],
+		addonVersion=MajorMinorPatch(**addonData["addonVersionNumber"]),
+		pathToData=fileName,
+		channel=addonData["channel"],
+		minNvdaAPIVersion=MajorMinorPatch(**addonData["minNVDAVersion"]),
+		lastTestedVersion=MajorMinorPatch(**addonData["lastTestedVersion"]),
+		# Translations are loaded if the add-on version is selected, most versions never are.
+		translations=None,
+	), None
+
+
+def readAddons(addonDir: str, jobs: int = 1, report: Optional[RunReport] = None) -> Iterable[Addon]:
+	"""
+	Read addons from a directory or archive and capture required data for processing, see the sources module.
 	Works as a generator to minimize memory usage, as such, each use of iteration should call readAddons.
 	Skips addons and logs errors if the naming schema or json schema do not match what is expected.
+	When jobs is greater than 1, files are parsed and validated by that many worker processes.
+	Addons are yielded in path order either way.
+	If a report is given, the files read and rejected are counted.
 	"""
-	for fileName in glob.glob(f"{addonDir}/**/*.json"):
-		with open(fileName, "r", encoding="utf-8") as addonFile:
-			addonData = json.load(addonFile)
-		try:
-			validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
-		except ValidationError as e:
-			log.error(f"{fileName} doesn't match schema: {e}")
+	fileNames = listInputFiles(addonDir)
+	if jobs > 1 and len(fileNames) > 1:
+		chunkSize = max(1, min(256, len(fileNames) // (jobs * 4)))
+		# Archive members are read once by this process, rather than opening the archive in every worker.
+		rawData = map(readInputData, fileNames) if isArchiveSource(addonDir) else repeat(None)
+		with ProcessPoolExecutor(max_workers=jobs) as executor:
+			yield from _validAddons(executor.map(_readAddonFile, fileNames, rawData, chunksize=chunkSize), report)
+	else:
+		yield from _validAddons(map(_readAddonFile, fileNames), report)
+
+
+def _validAddons(
+		results: Iterable[Tuple[Optional[Addon], Optional[str]]],
+		report: Optional[RunReport],
+) -> Iterable[Addon]:
+	for addon, error in results:
+		if report is not None:
+			report.count("filesRead")
+		if error is not None:
+			log.error(error)
+			if report is not None:
+				report.count("filesRejected")
 			continue
-		yield Addon(
-			addonId=addonData["addonId"],
-			addonVersion=MajorMinorPatch(**addonData["addonVersionNumber"]),
-			pathToData=fileName,
-			channel=addonData["channel"],
-			minNvdaAPIVersion=MajorMinorPatch(**addonData["minNVDAVersion"]),
-			lastTestedVersion=MajorMinorPatch(**addonData["lastTestedVersion"]),
-			translations=addonData.get("translations", []),
-		)
+		yield addon
 
 
 def readnvdaAPIVersionInfo(pathToFile: str) -> Tuple[VersionCompatibility]:
@@ -196,15 +323,152 @@ def readnvdaAPIVersionInfo(pathToFile: str) -> Tuple[VersionCompatibility]:
 	)
 
 
-def runTransformation(nvdaAPIVersionsPath: str, sourceDir: str, outputDir: str) -> None:
+def runTransformation(
+		nvdaAPIVersionsPath: str,
+		sourceDir: str,
+		outputDir: str,
+		addonCacheLimitBytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+		jobs: int = 1,
+		writers: int = DEFAULT_WRITERS,
+		writeQueueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+		linkMode: Optional[LinkMode] = None,
+		contentStore: Optional[str] = None,
+		aggregate: bool = False,
+		compressLevel: Optional[int] = None,
+		outputFormat: OutputFormat = OutputFormat.DIRECTORY,
+		report: Optional[RunReport] = None,
+		trace: Optional[DecisionTrace] = None,
+		layout: OutputLayout = OutputLayout.FULL,
+		etags: bool = False,
+		shard: Optional[Shard] = None,
+) -> None:
 	"""
 	Performs the transformation of addon data described in the readme.
 	Takes addon data found in sourceDir that fits the schema and writes the transformed data to outputDir.
 	Uses the NVDA API Versions found in nvdaAPIVersionsPath.
+	Parsed source documents are cached up to addonCacheLimitBytes of source JSON.
+	Input is read and validated by jobs worker processes.
+	Output is written by writers threads, which drain a queue of up to writeQueueSize files.
+	If a linkMode is given, each unique file is written once to contentStore and linked into each view path.
+	If aggregate is True, an aggregate view is also written for each (language, API version, channel).
+	If a compressLevel is given, a gzip compressed copy of each file is written next to it.
+	If the outputFormat is an archive or database format, outputDir is the path of the file to write.
+	If a report is given, the time of each phase and the number of files read, validated and written
+	are recorded in it.
+	If a trace is given, the selection and latest view decisions are explained in it.
+	The layout determines whether a full document or a translation overlay is written for each language.
+	If etags is True, an ETag manifest is also written for each (language, API version, channel).
+	If a shard is given, only the views of the add-ons in the shard are written, with a shard manifest,
+	to be merged with the other shards, see the shards module.
 	"""
-	# Make sure the directory doesn't already exist so data isn't overwritten
-	Path(outputDir).mkdir(parents=True, exist_ok=False)
+	if shard is not None and (
+		aggregate or etags or compressLevel is not None
+		or layout != OutputLayout.FULL or outputFormat != OutputFormat.DIRECTORY
+	):
+		raise ValueError(
+			"A shard only writes the full views to a directory, "
+			"aggregate views, ETag manifests and compressed copies are written when merging the shards"
+		)
+	if (aggregate or etags) and layout == OutputLayout.OVERLAY:
+		raise ValueError("Aggregate views and ETag manifests are not supported with the overlay layout")
+	if outputFormat == OutputFormat.SQLITE and (layout == OutputLayout.OVERLAY or etags):
+		raise ValueError("The overlay layout and ETag manifests are not supported for sqlite output")
+	checkSinkOptions(outputFormat, writers, linkMode, compressLevel)
+	if outputFormat == OutputFormat.DIRECTORY:
+		# Make sure the directory doesn't already exist so data isn't overwritten
+		Path(outputDir).mkdir(parents=True, exist_ok=False)
+	elif os.path.lexists(outputDir):
+		raise FileExistsError(f"{outputDir} already exists")
 	nvdaAPIVersionInfo = readnvdaAPIVersionInfo(nvdaAPIVersionsPath)
-	latestAddons = getLatestAddons(readAddons(sourceDir), nvdaAPIVersionInfo)
-	supportedLanguages = getSupportedLanguages(latestAddons)
-	writeAddons(outputDir, latestAddons, supportedLanguages)
+	with timedPhase(report, "readAddons"):
+		addons = list(readAddons(sourceDir, jobs, report))
+	if shard is not None:
+		addons = [addon for addon in addons if shard.contains(addon.addonId)]
+		log.info(f"Selecting {len(addons)} add-on versions for shard {shard}")
+	with timedPhase(report, "selectAddons"):
+		latestAddons = getLatestAddons(addons, nvdaAPIVersionInfo, trace)
+	addonDataCache = AddonDataCache(addonCacheLimitBytes)
+	# Parses the source document of each selected add-on version, which is cached for writing its views.
+	with timedPhase(report, "loadTranslations"):
+		supportedLanguages = getSupportedLanguages(latestAddons, addonDataCache)
+	validationsBefore = validatorRegistry.cacheInfo()
+	with openViewSink(
+		outputFormat, outputDir, writers, writeQueueSize, linkMode, contentStore, compressLevel
+	) as sink:
+		writeAddons(
+			outputDir,
+			latestAddons,
+			supportedLanguages,
+			addonDataCache,
+			sink,
+			aggregate,
+			report,
+			trace,
+			layout,
+			etags,
+		)
+		if shard is not None and "en" in supportedLanguages:
+			for path, data in iterEnglishFallbackFiles(latestAddons, addonDataCache):
+				sink.write(path, data)
+		with timedPhase(report, "flushWrites"):
+			sink.close()
+	sink.logSummary()
+	logCacheInfo(addonDataCache)
+	if shard is not None:
+		ShardManifest(
+			shard,
+			sorted(supportedLanguages),
+			hashNvdaAPIVersions(nvdaAPIVersionsPath),
+			getLatestAPIVersions(latestAddons),
+		).save(outputDir)
+	if report is not None:
+		_countRun(report, latestAddons, sink, validationsBefore)
+
+
+def _countRun(
+		report: RunReport,
+		latestAddons: WriteableAddons,
+		sink: ViewSink,
+		validationsBefore: ValidatorCacheInfo,
+) -> None:
+	"""
+	Records the totals of a run in report.
+	Each file read is validated, in worker processes when reading in parallel.
+	Output documents are validated in this process while writing, by validators from the registry.
+	The API versions of each class, which share the selected add-ons, are recorded with the number of
+	add-ons selected for each class, which are only serialized once.
+	"""
+	validationsAfter = validatorRegistry.cacheInfo()
+	report.count("addonsSelected", sum(
+		len(channelAddons) for channels in latestAddons.values() for channelAddons in channels.values()
+	))
+	classes = groupAPIVersionClasses(latestAddons)
+	report.count("apiVersions", len(latestAddons))
+	report.count("apiVersionClasses", len(classes))
+	report.apiVersionClasses = [
+		[str(nvdaAPIVersion) for nvdaAPIVersion in nvdaAPIVersions]
+		for nvdaAPIVersions in classes
+	]
+	report.count("classAddonsSelected", sum(
+		len(channelAddons)
+		for nvdaAPIVersions in classes
+		for channelAddons in latestAddons[nvdaAPIVersions[0]].values()
+	))
+	report.count("inputDocumentsValidated", report.counts.get("filesRead", 0))
+	report.count("outputDocumentsValidated", (
+		validationsAfter.hits + validationsAfter.misses - validationsBefore.hits - validationsBefore.misses
+	))
+	report.count("filesWritten", sink.filesWritten)
+	report.count("bytesWritten", sink.bytesWritten)
+
+
+def logCacheInfo(addonDataCache: AddonDataCache) -> None:
+	addonDataCacheInfo = addonDataCache.cacheInfo()
+	log.info(
+		f"Add-on data cache: {addonDataCacheInfo.hits} hits, {addonDataCacheInfo.misses} misses, "
+		f"{addonDataCacheInfo.size} documents cached"
+	)
+	validatorCacheInfo = validatorRegistry.cacheInfo()
+	log.info(
+		f"Schema validator cache: {validatorCacheInfo.hits} hits, {validatorCacheInfo.misses} misses"
+	)
@@ -0,0 +1,170 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+An in-memory index of the views of the selected add-ons,
+for embedding the transformation without writing files.
+Views are generated when first requested, and are identical to the files written by the transformation.
+"""
+
+from functools import lru_cache
+import json
+import threading
+from typing import (
+	Dict,
+	Iterator,
+	List,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from .addonDataCache import (
+	AddonDataCache,
+	DEFAULT_CACHE_LIMIT_BYTES,
+)
+from .aggregates import buildAggregate
+from .datastructures import (
+	Addon,
+	AddonChannels,
+	LATEST_VIEW,
+	WriteableAddons,
+)
+from .transform import (
+	getLatestAddons,
+	getSupportedLanguages,
+	readAddons,
+	readnvdaAPIVersionInfo,
+)
+from .views import (
+	iterSelectedAddons,
+	resolveTranslationLanguage,
+	translateAddonData,
+)
+from .writer import serializeJson
+from src.validate.validate import (
+	JSONSchemaPaths,
+	validateJson,
+)
+
+# The number of serialized views and aggregates kept for repeated lookups.
+DEFAULT_VIEW_CACHE_SIZE = 4096
+
+
+class AddonViewIndex:
+	"""
+	The selected add-ons for each (API version, channel), including the latest view, indexed by add-on ID.
+	Add-on IDs are matched exactly, as they are in the paths written by the transformation.
+	Views are translated with the fallback rules of iterAddonViews and validated when first requested.
+	Lookups are safe to use from multiple threads.
+	"""
+
+	def __init__(
+			self,
+			addons: WriteableAddons,
+			supportedLanguages: Optional[Set[str]] = None,
+			addonDataCache: Optional[AddonDataCache] = None,
+			viewCacheSize: int = DEFAULT_VIEW_CACHE_SIZE,
+	):
+		self._addonDataCache = AddonDataCache() if addonDataCache is None else addonDataCache
+		if supportedLanguages is None:
+			supportedLanguages = getSupportedLanguages(addons, self._addonDataCache)
+		self.languages: Set[str] = supportedLanguages | {"en"}
+		self._addons: Dict[Tuple[str, AddonChannels], Dict[str, Addon]] = {}
+		for nvdaAPIVersions, addonName, channel, addon, addLatest in iterSelectedAddons(addons):
+			for nvdaAPIVersion in nvdaAPIVersions:
+				self._addons.setdefault((str(nvdaAPIVersion), channel), {})[addonName] = addon
+			if addLatest:
+				self._addons.setdefault((LATEST_VIEW, channel), {})[addonName] = addon
+		# The add-on data cache is shared by the threads using the index.
+		self._lock = threading.Lock()
+		self.viewData = lru_cache(maxsize=viewCacheSize)(self._viewData)
+		self.aggregateData = lru_cache(maxsize=viewCacheSize)(self._aggregateData)
+
+	@classmethod
+	def fromDatastore(
+			cls,
+			nvdaAPIVersionsPath: str,
+			sourceDir: str,
+			addonCacheLimitBytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+			jobs: int = 1,
+	) -> "AddonViewIndex":
+		"""
+		Reads and selects the add-ons in sourceDir for the NVDA API versions in nvdaAPIVersionsPath,
+		as runTransformation does.
+		"""
+		nvdaAPIVersionInfo = readnvdaAPIVersionInfo(nvdaAPIVersionsPath)
+		latestAddons = getLatestAddons(readAddons(sourceDir, jobs), nvdaAPIVersionInfo)
+		return cls(latestAddons, addonDataCache=AddonDataCache(addonCacheLimitBytes))
+
+	def addon(self, apiVersion: str, channel: AddonChannels, addonId: str) -> Optional[Addon]:
+		"""
+		The add-on version selected for the API version and channel, or None if there is none.
+		"""
+		return self._addons.get((apiVersion, channel), {}).get(addonId)
+
+	def addonIds(self, apiVersion: str, channel: AddonChannels) -> List[str]:
+		"""
+		The IDs of the add-ons in the view of an API version and channel, in the order of an aggregate view.
+		"""
+		channelAddons = self._addons.get((apiVersion, channel), {})
+		return sorted(channelAddons, key=lambda addonId: (addonId.casefold(), addonId))
+
+	def _viewData(
+			self,
+			language: str,
+			apiVersion: str,
+			channel: AddonChannels,
+			addonId: str,
+	) -> Optional[bytes]:
+		"""
+		The view written to <language>/<apiVersion>/<addonId>/<channel>.json, or None if there is no view.
+		"""
+		addon = self.addon(apiVersion, channel, addonId)
+		if addon is None or language not in self.languages:
+			return None
+		with self._lock:
+			addonTranslations = {t["language"]: t for t in self._addonDataCache.loadTranslations(addon)}
+			addonData = self._addonDataCache.get(addon.pathToData)
+		validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
+		translationLanguage = resolveTranslationLanguage(addonTranslations, language)
+		if translationLanguage is not None:
+			addonData = translateAddonData(addonData, addonTranslations[translationLanguage])
+			validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
+		return serializeJson(addonData)
+
+	def _aggregateData(self, language: str, apiVersion: str, channel: AddonChannels) -> Optional[bytes]:
+		"""
+		The aggregate view written to <language>/<apiVersion>/<channel>.json, or None if there is no view.
+		"""
+		channelAddons = self._addons.get((apiVersion, channel))
+		if not channelAddons or language not in self.languages:
+			return None
+		return buildAggregate(
+			(addonId, self.viewData(language, apiVersion, channel, addonId)) for addonId in channelAddons
+		)
+
+	def view(self, language: str, apiVersion: str, channel: AddonChannels, addonId: str) -> Optional[Dict]:
+		"""
+		The add-on document for the language, API version and channel, or None if there is none.
+		Each call returns a new document.
+		"""
+		data = self.viewData(language, apiVersion, channel, addonId)
+		return None if data is None else json.loads(data)
+
+	def latest(self, language: str, channel: AddonChannels, addonId: str) -> Optional[Dict]:
+		"""
+		The add-on document in the latest view of the channel, or None if there is none.
+		"""
+		return self.view(language, LATEST_VIEW, channel, addonId)
+
+	def iterView(self, language: str, apiVersion: str, channel: AddonChannels) -> Iterator[Tuple[str, Dict]]:
+		"""
+		Yields (addonId, document) for each add-on in the view of the language, API version and channel,
+		in add-on ID order.
+		"""
+		if language not in self.languages:
+			return
+		for addonId in self.addonIds(apiVersion, channel):
+			yield addonId, self.view(language, apiVersion, channel, addonId)
@@ -0,0 +1,162 @@
+# Copyright (C) 2021-2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Generates the view files for the add-ons selected for each NVDA API version and channel.
+"""
+
+from typing import (
+	Dict,
+	FrozenSet,
+	Iterator,
+	List,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from .addonDataCache import AddonDataCache
+from .datastructures import (
+	Addon,
+	AddonChannels,
+	AddonView,
+	LATEST_VIEW,
+	MajorMinorPatch,
+	WriteableAddons,
+)
+from .explain import (
+	DecisionTrace,
+	explainLatest,
+)
+from .writer import serializeJson
+from src.validate.validate import (
+	JSONSchemaPaths,
+	validateJson,
+)
+
+# The API versions of a class, newest first, the add-on ID, channel, add-on, and whether it is the latest.
+SelectedAddon = Tuple[List[MajorMinorPatch], str, AddonChannels, Addon, bool]
+
+
+def resolveTranslationLanguage(addonTranslations: Dict[str, Dict[str, str]], lang: str) -> Optional[str]:
+	"""
+	Returns the language of the translation to use for lang.
+	Falls back to lang without the locale, and returns None if the English data should be used.
+	"""
+	if lang in addonTranslations:
+		return lang
+	langWithoutLocale = lang.split("_")[0]
+	if langWithoutLocale in addonTranslations:
+		return langWithoutLocale
+	return None
+
+
+def translateAddonData(addonData: Dict, translation: Dict[str, str]) -> Dict:
+	translatedAddonData = addonData.copy()
+	translatedAddonData["displayName"] = translation["displayName"]
+	translatedAddonData["description"] = translation["description"]
+	return translatedAddonData
+
+
+def groupAPIVersionClasses(addons: WriteableAddons) -> List[List[MajorMinorPatch]]:
+	"""
+	Groups the API versions which select the same add-on versions, as returned by getLatestAddons.
+	Returns the API versions of each class newest first, and the classes in order of their newest API version.
+	"""
+	classes: Dict[FrozenSet[Tuple[str, str, str]], List[MajorMinorPatch]] = {}
+	for nvdaAPIVersion in sorted(addons.keys(), reverse=True):
+		selection = frozenset(
+			(channel, addonId, addon.pathToData)
+			for channel, channelAddons in addons[nvdaAPIVersion].items()
+			for addonId, addon in channelAddons.items()
+		)
+		classes.setdefault(selection, []).append(nvdaAPIVersion)
+	return list(classes.values())
+
+
+def iterSelectedAddons(
+		addons: WriteableAddons,
+		trace: Optional[DecisionTrace] = None,
+) -> Iterator[SelectedAddon]:
+	"""
+	Yields (nvdaAPIVersions, addonId, channel, addon, addLatest) for each add-on selected for
+	each class of API versions, see groupAPIVersionClasses, from the newest class to the oldest.
+	The add-on is selected for each of the nvdaAPIVersions, which are newest first.
+	addLatest is True for the add-on version to write to the latest view of its channel.
+	If a trace is given, the add-on version chosen for each latest view is explained in it.
+	"""
+	writtenLatestAddonForChannel: Set[str] = set()
+	for nvdaAPIVersions in groupAPIVersionClasses(addons):
+		# To generate the 'latest view',
+		# check each api version, starting with the latest.
+		# For a given 'latest' addon write path,
+		# store the path when the path is first encountered.
+		# This ensures the latest path is returned.
+		channelAddons = addons[nvdaAPIVersions[0]]
+		for channel in channelAddons:
+			for addonName in channelAddons[channel]:
+				addon = channelAddons[channel][addonName]
+				# paths are case insensitive
+				# Identical add-on IDs may have different casing
+				# due to legacy add-on submissions.
+				# This can be removed when old submissions are given updated casing.
+				caseInsensitiveLatestAddonForChannel = f"{addonName.lower()}-{channel}".casefold()
+				addLatest = caseInsensitiveLatestAddonForChannel not in writtenLatestAddonForChannel
+				if addLatest:
+					writtenLatestAddonForChannel.add(caseInsensitiveLatestAddonForChannel)
+					if trace is not None:
+						explainLatest(trace, addon, nvdaAPIVersions[0])
+				yield nvdaAPIVersions, addonName, channel, addon, addLatest
+
+
+def iterAddonViews(
+		addons: WriteableAddons,
+		supportedLanguages: Set[str],
+		addonDataCache: Optional[AddonDataCache] = None,
+		trace: Optional[DecisionTrace] = None,
+) -> Iterator[AddonView]:
+	"""
+	Given a unique mapping of (nvdaAPIVersion, channel) -> addon, generate the view files for the addons.
+	Each view path is generated once.
+	Throws a ValidationError if writeable data does not match expected schema.
+	Source documents are read through addonDataCache, so each add-on version is parsed once
+	rather than once per API version it is selected for.
+	Views are validated and serialized once for each class of API versions which share the selected add-ons.
+	If a trace is given, the add-on version chosen for each latest view is explained in it.
+	"""
+	if addonDataCache is None:
+		addonDataCache = AddonDataCache()
+	# Languages are generated in sorted order, so the views are generated in the same order for the same input.
+	languages = sorted(supportedLanguages)
+	for nvdaAPIVersions, addonName, channel, addon, addLatest in iterSelectedAddons(addons, trace):
+		# The API version of each view, and for the latest view, the newest API version of the class.
+		apiVersions: List[Tuple[str, Optional[str]]] = [
+			(str(nvdaAPIVersion), None) for nvdaAPIVersion in nvdaAPIVersions
+		]
+		if addLatest:
+			apiVersions.append((LATEST_VIEW, str(nvdaAPIVersions[0])))
+		# Translations are loaded first, so the source document is only parsed once.
+		translations = addonDataCache.loadTranslations(addon)
+		addonData: Dict = addonDataCache.get(addon.pathToData)
+		validateJson(addonData, JSONSchemaPaths.ADDON_DATA)
+		englishData = serializeJson(addonData)
+
+		# When English is a supported language, the English views are generated with the other languages.
+		if "en" not in supportedLanguages:
+			for apiVersion, latestAPIVersion in apiVersions:
+				yield AddonView("en", apiVersion, addonName, channel, englishData, addon, latestAPIVersion)
+
+		addonTranslations = {t["language"]: t for t in translations}
+		# Languages which fall back to the same translation share the serialized data.
+		serializedTranslations: Dict[Optional[str], bytes] = {None: englishData}
+		for lang in languages:
+			translationLanguage = resolveTranslationLanguage(addonTranslations, lang)
+			translatedData = serializedTranslations.get(translationLanguage)
+			if translatedData is None:
+				translatedAddonData = translateAddonData(addonData, addonTranslations[translationLanguage])
+				validateJson(translatedAddonData, JSONSchemaPaths.ADDON_DATA)
+				translatedData = serializeJson(translatedAddonData)
+				serializedTranslations[translationLanguage] = translatedData
+			for apiVersion, latestAPIVersion in apiVersions:
+				yield AddonView(lang, apiVersion, addonName, channel, translatedData, addon, latestAPIVersion)
@@ -0,0 +1,309 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+from abc import (
+	ABC,
+	abstractmethod,
+)
+from enum import Enum
+import gzip
+import hashlib
+import json
+import logging
+import os
+from queue import Queue
+import threading
+from typing import (
+	Dict,
+	List,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from .datastructures import ViewKind
+
+log = logging.getLogger()
+
+DEFAULT_WRITERS = 4
+DEFAULT_WRITE_QUEUE_SIZE = 1024
+DEFAULT_CONTENT_STORE_DIRNAME = ".blobs"
+DEFAULT_COMPRESS_LEVEL = 9
+COMPRESSED_SUFFIX = ".gz"
+
+
+class LinkMode(str, Enum):
+	HARDLINK = "hardlink"
+	SYMLINK = "symlink"
+
+
+def serializeJson(data: Dict) -> bytes:
+	"""
+	Serializes a view document to the bytes written to file.
+	The serialization is canonical, with sorted keys and no whitespace,
+	so equal documents always produce identical bytes and content hashes.
+	"""
+	return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def compressView(data: bytes, compressLevel: int = DEFAULT_COMPRESS_LEVEL) -> bytes:
+	"""
+	Gzip compresses a view.
+	The header has no modification time, so identical views always compress to identical bytes.
+	"""
+	return gzip.compress(data, compresslevel=compressLevel, mtime=0)
+
+
+def removeView(outputDir: str, viewPath: str) -> None:
+	"""
+	Removes the view at viewPath in outputDir and its compressed copy, and any parent directories left empty.
+	"""
+	fullPath = os.path.join(outputDir, *viewPath.split("/"))
+	stalePaths = [path for path in (fullPath, f"{fullPath}{COMPRESSED_SUFFIX}") if os.path.lexists(path)]
+	if not stalePaths:
+		return
+	for path in stalePaths:
+		os.remove(path)
+	outputRoot = os.path.normcase(os.path.abspath(outputDir))
+	directory = os.path.dirname(os.path.abspath(fullPath))
+	while os.path.normcase(directory) != outputRoot and not os.listdir(directory):
+		os.rmdir(directory)
+		directory = os.path.dirname(directory)
+
+
+class ViewWriteError(Exception):
+	"""
+	Raised once all queued files have been processed, if any of them could not be written.
+	"""
+
+	def __init__(self, errors: List[Tuple[str, Exception]]):
+		self.errors = errors
+		firstPath, firstError = errors[0]
+		super().__init__(f"Failed to write {len(errors)} file(s), first error for {firstPath}: {firstError!r}")
+
+
+class ViewSink(ABC):
+	"""
+	Receives the (path, data) view files of a transformation.
+	Paths use "/" as the separator.
+	Each file is written with its kind, and a latest view with the newest API version it is selected for,
+	which sinks storing views by their kind and API version require, see SQLiteSink.
+	Subclasses implement write and close, and count filesWritten and bytesWritten.
+	Used as a context manager, the sink is closed when the block completes, or discarded if it raises.
+	"""
+
+	filesWritten: int
+	bytesWritten: int
+
+	@abstractmethod
+	def write(
+			self,
+			path: str,
+			data: bytes,
+			kind: ViewKind = ViewKind.ADDON,
+			latestAPIVersion: Optional[str] = None,
+	) -> None:
+		pass
+
+	@abstractmethod
+	def close(self) -> None:
+		"""
+		Completes writing, raising an error if any file could not be written.
+		"""
+
+	def discard(self) -> None:
+		"""
+		Stops writing after a failure.
+		By default, the files already written are kept, and errors writing them are logged.
+		Sinks which write a single file remove it, so a failed run doesn't leave truncated output.
+		"""
+		# Don't mask the original exception with write errors.
+		try:
+			self.close()
+		except Exception as writeError:
+			log.error(writeError)
+
+	def logSummary(self) -> None:
+		log.info(f"Wrote {self.filesWritten} files, {self.bytesWritten} bytes")
+
+	def __enter__(self) -> "ViewSink":
+		return self
+
+	def __exit__(self, excType, excValue, traceback) -> None:
+		if excType is None:
+			self.close()
+		else:
+			self.discard()
+
+
+class ViewWriter(ViewSink):
+	"""
+	Writes view files using a pool of writer threads, which drain a bounded queue of (path, data) jobs.
+	Paths are relative to outputDir and use "/" as the separator.
+	Parent directories are created once per directory.
+	Errors are collected, and raised as a ViewWriteError when the writer is closed.
+
+	If a linkMode is given, identical files are deduplicated.
+	Each unique file is written once to contentStore, named by the hash of its content,
+	and linked into each view path.
+	By default, the content store is the DEFAULT_CONTENT_STORE_DIRNAME directory in outputDir.
+	Hard links require the content store to be on the same file system as outputDir.
+
+	If a compressLevel is given, a gzip compressed copy of each file is also written
+	to the same path with a COMPRESSED_SUFFIX, by the writer threads.
+	"""
+
+	def __init__(
+			self,
+			outputDir: str,
+			workers: int = DEFAULT_WRITERS,
+			queueSize: int = DEFAULT_WRITE_QUEUE_SIZE,
+			linkMode: Optional[LinkMode] = None,
+			contentStore: Optional[str] = None,
+			compressLevel: Optional[int] = None,
+	):
+		if workers < 1:
+			raise ValueError(f"At least one writer is required, got {workers}")
+		if compressLevel is not None and not 0 <= compressLevel <= 9:
+			raise ValueError(f"The compression level must be between 0 and 9, got {compressLevel}")
+		self.outputDir = outputDir
+		self.linkMode = None if linkMode is None else LinkMode(linkMode)
+		if contentStore is None:
+			contentStore = os.path.join(outputDir, DEFAULT_CONTENT_STORE_DIRNAME)
+		self.contentStore = contentStore
+		self.compressLevel = compressLevel
+		self.filesWritten = 0
+		self.bytesWritten = 0
+		self.blobsWritten = 0
+		self.uniqueBlobBytes = 0
+		# Maps the hash of each blob to an event which is set once the blob has been written.
+		self._blobs: Dict[str, threading.Event] = {}
+		self._queue: "Queue[Optional[Tuple[str, bytes]]]" = Queue(maxsize=queueSize)
+		self._createdDirectories: Set[str] = set()
+		self._lock = threading.Lock()
+		self._errors: List[Tuple[str, Exception]] = []
+		self._closed = False
+		self._threads = [
+			threading.Thread(target=self._work, name=f"ViewWriter-{i}", daemon=True)
+			for i in range(workers)
+		]
+		for thread in self._threads:
+			thread.start()
+
+	def write(
+			self,
+			path: str,
+			data: bytes,
+			kind: ViewKind = ViewKind.ADDON,
+			latestAPIVersion: Optional[str] = None,
+	) -> None:
+		"""
+		Queues data to be written to path, blocking while the queue is full.
+		"""
+		if self._closed:
+			raise RuntimeError("ViewWriter is closed")
+		self._queue.put((path, data))
+
+	def close(self) -> None:
+		"""
+		Waits for all queued files to be written.
+		Raises a ViewWriteError if any file could not be written.
+		"""
+		if self._closed:
+			return
+		self._closed = True
+		for _thread in self._threads:
+			self._queue.put(None)
+		for thread in self._threads:
+			thread.join()
+		if self._errors:
+			raise ViewWriteError(sorted(self._errors, key=lambda error: error[0]))
+
+	def __enter__(self) -> "ViewWriter":
+		return self
+
+	def _work(self) -> None:
+		while True:
+			job = self._queue.get()
+			if job is None:
+				return
+			path, data = job
+			try:
+				self._writeFile(path, data)
+				if self.compressLevel is not None:
+					self._writeFile(f"{path}{COMPRESSED_SUFFIX}", compressView(data, self.compressLevel))
+			except Exception as error:
+				with self._lock:
+					self._errors.append((path, error))
+
+	def _ensureDirectory(self, directory: str) -> None:
+		if directory in self._createdDirectories:
+			return
+		with self._lock:
+			if directory not in self._createdDirectories:
+				os.makedirs(directory, exist_ok=True)
+				self._createdDirectories.add(directory)
+
+	def _writeFile(self, path: str, data: bytes) -> None:
+		fullPath = os.path.join(self.outputDir, *path.split("/"))
+		self._ensureDirectory(os.path.dirname(fullPath))
+		# An existing view may be a link to a blob, which must not be overwritten in place.
+		if os.path.lexists(fullPath):
+			os.remove(fullPath)
+		if self.linkMode is None:
+			with open(fullPath, "wb") as viewFile:
+				viewFile.write(data)
+		else:
+			blobPath = self._writeBlob(data, COMPRESSED_SUFFIX if path.endswith(COMPRESSED_SUFFIX) else "")
+			if self.linkMode is LinkMode.HARDLINK:
+				os.link(blobPath, fullPath)
+			else:
+				os.symlink(os.path.relpath(blobPath, os.path.dirname(fullPath)), fullPath)
+		with self._lock:
+			self.filesWritten += 1
+			self.bytesWritten += len(data)
+
+	def _writeBlob(self, data: bytes, suffix: str) -> str:
+		"""
+		Writes data to the content store, unless it has already been written.
+		Returns the path of the blob.
+		"""
+		blobHash = hashlib.sha256(data).hexdigest()
+		blobPath = os.path.join(self.contentStore, blobHash[:2], f"{blobHash}.json{suffix}")
+		with self._lock:
+			written = self._blobs.get(blobHash)
+			if written is None:
+				written = self._blobs[blobHash] = threading.Event()
+				isFirstWriter = True
+			else:
+				isFirstWriter = False
+		if not isFirstWriter:
+			# Another writer thread is responsible for the blob.
+			written.wait()
+			return blobPath
+		try:
+			# Blobs are named by their content, so a blob from a previous run can be reused.
+			if not os.path.exists(blobPath):
+				self._ensureDirectory(os.path.dirname(blobPath))
+				with open(blobPath, "wb") as blobFile:
+					blobFile.write(data)
+				with self._lock:
+					self.blobsWritten += 1
+			with self._lock:
+				self.uniqueBlobBytes += len(data)
+		finally:
+			written.set()
+		return blobPath
+
+	def logSummary(self) -> None:
+		super().logSummary()
+		self.logDeduplicationSummary()
+
+	def logDeduplicationSummary(self) -> None:
+		if self.linkMode is None:
+			return
+		log.info(
+			f"Deduplicated {self.filesWritten} files into {len(self._blobs)} unique blobs "
+			f"({self.blobsWritten} new), saving {self.bytesWritten - self.uniqueBlobBytes} bytes"
+		)
@@ -1,13 +1,22 @@
-# Copyright (C) 2021 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
 import argparse
 import json
-from .validate import validateJson
+from jsonschema.exceptions import SchemaError
+import sys
+from .batch import (
+	expandPaths,
+	failureReport,
+	validateFiles,
+)
+from .validate import validatorRegistry
 
-"""Validate json data file
-Usage: python -m src.validate {pathToSchema} {pathToDataFile}
+"""Validate json data files
+Usage: python -m src.validate {pathToSchema} {pathToDataFile} [{pathToDataFile} ...] [options]
+Data file paths may be files, directories of .json files, glob patterns, or - to read paths from stdin.
+Exits with 1 if any file is invalid, or 2 if the arguments or schema are invalid.
 """
 
 parser = argparse.ArgumentParser()
@@ -16,11 +25,66 @@
 	help="path to the jsonschema file"
 )
 parser.add_argument(
-	dest="pathToDataFile",
-	help="The json (.json) file containing the file to be validated using the schema file"
+	dest="pathToDataFiles",
+	nargs="+",
+	metavar="pathToDataFile",
+	help=(
+		"The json (.json) files to be validated using the schema file. "
+		"Directories are searched recursively for .json files, glob patterns are expanded, "
+		"and - reads a path from each line of stdin."
+	),
+)
+parser.add_argument(
+	"--jobs",
+	required=False,
+	type=int,
+	help="The number of worker processes used to validate the files, 1 validates serially.",
+	dest="jobs",
+	default=1,
+)
+parser.add_argument(
+	"--report",
+	required=False,
+	help="Write a JSON report of the files validated and the error of each invalid file to this path.",
+	dest="reportPath",
+	default=None,
 )
 
-args = parser.parse_args()
-with open(args.pathToDataFile, "r") as jsonDataFile:
-	jsonData = json.load(jsonDataFile)
-validateJson(jsonData, args.pathToSchema)
+
+def main() -> int:
+	args = parser.parse_args()
+	paths = []
+	for path in args.pathToDataFiles:
+		if path == "-":
+			paths.extend(line.strip() for line in sys.stdin if line.strip())
+		else:
+			paths.append(path)
+	paths = expandPaths(paths)
+	if not paths:
+		parser.error("No data files found")
+	try:
+		validatorRegistry.get(args.pathToSchema)
+	except SchemaError as error:
+		print(f"{args.pathToSchema}: invalid schema: {error.message}", file=sys.stderr)
+		return 2
+	except (OSError, ValueError) as error:
+		print(f"{args.pathToSchema}: invalid schema: {error}", file=sys.stderr)
+		return 2
+
+	results = []
+	for result in validateFiles(args.pathToSchema, paths, args.jobs):
+		if result.error is not None:
+			print(f"{result.path}: {result.error}", file=sys.stderr)
+		results.append(result)
+	report = failureReport(args.pathToSchema, results)
+	print(f"Validated {report['filesValidated']} files, {report['filesFailed']} invalid")
+	if args.reportPath:
+		with open(args.reportPath, "w", encoding="utf-8") as reportFile:
+			json.dump(report, reportFile, indent="\t")
+	return 1 if report["filesFailed"] else 0
+
+
+# Worker processes started with the "spawn" method re-import this module,
+# so validation must only run in the main process.
+if __name__ == "__main__":
+	sys.exit(main())
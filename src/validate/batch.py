@@ -0,0 +1,104 @@
+# Copyright (C) 2026 NV Access Limited
+# This file may be used under the terms of the GNU General Public License, version 2 or later.
+# For more details see: https://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Validates many data files against a schema in one process, or a pool of worker processes.
+Each process compiles the schema once, through the validator registry.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import glob
+from itertools import repeat
+import json
+import os
+import typing
+
+from .validate import (
+	ValidationError,
+	validateJson,
+	validatorRegistry,
+)
+
+MAX_ERROR_MESSAGE_LENGTH = 200
+
+
+class FileResult(typing.NamedTuple):
+	path: str
+	error: typing.Optional[str]  # None if the file is valid
+
+
+def expandPaths(paths: typing.Iterable[str]) -> typing.List[str]:
+	"""
+	Expands directories to the .json files within them, recursively, and glob patterns to the paths they match.
+	Other paths, and glob patterns which match no files, are kept, so they are reported as failures.
+	Returns the unique paths, sorted.
+	"""
+	expandedPaths: typing.Set[str] = set()
+	for path in paths:
+		if os.path.isdir(path):
+			expandedPaths.update(glob.glob(os.path.join(glob.escape(path), "**", "*.json"), recursive=True))
+		elif glob.has_magic(path):
+			expandedPaths.update(glob.glob(path, recursive=True) or [path])
+		else:
+			expandedPaths.add(path)
+	return sorted(expandedPaths)
+
+
+def _validationErrorMessage(error: ValidationError) -> str:
+	"""
+	A one line description of a validation error.
+	Messages include the invalid value, which may be much of the document, so long messages are truncated.
+	"""
+	location = "/".join(str(part) for part in error.absolute_path)
+	message = error.message
+	if len(message) > MAX_ERROR_MESSAGE_LENGTH:
+		message = f"{message[:MAX_ERROR_MESSAGE_LENGTH]}... ({error.validator} validation failed)"
+	return f"{message} at /{location}"
+
+
+def validateFile(schemaPath: str, path: str) -> FileResult:
+	"""
+	Validates the data file at path, returning the error if it can't be read or doesn't match the schema.
+	Runs in worker processes when validating in parallel, so errors are returned rather than raised.
+	"""
+	if glob.has_magic(path) and not os.path.exists(path):
+		return FileResult(path, "No files match this pattern")
+	try:
+		with open(path, "r", encoding="utf-8") as dataFile:
+			data = json.load(dataFile)
+		validateJson(data, schemaPath)
+	except ValidationError as error:
+		return FileResult(path, _validationErrorMessage(error))
+	except (OSError, ValueError) as error:
+		return FileResult(path, str(error))
+	return FileResult(path, None)
+
+
+def validateFiles(schemaPath: str, paths: typing.List[str], jobs: int = 1) -> typing.Iterator[FileResult]:
+	"""
+	Yields the result of validating each file, in the order of paths.
+	When jobs is greater than 1, files are validated by that many worker processes.
+	Raises a SchemaError before validating any file if the schema itself is invalid.
+	"""
+	validatorRegistry.get(schemaPath)
+	if jobs > 1 and len(paths) > 1:
+		chunkSize = max(1, min(256, len(paths) // (jobs * 4)))
+		with ProcessPoolExecutor(max_workers=jobs) as executor:
+			yield from executor.map(validateFile, repeat(schemaPath), paths, chunksize=chunkSize)
+	else:
+		yield from map(validateFile, repeat(schemaPath), paths)
+
+
+def failureReport(schemaPath: str, results: typing.Iterable[FileResult]) -> typing.Dict[str, typing.Any]:
+	"""
+	A JSON report of the files validated, and the error of each file which failed.
+	"""
+	results = list(results)
+	failures = [{"path": result.path, "error": result.error} for result in results if result.error is not None]
+	return {
+		"schema": schemaPath,
+		"filesValidated": len(results),
+		"filesFailed": len(failures),
+		"failures": failures,
+	}
@@ -1,12 +1,16 @@
-# Copyright (C) 2021 NV Access Limited
+# Copyright (C) 2021-2026 NV Access Limited
 # This file may be used under the terms of the GNU General Public License, version 2 or later.
 # For more details see: https://www.gnu.org/licenses/gpl-2.0.html
 
 from enum import Enum
 import json
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import (
+	best_match,
+	ValidationError,
+)
+from jsonschema.validators import validator_for
 import os
+import threading
 import typing
 
 
@@ -18,13 +22,67 @@ class JSONSchemaPaths(str, Enum):
 	NVDA_VERSIONS = os.path.join(os.path.dirname(__file__), "nvdaAPIVersions.schema.json")
 
 
+class ValidatorCacheInfo(typing.NamedTuple):
+	hits: int
+	misses: int
+	size: int
+
+
+class SchemaValidatorRegistry:
+	"""
+	Loads, checks and compiles each schema once per process.
+	Schemas are keyed by their normalised path, so a JSONSchemaPaths member
+	and the equivalent path string share an entry.
+	"""
+
+	def __init__(self):
+		self._validators: typing.Dict[str, typing.Any] = {}
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	@staticmethod
+	def _key(schemaPath: str) -> str:
+		return os.path.normcase(os.path.abspath(schemaPath))
+
+	def get(self, schemaPath: str):
+		"""
+		Returns the compiled validator for the schema at schemaPath.
+		Raises a SchemaError if the schema itself is invalid.
+		"""
+		key = self._key(schemaPath)
+		with self._lock:
+			validator = self._validators.get(key)
+			if validator is not None:
+				self.hits += 1
+				return validator
+			self.misses += 1
+			with open(key, "r", encoding="utf-8") as f:
+				schema = json.load(f)
+			validatorCls = validator_for(schema)
+			validatorCls.check_schema(schema)
+			validator = validatorCls(schema)
+			self._validators[key] = validator
+			return validator
+
+	def cacheInfo(self) -> ValidatorCacheInfo:
+		return ValidatorCacheInfo(self.hits, self.misses, len(self._validators))
+
+	def clear(self) -> None:
+		with self._lock:
+			self._validators.clear()
+			self.hits = 0
+			self.misses = 0
+
+
+validatorRegistry = SchemaValidatorRegistry()
+
+
 def validateJson(data: JsonObjT, schemaPath: str) -> None:
 	""" Ensure that the loaded metadata conforms to the schema.
 	Raise error if not.
 	"""
-	with open(schemaPath) as f:
-		schema = json.load(f)
-	try:
-		validate(instance=data, schema=schema)
-	except ValidationError as err:
-		raise err
+	validator = validatorRegistry.get(schemaPath)
+	error: typing.Optional[ValidationError] = best_match(validator.iter_errors(data))
+	if error is not None:
+		raise error